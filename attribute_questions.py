@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+📊 Pytania o atrybuty krajów (ludność, kontynent, powierzchnia) bez map
+Kolumny countries_gdf (POP_EST, CONTINENT, geometria) trafiają do jednej tabeli, a każdy rodzaj
+pytania powstaje naraz dla wszystkich kandydatów operacjami na tablicach numpy/pandas:
+losowanie zestawów krajów (RNG z seedem), wybór poprawnej odpowiedzi, odrzucenie zestawów
+z niejednoznaczną odpowiedzią i składanie tekstów - bez pętli Pythona po pytaniach.
+Powierzchnia liczona jest w odwzorowaniu równopolowym (EQUAL_AREA_CRS), nie w stopniach.
+"""
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from map_projection import EQUAL_AREA_CRS, project
+from question_specs import polish_names, world_countries
+
+ANSWERS = 4
+
+# Kandydaci losowani na każdy rodzaj pytania (po odrzuceniu niejednoznacznych i powtórek zostaje mniej)
+CANDIDATES = 10_000
+DEFAULT_SEED = 0
+
+# Minimalna przewaga zwycięzcy nad drugim krajem - szacunki ludności i granice 1:50m mają swój błąd
+MIN_MARGIN = 1.25
+
+# Kontynenty w miejscowniku ("Który kraj leży w ...?")
+CONTINENT_LOCATIVE = {
+    'Africa': 'w Afryce',
+    'Asia': 'w Azji',
+    'Europe': 'w Europie',
+    'North America': 'w Ameryce Północnej',
+    'South America': 'w Ameryce Południowej',
+    'Oceania': 'w Oceanii',
+}
+
+# Osobny strumień losowości na rodzaj pytania - dodanie rodzaju nie zmienia pozostałych
+_STREAMS = {'population': 1, 'area': 2, 'continent': 3}
+
+
+def country_attributes(countries):
+    """📋 Tabela krajów trybu świata: kod, polska nazwa, kontynent, ludność, powierzchnia (km²)"""
+    countries = world_countries(countries)
+    countries = countries[(countries['POP_EST'] > 0) & countries['CONTINENT'].isin(CONTINENT_LOCATIVE)]
+    return pd.DataFrame({
+        'code': countries['ADM0_A3'].str.lower().to_numpy(str),
+        'name_pl': polish_names(countries).to_numpy(str),
+        'continent': countries['CONTINENT'].to_numpy(str),
+        'population': countries['POP_EST'].to_numpy(float),
+        'area_km2': shapely.area(project(countries.geometry.values, EQUAL_AREA_CRS)) / 1e6,
+    })
+
+
+def _decimal(values, digits):
+    """Liczby jako tekst z przecinkiem dziesiętnym (np. 38,4)"""
+    return np.char.replace(np.round(values, digits).astype(str), '.', ',')
+
+
+def population_text(population):
+    """👥 Ludność słownie: '38,4 mln' albo '512 tys.'"""
+    millions = np.char.add(_decimal(population / 1e6, 1), ' mln')
+    thousands = np.char.add(np.round(population / 1e3).astype(int).astype(str), ' tys.')
+    return np.where(population >= 1e6, millions, thousands)
+
+
+def margin_difficulty(margin):
+    """Im mniejsza przewaga zwycięzcy, tym trudniejsze pytanie"""
+    return np.select([margin >= 3, margin >= 1.6], ['easy', 'medium'], 'hard')
+
+
+class AttributeQuestionGenerator:
+    """📊 Pytania porównawcze i o kontynent dla wszystkich krajów - kolumnowo, z powtarzalnym seedem"""
+
+    def __init__(self, countries, seed=DEFAULT_SEED, candidates=CANDIDATES):
+        self.table = country_attributes(countries)
+        self.seed = seed
+        self.candidates = candidates
+
+    def rng(self, kind):
+        return np.random.default_rng([self.seed, _STREAMS[kind]])
+
+    def sample_rows(self, rng, count, size=ANSWERS):
+        """🎲 (count, size) różnych wierszy tabeli w losowej kolejności"""
+        return rng.random((count, len(self.table))).argsort(axis=1)[:, :size]
+
+    def question_frame(self, kind, rows, correct, question, explanation, difficulty, prefix=None):
+        """🧾 Pytania z macierzy wierszy (N, ANSWERS); ID z posortowanych kodów - ten sam zestaw = to samo ID"""
+        codes = np.sort(self.table['code'].to_numpy(str)[rows], axis=1)
+        ids = np.full(len(rows), f'geo_world_attr_{kind}')
+        if prefix is not None:
+            ids = np.char.add(np.char.add(ids, '_'), prefix)
+        for column in range(codes.shape[1]):
+            ids = np.char.add(np.char.add(ids, '_'), codes[:, column])
+        frame = pd.DataFrame({
+            'id': ids,
+            'question': question,
+            'answers': self.table['name_pl'].to_numpy()[rows].tolist(),
+            'correct': correct,
+            'difficulty': difficulty,
+            'explanation': explanation,
+        })
+        return frame.drop_duplicates('id').to_dict('records')
+
+    def superlative_questions(self, kind, column, question, describe):
+        """🏆 'Który z tych krajów ma najwięcej/największą ...?' - zwycięzca z przewagą >= MIN_MARGIN"""
+        rows = self.sample_rows(self.rng(kind), self.candidates)
+        values = self.table[column].to_numpy()[rows]
+        ordered = np.sort(values, axis=1)
+        margin = ordered[:, -1] / ordered[:, -2]
+        keep = margin >= MIN_MARGIN
+        rows, values, margin = rows[keep], values[keep], margin[keep]
+
+        correct = values.argmax(axis=1)
+        winner = np.take_along_axis(rows, correct[:, None], axis=1)[:, 0]
+        names = self.table['name_pl'].to_numpy(str)[winner]
+        explanation = np.char.add(np.char.add(names, ': '), describe(self.table[column].to_numpy()[winner]))
+        return self.question_frame(kind, rows, correct, question, explanation, margin_difficulty(margin))
+
+    def generate_population_questions(self):
+        """👥 Który z tych krajów ma najwięcej mieszkańców?"""
+        questions = self.superlative_questions(
+            'population', 'population', 'Który z tych krajów ma najwięcej mieszkańców?',
+            lambda population: np.char.add(np.char.add('ok. ', population_text(population)), ' mieszkańców.'))
+        print(f"👥 Pytania o ludność: {len(questions)}")
+        return questions
+
+    def generate_area_questions(self):
+        """📐 Który z tych krajów ma największą powierzchnię? (EPSG:6933)"""
+        questions = self.superlative_questions(
+            'area', 'area_km2', 'Który z tych krajów ma największą powierzchnię?',
+            lambda area: np.char.add(np.char.add('ok. ', np.round(area).astype(int).astype(str)), ' km².'))
+        print(f"📐 Pytania o powierzchnię: {len(questions)}")
+        return questions
+
+    def generate_continent_questions(self):
+        """🌍 Który kraj leży w ...? - trzy błędne odpowiedzi z innych kontynentów"""
+        rng = self.rng('continent')
+        continents = self.table['continent'].to_numpy(str)
+        answer = rng.integers(len(self.table), size=self.candidates)
+        target = continents[answer]
+
+        # Pętla po kontynentach (6), nie po pytaniach: wszystkie pytania o dany kontynent naraz
+        wrong = np.empty((self.candidates, ANSWERS - 1), dtype=np.intp)
+        for continent in np.unique(target):
+            selected = target == continent
+            pool = np.flatnonzero(continents != continent)
+            picks = rng.random((selected.sum(), len(pool))).argsort(axis=1)[:, :ANSWERS - 1]
+            wrong[selected] = pool[picks]
+
+        # Poprawna odpowiedź na losowej pozycji
+        order = rng.random((self.candidates, ANSWERS)).argsort(axis=1)
+        rows = np.take_along_axis(np.concatenate([answer[:, None], wrong], axis=1), order, axis=1)
+        correct = (order == 0).argmax(axis=1)
+
+        locative = pd.Series(target).map(CONTINENT_LOCATIVE).to_numpy(str)
+        names = self.table['name_pl'].to_numpy(str)[answer]
+        question = np.char.add(np.char.add('Który kraj leży ', locative), '?')
+        explanation = np.char.add(np.char.add(np.char.add(names, ' to kraj '), locative), '.')
+        slug = np.char.replace(np.char.lower(target), ' ', '_')
+        questions = self.question_frame('continent', rows, correct, question, explanation, 'easy', prefix=slug)
+        print(f"🌍 Pytania o kontynent: {len(questions)}")
+        return questions
+
+    def generate_all_questions(self):
+        """📊 Wszystkie rodzaje pytań o atrybuty"""
+        return (self.generate_population_questions() + self.generate_area_questions()
+                + self.generate_continent_questions())
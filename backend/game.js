@@ -61,9 +61,44 @@ function determineCategory(question) {
   return 'nauka_polska';
 }
 
+const IMAGE_MIME_TYPES = {
+  '.svg': 'image/svg+xml',
+  '.png': 'image/png',
+  '.jpg': 'image/jpeg',
+  '.gif': 'image/gif',
+  '.webp': 'image/webp'
+};
+
+// One in-memory copy per unique image: content -> data URL, imageRef -> data URL
+const imageStore = new Map();
+const imageRefs = new Map();
+
+function internImage(dataUrl) {
+  if (!imageStore.has(dataUrl)) {
+    imageStore.set(dataUrl, dataUrl);
+  }
+  return imageStore.get(dataUrl);
+}
+
+// Resolve imageRef (image_dedup.py, questions/images/<hash>.<ext>) and share identical inline images
+function attachSharedImage(question, imagesDir) {
+  if (typeof question.imageRef === 'string') {
+    const ref = path.basename(question.imageRef);
+    if (!imageRefs.has(ref)) {
+      const mime = IMAGE_MIME_TYPES[path.extname(ref)] || 'application/octet-stream';
+      const payload = fs.readFileSync(path.join(imagesDir, ref)).toString('base64');
+      imageRefs.set(ref, internImage(`data:${mime};base64,${payload}`));
+    }
+    question.image = imageRefs.get(ref);
+  } else if (typeof question.image === 'string' && question.image.startsWith('data:')) {
+    question.image = internImage(question.image);
+  }
+}
+
 function loadQuestionsFromDirectory() {
   try {
     const questionsDir = path.join(__dirname, '../questions');
+    const imagesDir = path.join(questionsDir, 'images');
     
     if (!fs.existsSync(questionsDir)) {
       console.warn('Questions directory not found:', questionsDir);
@@ -76,6 +111,8 @@ function loadQuestionsFromDirectory() {
     
     gameQuestions = [];
     questionsDatabase.categories = { ...CATEGORY_TEMPLATES };
+    imageStore.clear();
+    imageRefs.clear();
     const usedIds = new Set(); // Global tracking of used IDs
     
     files.forEach(file => {
@@ -92,6 +129,7 @@ function loadQuestionsFromDirectory() {
               if (question.question && question.answers && question.correct !== undefined) {
                 const category = determineCategory(question);
                 question.source = file;
+                attachSharedImage(question, imagesDir);
                 
                 // Generate truly unique ID
                 let uniqueId = question.id;
@@ -138,6 +176,7 @@ function loadQuestionsFromDirectory() {
                 category.questions.forEach((question, index) => {
                   try {
                     question.source = file;
+                    attachSharedImage(question, imagesDir);
                     
                     // Generate truly unique ID for structured format too
                     let uniqueId = question.id;
@@ -201,6 +240,7 @@ function loadQuestionsFromDirectory() {
     });
     
     console.log(`🎯 Loaded ${gameQuestions.length} total questions from ${Object.keys(questionsDatabase.categories).length} categories`);
+    console.log(`🖼️ Unique images in memory: ${imageStore.size}`);
     console.log(`🔑 Generated ${usedIds.size} unique question IDs`);
     
     // Verify all IDs are unique
@@ -327,6 +367,52 @@ function shuffleArray(array) {
   return shuffled;
 }
 
+const SVG_DATA_URL_PREFIX = 'data:image/svg+xml;base64,';
+
+// FNV-1a - deterministic hash used to pick an image variant per session
+function hashString(text) {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193) >>> 0;
+  }
+  return hash;
+}
+
+// Apply a rotate/mirror/zoom variant described by the generator (svg_variants.py)
+function applyImageVariant(image, variant) {
+  if (!image.startsWith(SVG_DATA_URL_PREFIX)) {
+    return image;
+  }
+  let svg = Buffer.from(image.slice(SVG_DATA_URL_PREFIX.length), 'base64').toString('utf8');
+  if (variant.transform) {
+    svg = svg.replace('<g id="map-view">', `<g id="map-view" transform="${variant.transform}">`);
+  }
+  if (variant.viewBox) {
+    svg = svg.replace(/(<svg id="map-viewport"[^>]*? viewBox=")[^"]*(")/, (match, start, end) => start + variant.viewBox + end);
+  }
+  return SVG_DATA_URL_PREFIX + Buffer.from(svg, 'utf8').toString('base64');
+}
+
+// Same session + question always gets the same variant (index 0 = original image)
+function withImageVariant(question, sessionId) {
+  const variants = question.imageVariants;
+  if (!question.image || !Array.isArray(variants) || variants.length === 0) {
+    return question;
+  }
+  const choice = hashString(`${sessionId}:${question.id}`) % (variants.length + 1);
+  if (choice === 0) {
+    return question;
+  }
+  const variant = variants[choice - 1];
+  return {
+    ...question,
+    image: applyImageVariant(question.image, variant),
+    imageVariant: variant.id,
+    imageVariantLabel: variant.label
+  };
+}
+
 // Mark questions as used
 function markQuestionsAsUsed(questions) {
   questions.forEach(q => {
@@ -403,7 +489,7 @@ class GameSession {
   startQuestion(io) {
     this.updateActivity();
     if (this.questionIndex < this.totalQuestions) {
-      const question = this.shuffledQuestions[this.questionIndex];
+      const question = withImageVariant(this.shuffledQuestions[this.questionIndex], this.id);
       this.currentQuestion = question;
       this.playerAnswers.clear();
       this.questionStartTime = Date.now();
@@ -1,4 +1,6 @@
 const express = require('express');
+const fs = require('fs');
+const path = require('path');
 const router = express.Router();
 const { v4: uuidv4 } = require('uuid');
 const QRCode = require('qrcode');
@@ -114,6 +116,23 @@ router.get('/questions/stats', (req, res) => {
   }
 });
 
+// Shared-arc map topology (topology_export.py) - clients fetch it once per session and draw mapSpec questions
+const TOPOLOGY_DIR = path.join(__dirname, '../questions/topology');
+
+router.get('/topology/:name', (req, res) => {
+  const { name } = req.params;
+  if (!/^[a-z0-9_-]+$/.test(name)) {
+    return res.status(400).json({ error: 'Invalid topology name' });
+  }
+  const topologyFile = path.join(TOPOLOGY_DIR, `${name}.topojson`);
+  if (!fs.existsSync(topologyFile)) {
+    return res.status(404).json({ error: 'Topology not found' });
+  }
+  res.set('Cache-Control', 'public, max-age=3600');
+  res.type('application/json');
+  res.sendFile(topologyFile);
+});
+
 router.get('/admin/questions/pool', (req, res) => {
   try {
     const totalQuestions = gameQuestions.length;
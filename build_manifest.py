@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+📒 Manifest budowania pytań wizualnych
+Dla każdego ID zapisuje skróty: specyfikacji, stylu, wersji danych i wyniku.
+Pipeline porównuje je z bieżącymi specyfikacjami i renderuje tylko nowe lub zmienione pytania.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from svg_encoding import iter_json
+
+MANIFEST_VERSION = 1
+
+
+def stable_hash(value):
+    """#️⃣ SHA-256 z kanonicznego JSON (posortowane klucze; obrazy haszowane kawałkami, bez sklejania)"""
+    digest = hashlib.sha256()
+    for chunk in iter_json(value, sort_keys=True, ensure_ascii=False, separators=(',', ':')):
+        digest.update(chunk.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def manifest_path_for(output_file):
+    """📍 Manifest leży obok pliku pytań (bez rozszerzenia .json, więc backend go nie wczytuje)"""
+    output_file = Path(output_file)
+    return output_file.with_name(output_file.name + '.manifest')
+
+
+class BuildManifest:
+    """📒 Manifest jednego pliku wyjściowego"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('entries', {})
+
+    def fingerprint(self, plugin, spec, style, geodata):
+        """🧬 Odcisk wejść pytania: wtyczka + skróty specyfikacji i stylu + wersja danych"""
+        return {
+            'plugin': plugin,
+            'spec': stable_hash(spec),
+            'style': stable_hash(style),
+            'geodata': geodata,
+        }
+
+    def is_fresh(self, question_id, fingerprint, existing_question):
+        """✅ Czy zapisane pytanie odpowiada bieżącym wejściom i nie było ręcznie zmieniane"""
+        entry = self.entries.get(question_id)
+        if entry is None or existing_question is None:
+            return False
+        if any(entry.get(key) != value for key, value in fingerprint.items()):
+            return False
+        return entry.get('output') == stable_hash(existing_question)
+
+    def record(self, question_id, fingerprint, question):
+        self.entries[question_id] = dict(fingerprint, output=stable_hash(question))
+
+    def rewrite_output(self, question_id, previous, question):
+        """🔁 Przenosi wpis na przepisane pytanie (np. obraz -> imageRef), jeśli wpis pasował do poprzedniego"""
+        entry = self.entries.get(question_id)
+        if entry is None or entry.get('output') != stable_hash(previous):
+            return False
+        entry['output'] = stable_hash(question)
+        return True
+
+    def prune(self, plugin, keep_ids):
+        """🧹 Usuwa wpisy wtyczki, których ID nie ma już w specyfikacjach; zwraca usunięte ID"""
+        removed = [question_id for question_id, entry in self.entries.items()
+                   if entry.get('plugin') == plugin and question_id not in keep_ids]
+        for question_id in removed:
+            del self.entries[question_id]
+        return removed
+
+    def save(self):
+        data = {'version': MANIFEST_VERSION, 'entries': dict(sorted(self.entries.items()))}
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.path)
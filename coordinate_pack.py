@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+📦 Paczka współrzędnych dla generatora HighQualityMapGenerator
+Krok budowania: upraszcza wszystkie kraje i nazwane rzeki z Natural Earth
+do zadanych budżetów wierzchołków i zapisuje je w jednym pliku .npz.
+Odczyt wymaga tylko numpy - tablice są mapowane do pamięci (np.memmap).
+"""
+
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+PACK_VERSION = 2
+DEFAULT_COUNTRY_BUDGET = 300
+DEFAULT_RIVER_BUDGET = 80
+
+COUNTRY_KEY_FIELDS = ['NAME', 'NAME_EN', 'NAME_LONG', 'ADMIN', 'NAME_PL', 'ADM0_A3', 'ISO_A2_EH']
+RIVER_KEY_FIELDS = ['name', 'name_en', 'name_pl', 'name_de', 'name_alt']
+
+
+def _simplify_to_budget(geometry, budget):
+    """✂️ Upraszcza geometrię zwiększając tolerancję aż zmieści się w budżecie wierzchołków"""
+    import shapely
+
+    tolerance = 0.005
+    simplified = geometry
+    while shapely.get_num_coordinates(simplified) > budget and tolerance < 5:
+        simplified = shapely.simplify(geometry, tolerance, preserve_topology=True)
+        tolerance *= 1.5
+    return simplified
+
+
+def _main_territory(geometry):
+    """🌍 Dla krajów z terytoriami zamorskimi zostawia tylko największy obszar"""
+    minx, miny, maxx, maxy = geometry.bounds
+    if (maxx - minx > 50 or maxy - miny > 50) and hasattr(geometry, 'geoms'):
+        return max(geometry.geoms, key=lambda part: part.area)
+    return geometry
+
+
+def _polygon_rings(geometry, min_area):
+    """🔁 Zwraca pierścienie części większych niż min_area - razem z otworami (enklawy, np. Lesotho)
+    Zewnętrzne są CCW, a otwory CW, więc otwory zostają puste przy każdej regule wypełniania."""
+    import shapely
+
+    parts = shapely.get_parts(shapely.orient_polygons(geometry))
+    rings = []
+    for part in parts:
+        if part.area < min_area:
+            continue
+        rings.append(np.asarray(part.exterior.coords))
+        rings.extend(np.asarray(hole.coords) for hole in part.interiors
+                     if shapely.Polygon(hole).area >= min_area)
+    return rings
+
+
+def _line_parts(geometry):
+    parts = geometry.geoms if hasattr(geometry, 'geoms') else [geometry]
+    return [np.asarray(part.coords) for part in parts if not part.is_empty]
+
+
+def _river_keys(rivers):
+    """🔑 Klucz rzeki jak w river_index.py: wikidataid, a bez niego nazwa (Danube i Donau to jedna rzeka)"""
+    if 'wikidataid' in rivers.columns:
+        return rivers['wikidataid'].fillna(rivers['name'])
+    return rivers['name']
+
+
+def _flatten(groups):
+    """Pakuje listę list tablic (N, 2) do płaskich współrzędnych i dwóch poziomów offsetów"""
+    coords, ring_offsets, geom_offsets = [], [0], [0]
+    for rings in groups:
+        for ring in rings:
+            coords.append(ring)
+            ring_offsets.append(ring_offsets[-1] + len(ring))
+        geom_offsets.append(len(ring_offsets) - 1)
+    flat = np.concatenate(coords).astype('float32') if coords else np.zeros((0, 2), dtype='float32')
+    return flat, np.asarray(ring_offsets, dtype='int64'), np.asarray(geom_offsets, dtype='int64')
+
+
+def _key_index(rows_keys):
+    """🔑 Buduje posortowany indeks kluczy (małe litery) -> numer wiersza"""
+    index = {}
+    for row, keys in enumerate(rows_keys):
+        for key in keys:
+            if isinstance(key, str) and key.strip():
+                index.setdefault(key.strip().lower(), row)
+    keys = sorted(index)
+    return np.asarray(keys, dtype='U'), np.asarray([index[key] for key in keys], dtype='int32')
+
+
+def build_coordinate_pack(data_dir, path, country_budget=DEFAULT_COUNTRY_BUDGET,
+                          river_budget=DEFAULT_RIVER_BUDGET):
+    """🔨 Buduje paczkę .npz z plików Natural Earth (wymaga geopandas)"""
+    import geopandas as gpd
+    import shapely
+
+    data_dir = Path(data_dir)
+    countries = gpd.read_file(data_dir / 'countries' / 'ne_50m_admin_0_countries.shp')
+    rivers = gpd.read_file(data_dir / 'rivers' / 'ne_50m_rivers_lake_centerlines.shp')
+
+    # Kraje
+    country_rings, country_keys = [], []
+    for _, row in countries.iterrows():
+        geometry = _main_territory(row.geometry)
+        simplified = _simplify_to_budget(geometry, country_budget)
+        rings = _polygon_rings(simplified, min_area=simplified.area * 0.002)
+        country_rings.append(rings or _polygon_rings(simplified, 0))
+        country_keys.append([row.get(field) for field in COUNTRY_KEY_FIELDS if field in countries.columns])
+
+    # Rzeki - wszystkie odcinki jednej rzeki (ten sam klucz) upraszczane razem do budżetu rzeki
+    rivers = rivers[rivers.geometry.notna() & rivers['name'].notna()]
+    river_names, river_lines, river_keys, river_ranks = [], [], [], []
+    for _, group in rivers.groupby(_river_keys(rivers), sort=True):
+        segments = shapely.multilinestrings([part for geometry in group.geometry
+                                             for part in shapely.get_parts(geometry)])
+        # Nazwa z najważniejszego odcinka (najniższy scalerank)
+        river_names.append(group.sort_values('scalerank', kind='stable')['name'].iloc[0])
+        river_lines.append(_line_parts(_simplify_to_budget(segments, river_budget)))
+        river_ranks.append(int(group['scalerank'].min()))
+        keys = []
+        for field in RIVER_KEY_FIELDS:
+            if field in group.columns:
+                keys.extend(group[field].dropna().tolist())
+        river_keys.append(keys)
+
+    country_coords, country_ring_offsets, country_geom_offsets = _flatten(country_rings)
+    river_coords, river_line_offsets, river_geom_offsets = _flatten(river_lines)
+    country_key_names, country_key_rows = _key_index(country_keys)
+    river_key_names, river_key_rows = _key_index(river_keys)
+
+    path = Path(path)
+    # np.savez (bez kompresji) - wpisy ZIP_STORED można mapować do pamięci
+    np.savez(
+        path,
+        version=np.asarray([PACK_VERSION, country_budget, river_budget], dtype='int32'),
+        country_names=np.asarray(countries['NAME'].tolist(), dtype='U'),
+        country_keys=country_key_names,
+        country_key_rows=country_key_rows,
+        country_coords=country_coords,
+        country_ring_offsets=country_ring_offsets,
+        country_geom_offsets=country_geom_offsets,
+        river_names=np.asarray(river_names, dtype='U'),
+        river_scalerank=np.asarray(river_ranks, dtype='int16'),
+        river_keys=river_key_names,
+        river_key_rows=river_key_rows,
+        river_coords=river_coords,
+        river_line_offsets=river_line_offsets,
+        river_geom_offsets=river_geom_offsets,
+    )
+    return path
+
+
+def load_npz_mmap(path):
+    """🗺️ Mapuje do pamięci wszystkie (nieskompresowane) tablice z pliku .npz"""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} jest skompresowany - użyj np.savez zamiast savez_compressed")
+            # Nagłówek lokalny ZIP: 30 bajtów + nazwa + pole extra
+            f.seek(info.header_offset + 26)
+            name_len = int.from_bytes(f.read(2), 'little')
+            extra_len = int.from_bytes(f.read(2), 'little')
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            order = 'F' if fortran_order else 'C'
+            key = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if int(np.prod(shape)) == 0:
+                arrays[key] = np.zeros(shape, dtype=dtype)
+            else:
+                arrays[key] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape, order=order)
+    return arrays
+
+
+class CoordinatePack:
+    """📦 Odczyt paczki współrzędnych - tylko numpy, dane mapowane do pamięci"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.arrays = load_npz_mmap(self.path)
+        self._country_index = self._build_index('country')
+        self._river_index = self._build_index('river')
+
+    def _build_index(self, prefix):
+        keys = self.arrays[f'{prefix}_keys']
+        rows = self.arrays[f'{prefix}_key_rows']
+        return {str(key): int(row) for key, row in zip(keys, rows)}
+
+    def _groups(self, prefix, inner, row):
+        coords = self.arrays[f'{prefix}_coords']
+        ring_offsets = self.arrays[f'{prefix}_{inner}_offsets']
+        geom_offsets = self.arrays[f'{prefix}_geom_offsets']
+        first, last = geom_offsets[row], geom_offsets[row + 1]
+        return [np.asarray(coords[ring_offsets[i]:ring_offsets[i + 1]]) for i in range(first, last)]
+
+    def country_rings(self, country_name):
+        """🗺️ Lista pierścieni (N, 2) kraju lub None"""
+        row = self._country_index.get(country_name.strip().lower())
+        if row is None:
+            return None
+        return self._groups('country', 'ring', row)
+
+    def river_lines(self, river_name):
+        """🌊 Lista linii (N, 2) rzeki lub None"""
+        row = self._river_index.get(river_name.strip().lower())
+        if row is None:
+            return None
+        return self._groups('river', 'line', row)
+
+    def country_names(self):
+        return [str(name) for name in self.arrays['country_names']]
+
+    def river_names(self):
+        return [str(name) for name in self.arrays['river_names']]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    base_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Buduje paczkę współrzędnych z danych Natural Earth")
+    parser.add_argument('--country-budget', type=int, default=DEFAULT_COUNTRY_BUDGET,
+                        help='maks. liczba wierzchołków na kraj')
+    parser.add_argument('--river-budget', type=int, default=DEFAULT_RIVER_BUDGET,
+                        help='maks. liczba wierzchołków na rzekę')
+    parser.add_argument('--output', default=str(base_dir / 'geodata' / 'coordinate_pack.npz'))
+    args = parser.parse_args()
+
+    print("📦 Budowanie paczki współrzędnych...")
+    output = build_coordinate_pack(base_dir / 'geodata', args.output,
+                                   country_budget=args.country_budget, river_budget=args.river_budget)
+    pack = CoordinatePack(output)
+    print(f"✅ Kraje: {len(pack.country_names())}, rzeki: {len(pack.river_names())}")
+    print(f"💾 Zapisano {output} ({Path(output).stat().st_size / 1024:.0f} KB)")
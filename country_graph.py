@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+🕸️ Graf sąsiedztwa krajów do generowania błędnych odpowiedzi
+Jedno zapytanie do indeksu przestrzennego (dwithin = styk granic plus mały bufor domykający
+szczeliny danych 1:50m i wąskie cieśniny) buduje graf w formacie CSR dla wszystkich krajów.
+Błędne odpowiedzi dla dowolnej liczby pytań wybiera jedna macierz ocen: sąsiedzi, sąsiedzi
+sąsiadów, ten sam podregion, ten sam kontynent - w obrębie poziomu bliższe kraje wygrywają,
+a losowość (seed) rozstrzyga między podobnie bliskimi. Ten sam seed = te same odpowiedzi.
+"""
+
+import numpy as np
+
+# Bufor sąsiedztwa w stopniach (~5 km) - domyka szczeliny między granicami w danych 1:50m
+ADJACENCY_DISTANCE = 0.05
+
+# Poziomy podobieństwa kandydata (mniejszy = bardziej wiarygodna błędna odpowiedź)
+TIER_NEIGHBOUR = 0
+TIER_SECOND_NEIGHBOUR = 1
+TIER_SUBREGION = 2
+TIER_CONTINENT = 3
+TIER_WORLD = 4
+
+# Ocena = poziom * TIER_WEIGHT + odległość cięciwy (0-2) + losowość (0-JITTER): poziomy się nie mieszają
+TIER_WEIGHT = 10.0
+JITTER = 0.5
+
+
+def unit_vectors(lon, lat):
+    """Punkty lon/lat jako wektory na sferze jednostkowej (odległość cięciwy rośnie z łukiem)"""
+    lon, lat = np.radians(lon), np.radians(lat)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+class CountryGraph:
+    """🕸️ Sąsiedztwo krajów countries_gdf (wiersze pozycyjne) w formacie CSR: indptr + indices"""
+
+    def __init__(self, countries, distance=ADJACENCY_DISTANCE):
+        left, right = countries.sindex.query(countries.geometry.values, predicate='dwithin', distance=distance)
+        keep = left != right
+        left, right = left[keep], right[keep]
+        order = np.lexsort((right, left))
+        self.indices = right[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(left, minlength=len(countries)))])
+
+        self.names = countries['NAME'].to_numpy()
+        self.rows = {}
+        for row, name in enumerate(self.names):
+            self.rows.setdefault(name, row)
+        self.subregion = countries['SUBREGION'].to_numpy()
+        self.continent = countries['CONTINENT'].to_numpy()
+        self.points = unit_vectors(countries['LABEL_X'].to_numpy(float), countries['LABEL_Y'].to_numpy(float))
+        self._tiers = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def neighbours(self, name):
+        """🤝 Nazwy krajów sąsiadujących z danym (lista pusta dla wysp i nieznanych nazw)"""
+        row = self.rows.get(name)
+        if row is None:
+            return []
+        return [self.names[i] for i in self.indices[self.indptr[row]:self.indptr[row + 1]]]
+
+    def adjacency(self):
+        """Macierz sąsiedztwa (N, N) bool"""
+        matrix = np.zeros((len(self), len(self)), dtype=bool)
+        matrix[np.repeat(np.arange(len(self)), np.diff(self.indptr)), self.indices] = True
+        return matrix
+
+    def tiers(self):
+        """📶 Poziom podobieństwa każdej pary krajów (N, N) - liczony raz"""
+        if self._tiers is None:
+            adjacency = self.adjacency()
+            second = (adjacency.astype(np.int32) @ adjacency.astype(np.int32)) > 0
+            tiers = np.full((len(self), len(self)), TIER_WORLD, dtype=np.int8)
+            tiers[self.continent[:, None] == self.continent[None, :]] = TIER_CONTINENT
+            tiers[self.subregion[:, None] == self.subregion[None, :]] = TIER_SUBREGION
+            tiers[second] = TIER_SECOND_NEIGHBOUR
+            tiers[adjacency] = TIER_NEIGHBOUR
+            self._tiers = tiers
+        return self._tiers
+
+    def distractors(self, rows, count=3, seed=0, candidates=None):
+        """🎲 (len(rows), count) wierszy błędnych odpowiedzi - jeden przebieg macierzowy dla wszystkich pytań
+        candidates ogranicza wybór do podanych wierszy (np. tylko kraje trybu świata)."""
+        rows = np.asarray(rows, dtype=np.intp)
+        distance = np.linalg.norm(self.points[rows][:, None, :] - self.points[None, :, :], axis=-1)
+        jitter = np.random.default_rng(seed).random(distance.shape) * JITTER
+        score = self.tiers()[rows] * TIER_WEIGHT + distance + jitter
+        score[np.arange(len(rows)), rows] = np.inf
+        if candidates is not None:
+            excluded = np.ones(len(self), dtype=bool)
+            excluded[np.asarray(candidates, dtype=np.intp)] = False
+            score[:, excluded] = np.inf
+        picked = np.argpartition(score, count, axis=1)[:, :count]
+        order = np.argsort(np.take_along_axis(score, picked, axis=1), axis=1, kind='stable')
+        return np.take_along_axis(picked, order, axis=1)
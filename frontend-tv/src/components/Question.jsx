@@ -1,4 +1,17 @@
 import React from 'react';
+import TopologyMap from './TopologyMap';
+
+const SVG_DATA_URL_PREFIX = 'data:image/svg+xml;base64,';
+
+// Włącza ukrytą grupę warstwowej mapy SVG (np. nazwę stolicy) zamiast pobierać drugi obraz
+function revealImageLayer(image, groupId) {
+  if (!groupId || !image.startsWith(SVG_DATA_URL_PREFIX)) {
+    return image;
+  }
+  const svg = atob(image.slice(SVG_DATA_URL_PREFIX.length));
+  const revealed = svg.replace(`<g id="${groupId}" display="none">`, `<g id="${groupId}">`);
+  return SVG_DATA_URL_PREFIX + btoa(revealed);
+}
 
 function Question({ currentQuestion, timer, players, realTimeAnswers, showCorrectAnswer }) {
   if (!currentQuestion) {
@@ -12,6 +25,10 @@ function Question({ currentQuestion, timer, players, realTimeAnswers, showCorrec
     );
   }
 
+  const imageSrc = currentQuestion.image && showCorrectAnswer
+    ? revealImageLayer(currentQuestion.image, currentQuestion.revealLayer)
+    : currentQuestion.image;
+
   return (
     <div className="tv-container">
       <div className="question-container">
@@ -29,7 +46,7 @@ function Question({ currentQuestion, timer, players, realTimeAnswers, showCorrec
         {currentQuestion.image && (
           <div className="question-image">
             <img 
-              src={currentQuestion.image} 
+              src={imageSrc} 
               alt="Pytanie wizualne" 
               style={{
                 maxWidth: '400px',
@@ -39,6 +56,16 @@ function Question({ currentQuestion, timer, players, realTimeAnswers, showCorrec
                 objectFit: 'contain'
               }}
             />
+            {currentQuestion.imageVariantLabel && (
+              <div className="image-variant-label">🔄 Mapa: {currentQuestion.imageVariantLabel}</div>
+            )}
+          </div>
+        )}
+
+        {/* Map drawn from the shared topology when the question carries only a mapSpec */}
+        {!currentQuestion.image && currentQuestion.mapSpec && (
+          <div className="question-image">
+            <TopologyMap spec={currentQuestion.mapSpec} revealed={showCorrectAnswer} />
           </div>
         )}
         
@@ -0,0 +1,167 @@
+import React, { useEffect, useMemo, useState } from 'react';
+import { getBackendURL } from '../hooks/useSocket';
+
+// Sphere radius of the same area as WGS84 - close enough to the generator's ellipsoidal LAEA
+const EARTH_RADIUS = 6371007.181;
+const DEG = Math.PI / 180;
+
+// One download (and decode) per topology for the whole session
+const topologyCache = new Map();
+
+function decodeTopology(topology) {
+  const [scaleX, scaleY] = topology.transform.scale;
+  const [translateX, translateY] = topology.transform.translate;
+  const arcs = topology.arcs.map(arc => {
+    let x = 0;
+    let y = 0;
+    return arc.map(([dx, dy]) => {
+      x += dx;
+      y += dy;
+      return [x * scaleX + translateX, y * scaleY + translateY];
+    });
+  });
+  return { ...topology, arcs };
+}
+
+function loadTopology(name) {
+  if (!topologyCache.has(name)) {
+    const request = fetch(`${getBackendURL()}/api/topology/${name}`)
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`Topology ${name}: HTTP ${response.status}`);
+        }
+        return response.json();
+      })
+      .then(decodeTopology)
+      .catch(error => {
+        topologyCache.delete(name);
+        throw error;
+      });
+    topologyCache.set(name, request);
+  }
+  return topologyCache.get(name);
+}
+
+// Lambert azimuthal equal-area centred on the map (map_projection.local_crs)
+function laea([lon0, lat0]) {
+  const sinLat0 = Math.sin(lat0 * DEG);
+  const cosLat0 = Math.cos(lat0 * DEG);
+  return ([lon, lat]) => {
+    const sinLat = Math.sin(lat * DEG);
+    const cosLat = Math.cos(lat * DEG);
+    const cosLon = Math.cos((lon - lon0) * DEG);
+    const k = Math.sqrt(2 / (1 + sinLat0 * sinLat + cosLat0 * cosLat * cosLon));
+    const x = EARTH_RADIUS * k * cosLat * Math.sin((lon - lon0) * DEG);
+    const y = EARTH_RADIUS * k * (cosLat0 * sinLat - sinLat0 * cosLat * cosLon);
+    return [Math.round(x), -Math.round(y)];
+  };
+}
+
+function arcPoints(arcs, refs) {
+  const points = [];
+  refs.forEach(ref => {
+    const arc = ref >= 0 ? arcs[ref] : arcs[~ref].slice().reverse();
+    points.push(...(points.length ? arc.slice(1) : arc));
+  });
+  return points;
+}
+
+function pathData(geometry, arcs, project) {
+  const lines = geometry.type === 'MultiPolygon' ? geometry.arcs.flat() : geometry.arcs;
+  const close = geometry.type === 'MultiPolygon' ? 'Z' : '';
+  return lines
+    .map(refs => 'M' + arcPoints(arcs, refs).map(point => project(point).join(' ')).join('L') + close)
+    .join('');
+}
+
+function TopologyMap({ spec, revealed }) {
+  const [topology, setTopology] = useState(null);
+  const [failed, setFailed] = useState(false);
+
+  useEffect(() => {
+    let active = true;
+    setFailed(false);
+    loadTopology(spec.topology)
+      .then(loaded => active && setTopology(loaded))
+      .catch(error => {
+        console.error('Failed to load map topology:', error);
+        if (active) setFailed(true);
+      });
+    return () => { active = false; };
+  }, [spec.topology]);
+
+  const layers = useMemo(() => {
+    if (!topology) return null;
+    const project = laea(spec.center);
+    const draw = geometry => pathData(geometry, topology.arcs, project);
+    const { countries, rivers, lakes } = topology.objects;
+    const highlighted = (rivers?.geometries || []).filter(river => (spec.rivers || []).includes(river.id));
+    const highlightedLakes = (lakes?.geometries || []).filter(lake => (spec.lakes || []).includes(lake.id));
+    return {
+      project,
+      neighbours: spec.context
+        ? countries.geometries.filter(country => country.id !== spec.country).map(draw).join('')
+        : '',
+      country: countries.geometries.filter(country => country.id === spec.country).map(draw).join(''),
+      lakes: spec.context && lakes ? lakes.geometries.map(draw).join('') : '',
+      rivers: highlighted.map(draw).join(''),
+      highlightedLakes: highlightedLakes.map(draw).join('')
+    };
+  }, [topology, spec]);
+
+  if (failed) {
+    return <div className="topology-map-status">🗺️ Mapa niedostępna</div>;
+  }
+  if (!layers) {
+    return <div className="topology-map-status">🗺️ Ładowanie mapy...</div>;
+  }
+
+  const [x0, y0, x1, y1] = spec.extent;
+  const width = x1 - x0;
+  const height = y1 - y0;
+  const fontSize = Math.max(width, height) * 0.035;
+  const colors = spec.colors;
+  const capital = spec.capital && layers.project(spec.capital);
+
+  return (
+    <svg className="topology-map" viewBox={`${x0} ${-y1} ${width} ${height}`} preserveAspectRatio="xMidYMid meet">
+      <rect x={x0} y={-y1} width={width} height={height} fill={colors.bg_color} />
+      {layers.neighbours && (
+        <path d={layers.neighbours} fill={colors.neighbour_color} stroke={colors.neighbour_border}
+          strokeWidth="1" vectorEffect="non-scaling-stroke" fillRule="evenodd" />
+      )}
+      <path d={layers.country} fill={colors.country_color} fillOpacity="0.9" stroke={colors.border_color}
+        strokeWidth="2.5" vectorEffect="non-scaling-stroke" fillRule="evenodd" strokeLinejoin="round" />
+      {layers.lakes && (
+        <path d={layers.lakes} fill={colors.lake_color} stroke={colors.border_color}
+          strokeWidth="0.5" vectorEffect="non-scaling-stroke" fillRule="evenodd" />
+      )}
+      {layers.highlightedLakes && (
+        <path d={layers.highlightedLakes} fill={revealed ? '#01579b' : '#0277bd'} fillOpacity="0.85"
+          stroke="#01579b" strokeWidth="1" vectorEffect="non-scaling-stroke" fillRule="evenodd" />
+      )}
+      {layers.rivers && (
+        <path d={layers.rivers} fill="none" stroke={revealed ? '#0d47a1' : '#1565c0'} strokeOpacity={revealed ? 1 : 0.8}
+          strokeWidth={revealed ? 6 : 4} vectorEffect="non-scaling-stroke" strokeLinecap="round" strokeLinejoin="round" />
+      )}
+      {capital && (
+        <circle cx={capital[0]} cy={capital[1]} r={fontSize * 0.3} fill="#d32f2f" stroke="#b71c1c"
+          strokeWidth="3" vectorEffect="non-scaling-stroke" />
+      )}
+      {revealed && spec.reveal.map(label => {
+        const [x, y] = label.at ? layers.project(label.at) : [x0 + width * 0.05, -y1 + height * 0.05 + fontSize];
+        return (
+          <text key={label.kind} x={label.at ? x + fontSize * 0.6 : x} y={label.at ? y + fontSize * 0.35 : y}
+            fontSize={fontSize} fontWeight="bold" fontFamily="DejaVu Sans, Arial, sans-serif"
+            fill={label.kind === 'capital' ? '#b71c1c' : label.kind === 'river' ? '#0d47a1'
+              : label.kind === 'lake' ? '#01579b' : colors.border_color}
+            stroke="white" strokeWidth="3" vectorEffect="non-scaling-stroke" paintOrder="stroke">
+            {label.text}
+          </text>
+        );
+      })}
+    </svg>
+  );
+}
+
+export default TopologyMap;
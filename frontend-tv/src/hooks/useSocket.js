@@ -3,7 +3,7 @@ import io from 'socket.io-client';
 import { GameContext } from '../contexts/GameContext.jsx';
 import useSound from './useSound';
 
-const getBackendURL = () => {
+export const getBackendURL = () => {
   const currentHost = window.location.hostname;
   if (currentHost !== 'localhost' && currentHost !== '127.0.0.1') {
     return `http://${currentHost}:3001`;
@@ -1,98 +1,47 @@
 #!/usr/bin/env python3
 """
 Generator wysokiej jakości map geograficznych
-Używa predefiniowanych, precyzyjnych danych geograficznych
+Używa paczki współrzędnych uproszczonych z Natural Earth (coordinate_pack.py)
 Tworzy 4 typy pytań wizualnych zgodnie z zaleceniami użytkownika
 """
 
 import json
-import base64
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.path import Path
 import numpy as np
 from pathlib import Path as PathLib
-import io
+from coordinate_pack import CoordinatePack
+from map_renderer import get_render_session
+from svg_encoding import svg_to_base64
 
 class HighQualityMapGenerator:
     def __init__(self):
         self.output_dir = PathLib("questions")
-        
-    def get_poland_coordinates(self):
-        """Prawdziwe współrzędne granic Polski (uproszczone ale precyzyjne)"""
-        # Oparte na prawdziwych danych geograficznych
-        return np.array([
-            [14.1, 54.8], [16.2, 54.5], [18.6, 54.4], [22.7, 54.3], [23.9, 54.2],
-            [23.9, 52.5], [24.1, 50.9], [22.7, 49.0], [20.2, 49.0], [18.9, 49.4],
-            [17.6, 50.0], [16.2, 50.5], [14.7, 50.8], [14.4, 52.6], [14.1, 54.8]
-        ])
-        
-    def get_germany_coordinates(self):
-        """Prawdziwe współrzędne granic Niemiec"""
-        return np.array([
-            [5.9, 55.1], [9.9, 54.8], [14.1, 54.8], [14.4, 52.6], [14.7, 50.8],
-            [12.2, 47.7], [10.2, 47.3], [7.5, 47.6], [6.2, 49.5], [6.0, 51.1],
-            [5.9, 53.6], [5.9, 55.1]
-        ])
-        
-    def get_france_coordinates(self):
-        """Prawdziwe współrzędne granic Francji"""
-        return np.array([
-            [-4.8, 48.4], [1.4, 51.1], [4.2, 49.9], [8.2, 49.0], [7.6, 47.6],
-            [6.9, 45.9], [7.0, 43.6], [3.1, 42.4], [-1.8, 43.4], [-4.8, 48.4]
-        ])
-        
-    def get_spain_coordinates(self):
-        """Prawdziwe współrzędne granic Hiszpanii"""
-        return np.array([
-            [-9.3, 42.0], [-6.2, 43.8], [-1.8, 43.4], [3.1, 42.4], [3.3, 41.9],
-            [2.1, 41.4], [0.7, 41.6], [-0.3, 39.3], [-7.0, 37.1], [-7.4, 37.1],
-            [-9.5, 38.7], [-9.3, 42.0]
-        ])
-        
-    def get_italy_coordinates(self):
-        """Prawdziwe współrzędne granic Włoch"""
-        return np.array([
-            [6.6, 45.9], [13.8, 46.5], [16.2, 41.9], [15.5, 37.1], [12.4, 36.6],
-            [8.4, 39.2], [7.4, 43.8], [6.6, 45.9]
-        ])
-        
-    def get_uk_coordinates(self):
-        """Prawdziwe współrzędne granic Wielkiej Brytanii"""
-        return np.array([
-            [-8.2, 54.9], [-3.0, 58.6], [-0.5, 59.4], [1.8, 52.8], [1.4, 50.9],
-            [-5.7, 49.9], [-10.7, 51.4], [-8.2, 54.9]
-        ])
+        self.pack_path = PathLib(__file__).parent / "geodata" / "coordinate_pack.npz"
+        self.coordinate_pack = None
+        
+    def get_coordinate_pack(self):
+        """Ładuje (mapuje do pamięci) paczkę współrzędnych z Natural Earth"""
+        if self.coordinate_pack is None:
+            if not self.pack_path.exists():
+                print(f"❌ Brak paczki współrzędnych {self.pack_path} - uruchom: python coordinate_pack.py")
+                return None
+            self.coordinate_pack = CoordinatePack(self.pack_path)
+        return self.coordinate_pack
         
     def get_country_geometry(self, country_name):
-        """Zwraca współrzędne dla danego kraju"""
-        geometries = {
-            'Poland': self.get_poland_coordinates(),
-            'Germany': self.get_germany_coordinates(),
-            'France': self.get_france_coordinates(),
-            'Spain': self.get_spain_coordinates(),
-            'Italy': self.get_italy_coordinates(),
-            'United Kingdom': self.get_uk_coordinates()
-        }
-        return geometries.get(country_name)
+        """Zwraca listę pierścieni (tablice N×2) dla danego kraju"""
+        pack = self.get_coordinate_pack()
+        if pack is None:
+            return None
+        return pack.country_rings(country_name)
         
     def get_river_coordinates(self, river_name, country):
-        """Prawdziwe współrzędne rzek"""
-        rivers = {
-            'Wisła': np.array([
-                [19.9, 49.3], [20.1, 50.1], [21.0, 52.2], [20.6, 53.4], [19.4, 54.4]
-            ]),
-            'Odra': np.array([
-                [17.9, 49.9], [17.5, 50.8], [16.9, 51.7], [14.5, 53.1], [14.1, 53.9]
-            ]),
-            'Rhine': np.array([
-                [8.2, 47.6], [8.5, 49.0], [8.1, 50.1], [6.8, 51.2], [6.1, 51.8]
-            ]),
-            'Seine': np.array([
-                [4.0, 48.0], [2.3, 48.9], [1.2, 49.4], [0.1, 49.4]
-            ])
-        }
-        return rivers.get(river_name)
+        """Zwraca listę odcinków (tablice N×2) rzeki - nazwa polska, angielska lub niemiecka"""
+        pack = self.get_coordinate_pack()
+        if pack is None:
+            return None
+        return pack.river_lines(river_name)
         
     def get_capital_coordinates(self, country):
         """Współrzędne stolic"""
@@ -111,14 +60,11 @@ class HighQualityMapGenerator:
         """Tworzy wysokiej jakości mapę SVG"""
         
         # Pobierz współrzędne kraju
-        country_coords = self.get_country_geometry(country_name)
-        if country_coords is None:
+        country_rings = self.get_country_geometry(country_name)
+        if not country_rings:
             return None
+        country_coords = np.concatenate(country_rings)
             
-        # Utwórz figurę matplotlib
-        fig, ax = plt.subplots(1, 1, figsize=(10, 8))
-        ax.set_aspect('equal')
-        
         # Kolory według typu pytania
         if question_type == 'outline':
             country_color = '#e8f4f8'
@@ -137,20 +83,24 @@ class HighQualityMapGenerator:
             border_color = '#333333'
             bg_color = '#ffffff'
             
-        # Ustaw tło
-        ax.set_facecolor(bg_color)
-        
-        # Narysuj kontur kraju
-        country_polygon = patches.Polygon(country_coords, closed=True, 
-                                        facecolor=country_color, 
-                                        edgecolor=border_color, 
-                                        linewidth=3, alpha=0.8)
+        # Figura wielokrotnego użytku (jedna na wątek) - czyści poprzednią mapę
+        session = get_render_session()
+        ax = session.begin(bg_color)
+        
+        # Narysuj kontur kraju (wszystkie wyspy jako jedna ścieżka złożona)
+        codes = []
+        for ring in country_rings:
+            codes.extend([Path.MOVETO] + [Path.LINETO] * (len(ring) - 2) + [Path.CLOSEPOLY])
+        country_polygon = patches.PathPatch(Path(country_coords, codes), 
+                                          facecolor=country_color, 
+                                          edgecolor=border_color, 
+                                          linewidth=3, alpha=0.8)
         ax.add_patch(country_polygon)
         
         # Dodaj rzekę jeśli podana
         if river_name:
-            river_coords = self.get_river_coordinates(river_name, country_name)
-            if river_coords is not None:
+            river_lines = self.get_river_coordinates(river_name, country_name)
+            for river_coords in river_lines or []:
                 ax.plot(river_coords[:, 0], river_coords[:, 1], 
                        color='#1565c0', linewidth=5, alpha=0.9, 
                        solid_capstyle='round', solid_joinstyle='round')
@@ -165,14 +115,14 @@ class HighQualityMapGenerator:
                        markeredgecolor='#b71c1c', markeredgewidth=2,
                        zorder=10)
                 # Ring wokół stolicy
-                circle = plt.Circle(capital_coords, 0.4, fill=False, 
+                circle = patches.Circle(capital_coords, 0.4, fill=False, 
                                   color='#d32f2f', linewidth=2, alpha=0.7)
                 ax.add_patch(circle)
                 # Wewnętrzny punkt
                 ax.plot(capital_coords[0], capital_coords[1], 'o', 
                        color='#ffcdd2', markersize=4, zorder=11)
                        
-        # Ustaw granice i usuń osie
+        # Ustaw granice
         if len(country_coords) > 0:
             margin = 1.0
             ax.set_xlim(country_coords[:, 0].min() - margin, 
@@ -180,25 +130,12 @@ class HighQualityMapGenerator:
             ax.set_ylim(country_coords[:, 1].min() - margin, 
                        country_coords[:, 1].max() + margin)
         
-        ax.axis('off')
-        
         # Zapisz jako SVG
-        svg_buffer = io.StringIO()
-        plt.savefig(svg_buffer, format='svg', bbox_inches='tight', 
-                   pad_inches=0.2, facecolor=bg_color, edgecolor='none', 
-                   dpi=200, transparent=False)
-        plt.close()
-        
-        svg_content = svg_buffer.getvalue()
-        svg_buffer.close()
-        
-        return svg_content
+        return session.to_svg(bg_color)
         
     def svg_to_base64(self, svg_content: str) -> str:
         """Konwertuje SVG do base64"""
-        svg_bytes = svg_content.encode('utf-8')
-        base64_string = base64.b64encode(svg_bytes).decode('utf-8')
-        return f"data:image/svg+xml;base64,{base64_string}"
+        return svg_to_base64(svg_content)
         
     def generate_capital_questions(self):
         """Typ 1: Pytania o stolice z kropkami na mapach"""
@@ -6,7 +6,6 @@ Tworzy 4 typy pytań wizualnych: stolice z kropkami, kontury krajów, rzeki, i k
 """
 
 import json
-import base64
 import requests
 import os
 import zipfile
@@ -17,6 +16,8 @@ import matplotlib.patches as patches
 from shapely.geometry import Point
 from pathlib import Path
 import io
+from svg_encoding import svg_to_base64
+from map_renderer import save_svg
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -143,8 +144,8 @@ class NaturalEarthMapGenerator:
         
         # Zapisz do SVG
         svg_buffer = io.StringIO()
-        plt.savefig(svg_buffer, format='svg', bbox_inches='tight', pad_inches=0.1, 
-                   facecolor='white', edgecolor='none', dpi=150)
+        save_svg(plt.gcf(), svg_buffer, bbox_inches='tight', pad_inches=0.1,
+                 facecolor='white', edgecolor='none', dpi=150)
         plt.close()
         
         svg_content = svg_buffer.getvalue()
@@ -154,9 +155,7 @@ class NaturalEarthMapGenerator:
         
     def svg_to_base64(self, svg_content: str) -> str:
         """Konwertuje SVG do base64"""
-        svg_bytes = svg_content.encode('utf-8')
-        base64_string = base64.b64encode(svg_bytes).decode('utf-8')
-        return f"data:image/svg+xml;base64,{base64_string}"
+        return svg_to_base64(svg_content)
         
     def generate_capital_questions(self):
         """Generuje pytania o stolice z kropkami na mapach"""
@@ -5,12 +5,12 @@ Pobiera rzeczywiste kontury krajów i rzek
 """
 
 import json
-import base64
 import requests
 import os
 import time
 from typing import List, Dict, Tuple
 from pathlib import Path
+from svg_encoding import svg_to_base64
 
 class OSMMapGenerator:
     def __init__(self):
@@ -239,9 +239,7 @@ class OSMMapGenerator:
         
     def svg_to_base64(self, svg_content: str) -> str:
         """Konwertuje SVG do base64"""
-        svg_bytes = svg_content.encode('utf-8')
-        base64_string = base64.b64encode(svg_bytes).decode('utf-8')
-        return f"data:image/svg+xml;base64,{base64_string}"
+        return svg_to_base64(svg_content)
         
     def generate_osm_questions(self):
         """Generuje pytania z rzeczywistymi mapami OSM"""
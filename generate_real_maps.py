@@ -4,13 +4,13 @@ Generator prawdziwych map krajów i rzek z Natural Earth data
 """
 
 import json
-import base64
 import requests
 import os
 import zipfile
 import tempfile
 import subprocess
 from pathlib import Path
+from svg_encoding import svg_to_base64
 
 class RealMapGenerator:
     def __init__(self):
@@ -190,9 +190,7 @@ class RealMapGenerator:
         
     def svg_to_base64(self, svg_content: str) -> str:
         """Konwertuje SVG do base64"""
-        svg_bytes = svg_content.encode('utf-8')
-        base64_string = base64.b64encode(svg_bytes).decode('utf-8')
-        return f"data:image/svg+xml;base64,{base64_string}"
+        return svg_to_base64(svg_content)
         
     def generate_river_questions(self):
         """Generuje pytania o rzeki z realistycznymi mapami"""
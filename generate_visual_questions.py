@@ -5,11 +5,11 @@ Używa danych z Natural Earth i REST Countries API
 """
 
 import json
-import base64
 import requests
 import os
 from typing import List, Dict
 import xml.etree.ElementTree as ET
+from svg_encoding import svg_to_base64
 
 class VisualQuestionGenerator:
     def __init__(self):
@@ -133,9 +133,7 @@ class VisualQuestionGenerator:
         
     def svg_to_base64(self, svg_content: str) -> str:
         """Konwertuje SVG do base64 data URL"""
-        svg_bytes = svg_content.encode('utf-8')
-        base64_string = base64.b64encode(svg_bytes).decode('utf-8')
-        return f"data:image/svg+xml;base64,{base64_string}"
+        return svg_to_base64(svg_content)
         
     def generate_capital_questions(self) -> List[Dict]:
         """Generuje pytania o stolice z mapami"""
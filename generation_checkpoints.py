@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+💾 Punkty kontrolne długich przebiegów generatora
+Każde ukończone pytanie trafia od razu do osobnego pliku (zapis atomowy),
+więc przerwany przebieg można wznowić flagą --resume bez ponownego renderowania.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from svg_encoding import dump_json
+
+
+class CheckpointStore:
+    """💾 Katalog z punktami kontrolnymi jednego pliku wyjściowego"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.failures_path = self.directory / 'failures.json'
+
+    def _path(self, question_id):
+        # ID mogą zawierać spacje i inne znaki - nazwa pliku to skrót ID
+        digest = hashlib.sha1(question_id.encode('utf-8')).hexdigest()[:16]
+        return self.directory / f'{digest}.json'
+
+    def _write_atomic(self, path, data):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            dump_json(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def save(self, question, fingerprint=None):
+        """✅ Zapisuje ukończone pytanie (i czyści ewentualny wpis o błędzie)"""
+        self._write_atomic(self._path(question['id']), {'fingerprint': fingerprint, 'question': question})
+        failures = self.failures()
+        if question['id'] in failures:
+            del failures[question['id']]
+            self._write_atomic(self.failures_path, failures)
+
+    def load(self, question_id, fingerprint=None):
+        """📖 Zwraca pytanie z punktu kontrolnego, jeśli powstało z tych samych wejść"""
+        path = self._path(question_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if fingerprint is not None and data.get('fingerprint') != fingerprint:
+            return None
+        return data.get('question')
+
+    def record_failure(self, question_id, reason):
+        """❌ Zapisuje przyczynę błędu - pytanie zostanie ponowione przy --resume"""
+        failures = self.failures()
+        failures[question_id] = reason
+        self._write_atomic(self.failures_path, failures)
+
+    def failures(self):
+        if not self.failures_path.exists():
+            return {}
+        with open(self.failures_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def clear(self):
+        """🧹 Usuwa punkty kontrolne (po udanym przebiegu lub przy starcie bez --resume)"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        try:
+            # Wspólny katalog .checkpoints/ znika, gdy nie ma już innych plików wyjściowych
+            self.directory.parent.rmdir()
+        except OSError:
+            pass
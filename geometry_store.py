@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+🗃️ Kompaktowy magazyn geometrii mapowany do pamięci (mmap)
+Płaskie tablice współrzędnych, offsety pierścieni/części i indeks ID w jednym pliku.
+Wiele procesów renderujących otwiera ten sam plik i współdzieli jedną kopię w page cache.
+Obiekty shapely powstają dopiero na żądanie: pojedynczo dla używanych wierszy albo całą warstwą
+jednym wywołaniem from_ragged_array. Shapefile czytany jest z geometrią tylko przy budowie pliku.
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+MAGIC = b'PYTGEO02'
+ALIGN = 64
+
+# Źródłowe warstwy Natural Earth: (katalog, shapefile, pole ID lub None = numer wiersza)
+DEFAULT_LAYERS = {
+    'countries': ('countries', 'ne_50m_admin_0_countries.shp', 'ADM0_A3'),
+    'rivers': ('rivers', 'ne_50m_rivers_lake_centerlines.shp', None),
+    'lakes': ('lakes', 'ne_50m_lakes.shp', None),
+}
+
+_open_stores = {}
+
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def build_geometry_store(path, layers, dtype='float64'):
+    """🔨 Zapisuje warstwy {nazwa: (GeoDataFrame, pole_id)} do pliku magazynu"""
+    header = {'version': 2, 'dtype': np.dtype(dtype).str, 'layers': {}}
+    blobs = []
+    offset = 0
+
+    for name, (gdf, id_field) in layers.items():
+        mask = gdf.geometry.notna() & ~gdf.geometry.is_empty
+        subset = gdf[mask]
+        geoms = np.asarray(subset.geometry.values, dtype=object)
+        if id_field:
+            ids = [str(value) for value in subset[id_field]]
+        else:
+            ids = [str(value) for value in subset.index]
+
+        geometry_type, coords, offsets = shapely.to_ragged_array(geoms)
+        arrays = {
+            'coords': np.ascontiguousarray(coords, dtype=dtype),
+            'bounds': shapely.bounds(geoms).astype('float64'),
+        }
+        for level, level_offsets in enumerate(offsets):
+            arrays[f'offsets_{level}'] = np.ascontiguousarray(level_offsets, dtype='int64')
+
+        layer_info = {
+            'geometry_type': int(geometry_type), 'ids': ids, 'levels': len(offsets), 'arrays': {},
+            # Pozycje wierszy w pliku źródłowym - do złączenia z atrybutami czytanymi bez geometrii
+            'rows': np.flatnonzero(np.asarray(mask)).tolist(),
+            'crs': gdf.crs.to_string() if gdf.crs is not None else None,
+        }
+        for array_name, array in arrays.items():
+            offset = _align(offset)
+            layer_info['arrays'][array_name] = [offset, array.dtype.str, list(array.shape)]
+            blobs.append((offset, array))
+            offset += array.nbytes
+        header['layers'][name] = layer_info
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for blob_offset, array in blobs:
+            f.seek(data_start + blob_offset)
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    tmp_path.replace(path)
+    return path
+
+
+def build_from_geodata(data_dir, path, dtype='float64'):
+    """🌍 Buduje magazyn bezpośrednio z plików Natural Earth w katalogu geodata/"""
+    import geopandas as gpd
+
+    data_dir = Path(data_dir)
+    layers = {}
+    for name, (folder, shapefile, id_field) in DEFAULT_LAYERS.items():
+        shapefile_path = data_dir / folder / shapefile
+        if shapefile_path.exists():
+            layers[name] = (gpd.read_file(shapefile_path), id_field)
+    return build_geometry_store(path, layers, dtype=dtype)
+
+
+def is_store_stale(data_dir, path):
+    """⏱️ Sprawdza czy magazyn jest starszy niż źródłowe shapefile (albo ma stary format)"""
+    path = Path(path)
+    if not path.exists():
+        return True
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return True
+    store_mtime = path.stat().st_mtime
+    for folder, shapefile, _ in DEFAULT_LAYERS.values():
+        shapefile_path = Path(data_dir) / folder / shapefile
+        if shapefile_path.exists() and shapefile_path.stat().st_mtime > store_mtime:
+            return True
+    return False
+
+
+class StoreLayer:
+    """📐 Jedna warstwa magazynu - widoki numpy na zmapowaną pamięć"""
+
+    def __init__(self, buffer, data_start, info):
+        self.geometry_type = shapely.GeometryType(info['geometry_type'])
+        self.ids = info['ids']
+        self.rows = info['rows']
+        self.crs = info['crs']
+        self.index = {geom_id: row for row, geom_id in enumerate(self.ids)}
+        self.levels = info['levels']
+        self._arrays = {}
+        for name, (offset, dtype, shape) in info['arrays'].items():
+            count = int(np.prod(shape))
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + offset)
+            self._arrays[name] = array.reshape(shape)
+        self.coords_array = self._arrays['coords']
+        self.bounds_array = self._arrays['bounds']
+        self._offsets = [self._arrays[f'offsets_{level}'] for level in range(self.levels)]
+        self._cache = {}
+        self._all = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, geom_id):
+        return geom_id in self.index
+
+    def row(self, geom_id):
+        return self.index[geom_id]
+
+    def bounds(self, geom_id):
+        """📏 Zwraca (minx, miny, maxx, maxy) bez tworzenia geometrii"""
+        return tuple(float(value) for value in self.bounds_array[self.index[geom_id]])
+
+    def query_bbox(self, minx, miny, maxx, maxy):
+        """🔍 Zwraca ID geometrii, których bbox przecina podany prostokąt"""
+        b = self.bounds_array
+        hits = np.nonzero((b[:, 0] <= maxx) & (b[:, 2] >= minx) & (b[:, 1] <= maxy) & (b[:, 3] >= miny))[0]
+        return [self.ids[row] for row in hits]
+
+    def _slices(self, row):
+        """Zwraca zakres współrzędnych i lokalne offsety dla jednego wiersza"""
+        start, stop = row, row + 1
+        local_offsets = []
+        for level_offsets in reversed(self._offsets):
+            window = level_offsets[start:stop + 1]
+            local_offsets.append(window - window[0])
+            start, stop = int(window[0]), int(window[-1])
+        local_offsets.reverse()
+        return start, stop, local_offsets
+
+    def coords(self, geom_id):
+        """📍 Widok (bez kopiowania) na wszystkie współrzędne geometrii"""
+        start, stop, _ = self._slices(self.index[geom_id])
+        return self.coords_array[start:stop]
+
+    def rings(self, geom_id):
+        """🔁 Lista widoków na kolejne pierścienie/linie geometrii"""
+        start, stop, local_offsets = self._slices(self.index[geom_id])
+        coords = self.coords_array[start:stop]
+        ring_offsets = local_offsets[0]
+        return [coords[ring_offsets[i]:ring_offsets[i + 1]] for i in range(len(ring_offsets) - 1)]
+
+    def geometry(self, geom_id):
+        """🧩 Materializuje obiekt shapely (na żądanie, z cache)"""
+        row = self.index[geom_id]
+        if self._all is not None:
+            return self._all[row]
+        if row not in self._cache:
+            start, stop, local_offsets = self._slices(row)
+            coords = np.asarray(self.coords_array[start:stop], dtype='float64')
+            offsets = tuple(np.asarray(level, dtype='int64') for level in local_offsets)
+            self._cache[row] = shapely.from_ragged_array(self.geometry_type, coords, offsets)[0]
+        return self._cache[row]
+
+    def geometries(self):
+        """🧩 Wszystkie geometrie warstwy jednym wywołaniem from_ragged_array (z cache)"""
+        if self._all is None:
+            coords = np.asarray(self.coords_array, dtype='float64')
+            self._all = shapely.from_ragged_array(self.geometry_type, coords, tuple(self._offsets))
+            for row, geometry in self._cache.items():
+                self._all[row] = geometry
+        return self._all
+
+
+class GeometryStore:
+    """🗃️ Magazyn geometrii otwarty przez mmap (tylko do odczytu)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Niepoprawny plik magazynu geometrii: {self.path}")
+        (header_len,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        header = json.loads(self._mmap[header_start:header_start + header_len].decode('utf-8'))
+        data_start = _align(header_start + header_len)
+
+        self.layers = {
+            name: StoreLayer(self._mmap, data_start, info)
+            for name, info in header['layers'].items()
+        }
+
+    def __getitem__(self, layer_name):
+        return self.layers[layer_name]
+
+    def __contains__(self, layer_name):
+        return layer_name in self.layers
+
+
+def open_geometry_store(path):
+    """📂 Otwiera magazyn raz na proces (kolejne wywołania zwracają ten sam obiekt, po przebudowie - nowy)"""
+    path = Path(path)
+    key = (str(path.resolve()), path.stat().st_mtime_ns)
+    if key not in _open_stores:
+        _open_stores[key] = GeometryStore(path)
+    return _open_stores[key]
+
+
+if __name__ == "__main__":
+    import sys
+
+    base_dir = Path(__file__).parent
+    data_dir = base_dir / "geodata"
+    store_path = data_dir / "geometry_store.bin"
+    dtype = 'float32' if '--float32' in sys.argv else 'float64'
+
+    print("🗃️ Budowanie magazynu geometrii...")
+    build_from_geodata(data_dir, store_path, dtype=dtype)
+    store = GeometryStore(store_path)
+    for name, layer in store.layers.items():
+        print(f"✅ {name}: {len(layer)} geometrii, {len(layer.coords_array)} punktów")
+    print(f"💾 Zapisano {store_path} ({store_path.stat().st_size / 1024:.0f} KB)")
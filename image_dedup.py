@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+🧬 Deduplikacja obrazów pytań po skrócie zawartości
+Przechodzi po questions/*.json, dekoduje obrazy (data URL), liczy SHA-256 zawartości
+i zapisuje każdy unikalny obraz raz w questions/images/<skrót>.<rozszerzenie>.
+Pytania dostają pole imageRef zamiast image, a backend wczytuje każdy obraz do pamięci raz.
+"""
+
+import base64
+import hashlib
+import json
+from pathlib import Path
+
+from build_manifest import BuildManifest, manifest_path_for
+
+IMAGES_DIR = 'images'
+REF_LENGTH = 20
+
+MIME_EXTENSIONS = {
+    'image/svg+xml': '.svg',
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+
+
+def parse_data_url(url):
+    """🔍 data:<mime>;base64,<dane> -> (mime, bajty) albo None dla innych wartości"""
+    if not isinstance(url, str) or not url.startswith('data:'):
+        return None
+    header, _, payload = url.partition(',')
+    mime, _, encoding = header[len('data:'):].partition(';')
+    if encoding != 'base64' or mime not in MIME_EXTENSIONS:
+        return None
+    return mime, base64.b64decode(payload)
+
+
+def image_ref(mime, payload):
+    """🔑 Nazwa pliku obrazu: skrót zawartości + rozszerzenie typu"""
+    return hashlib.sha256(payload).hexdigest()[:REF_LENGTH] + MIME_EXTENSIONS[mime]
+
+
+def _with_image_ref(question, ref):
+    """Pytanie z imageRef w miejscu image (kolejność pól bez zmian)"""
+    return {('imageRef' if key == 'image' else key): (ref if key == 'image' else value)
+            for key, value in question.items()}
+
+
+def dedupe_questions(questions_dir, prune=True):
+    """🧬 Przenosi obrazy wszystkich plików pytań do wspólnego katalogu; zwraca statystyki"""
+    questions_dir = Path(questions_dir)
+    images_dir = questions_dir / IMAGES_DIR
+    images_dir.mkdir(exist_ok=True)
+    stats = {'files': 0, 'images': 0, 'unique': set(), 'inline_bytes': 0, 'written': 0}
+    referenced = set()
+
+    for questions_file in sorted(questions_dir.glob('*.json')):
+        with open(questions_file, encoding='utf-8') as f:
+            questions = json.load(f)
+        if not isinstance(questions, list):
+            continue
+
+        rewritten = {}
+        for index, question in enumerate(questions):
+            if not isinstance(question, dict):
+                continue
+            if isinstance(question.get('imageRef'), str):
+                referenced.add(question['imageRef'])
+            parsed = parse_data_url(question.get('image'))
+            if parsed is None:
+                continue
+            ref = image_ref(*parsed)
+            image_file = images_dir / ref
+            if not image_file.exists():
+                image_file.write_bytes(parsed[1])
+                stats['written'] += 1
+            stats['images'] += 1
+            stats['unique'].add(ref)
+            stats['inline_bytes'] += len(question['image'].encode('utf-8'))
+            referenced.add(ref)
+            rewritten[index] = _with_image_ref(question, ref)
+
+        if not rewritten:
+            continue
+        stats['files'] += 1
+
+        # Manifest pipeline'u wskazuje teraz na przepisane pytania - bez zbędnego ponownego renderu
+        manifest_file = manifest_path_for(questions_file)
+        if manifest_file.exists():
+            manifest = BuildManifest(manifest_file)
+            for index, question in rewritten.items():
+                manifest.rewrite_output(question.get('id'), questions[index], question)
+            manifest.save()
+
+        for index, question in rewritten.items():
+            questions[index] = question
+        tmp_file = questions_file.with_name(questions_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(questions, f, ensure_ascii=False, indent=2)
+        tmp_file.replace(questions_file)
+        print(f"🧬 {questions_file.name}: {len(rewritten)} obrazów -> imageRef")
+
+    stats['pruned'] = 0
+    if prune:
+        for image_file in images_dir.iterdir():
+            if image_file.is_file() and image_file.name not in referenced:
+                image_file.unlink()
+                stats['pruned'] += 1
+
+    stats['unique_bytes'] = sum((images_dir / ref).stat().st_size for ref in stats['unique'])
+    stats['unique'] = len(stats['unique'])
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    base_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Deduplikuje obrazy pytań po skrócie zawartości")
+    parser.add_argument('--questions-dir', default=str(base_dir / 'questions'))
+    parser.add_argument('--keep-unused', action='store_true',
+                        help='nie usuwaj obrazów, do których nie odwołuje się żadne pytanie')
+    args = parser.parse_args()
+
+    stats = dedupe_questions(args.questions_dir, prune=not args.keep_unused)
+    saved = stats['inline_bytes'] - stats['unique_bytes']
+    print(f"✅ Obrazy: {stats['images']} w {stats['files']} plikach -> {stats['unique']} unikalnych "
+          f"(nowe: {stats['written']}, usunięte nieużywane: {stats['pruned']})")
+    print(f"💾 Zaoszczędzono {saved / 1024:.0f} KB "
+          f"({stats['inline_bytes'] / 1024:.0f} KB w pytaniach -> {stats['unique_bytes'] / 1024:.0f} KB obrazów)")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+💧 Indeks jezior Natural Earth: jedno złączenie jezior z krajami i ranking powierzchni
+Prostokąty jezior przechodzą przez indeks przestrzenny krajów (filtr bbox), a dokładny test
+intersects liczony jest na przygotowanych (shapely.prepare) geometriach krajów - wszystko
+jednym przebiegiem dla wszystkich par. Tabela kraj -> jeziora od największego (powierzchnia
+w odwzorowaniu równopolowym) zostaje w pamięci: pytanie o jezioro to odczyt z tabeli
+i podświetlenie gotowej geometrii na podkładce kraju. Części jednego jeziora scalane są
+jak odcinki rzek w river_index.py.
+"""
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from map_projection import EQUAL_AREA_CRS, project
+
+
+def lake_keys(lakes_gdf):
+    """🔑 Klucz jeziora: wikidataid, a bez niego nazwa - części jednego jeziora mają ten sam klucz"""
+    if 'wikidataid' in lakes_gdf.columns:
+        return lakes_gdf['wikidataid'].fillna(lakes_gdf['name'])
+    return lakes_gdf['name']
+
+
+class LakeIndex:
+    """💧 Nazwane jeziora, ich powierzchnie (km²) i tabela wierszy countries_gdf -> jeziora"""
+
+    def __init__(self, lakes_gdf, countries_gdf):
+        lakes = lakes_gdf[lakes_gdf.geometry.notna() & lakes_gdf['name'].notna()]
+        # Części tego samego jeziora jako jedna geometria
+        lakes = lakes.dissolve(by=lake_keys(lakes).rename('key'), aggfunc='first', sort=True).reset_index()
+        english = lakes['name_en'].fillna(lakes['name']) if 'name_en' in lakes.columns else lakes['name']
+        polish = lakes['name_pl'].fillna(english) if 'name_pl' in lakes.columns else english
+        self.names = english.to_numpy(dtype=object)
+        # Klucz jak id w warstwie lakes topologii (topology_export.py)
+        self.ids = lakes['key'].to_numpy(dtype=object)
+        self.source_names = lakes['name'].to_numpy(dtype=object)
+        self.names_pl = polish.to_numpy(dtype=object)
+        self.geometries = lakes.geometry.to_numpy()
+        self.areas = shapely.area(project(self.geometries, EQUAL_AREA_CRS)) / 1e6
+        # Przy powtórzonej nazwie wygrywa największe jezioro
+        self.aliases = {}
+        for lake_id in np.argsort(-self.areas, kind='stable'):
+            for name in (self.names[lake_id], self.names_pl[lake_id], self.source_names[lake_id]):
+                self.aliases.setdefault(name.strip().lower(), lake_id)
+
+        # Filtr bbox w indeksie krajów, potem dokładny test na przygotowanych geometriach
+        countries = countries_gdf.geometry.values
+        lake_ids, country_rows = countries_gdf.sindex.query(self.geometries)
+        shapely.prepare(countries)
+        hits = shapely.intersects(countries[country_rows], self.geometries[lake_ids])
+        table = pd.DataFrame({'row': country_rows[hits], 'lake_id': lake_ids[hits],
+                              'area_km2': self.areas[lake_ids[hits]]})
+        table = table.sort_values(['row', 'area_km2', 'lake_id'], ascending=[True, False, True], kind='stable')
+        table['rank'] = table.groupby('row').cumcount()
+        self.table = table.reset_index(drop=True)
+        self._by_row = self.table.groupby('row')['lake_id'].agg(list).to_dict()
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, lake_name):
+        """🔑 Numer jeziora dla nazwy angielskiej, polskiej lub oryginalnej albo None"""
+        if not lake_name:
+            return None
+        return self.aliases.get(lake_name.strip().lower())
+
+    def lakes_in(self, row, limit=None):
+        """🏞️ Numery jezior kraju (wiersz countries_gdf) od największego"""
+        return self._by_row.get(row, [])[:limit]
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+🧅 Warstwy SVG map: wspólna podkładka + lekkie nakładki
+Kontur kraju renderowany jest raz (matplotlib) w stałym kadrze (MapFrame),
+a znacznik stolicy, rzeki, etykiety i tytuł dokładane są jako grupy <g> tekstu SVG.
+Grupy: base (podkładka), question (nakładka pytania) i reveal (odpowiedź, domyślnie ukryta).
+"""
+
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import shapely
+
+from svg_encoding import SvgDocument
+
+# Pełny rozmiar figury (10 x 8 cali przy 72 pt/cal) i margines jak pad_inches=0.2
+MAX_MAP_SIZE = (720.0, 576.0)
+FRAME_PAD = 14.4
+FONT_FAMILY = 'DejaVu Sans, Arial, sans-serif'
+
+TITLE_FONT_SIZE = 16
+TITLE_GAP = 20
+
+# Promień pierścienia wokół stolicy (stopnie)
+CAPITAL_RING_RADIUS = 0.5
+
+# Identyfikatory grup warstwowego SVG
+BASE_GROUP = 'base'
+QUESTION_GROUP = 'question'
+REVEAL_GROUP = 'reveal'
+
+
+def _fmt(value):
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+class MapFrame:
+    """📐 Stały kadr mapy: zakres danych (stopnie lub metry odwzorowania crs) -> współrzędne SVG (pt)"""
+
+    def __init__(self, xlim, ylim, aspect=1.0, title=False, crs=None, units_per_degree=1.0):
+        self.xlim = tuple(float(v) for v in xlim)
+        self.ylim = tuple(float(v) for v in ylim)
+        self.aspect = float(aspect)
+        self.crs = crs
+        self.units_per_degree = float(units_per_degree)
+        self.title_height = TITLE_FONT_SIZE * 1.2 + TITLE_GAP if title else 0.0
+
+        data_width = self.xlim[1] - self.xlim[0]
+        data_height = (self.ylim[1] - self.ylim[0]) * self.aspect
+        max_width, max_height = MAX_MAP_SIZE
+        scale = min(max_width / data_width, (max_height - self.title_height) / data_height)
+        self.sx = scale
+        self.sy = scale * self.aspect
+        self.map_width = data_width * scale
+        self.map_height = data_height * scale
+        self.width = self.map_width + 2 * FRAME_PAD
+        self.height = self.map_height + 2 * FRAME_PAD + self.title_height
+        self.left = FRAME_PAD
+        self.top = FRAME_PAD + self.title_height
+
+    @property
+    def resolution(self):
+        """🔍 Rozmiar jednego punktu SVG w jednostkach kadru - tolerancja upraszczania"""
+        return 1 / max(self.sx, self.sy)
+
+    def padded_bounds(self, fraction=0.05):
+        """📦 Zakres kadru powiększony o margines (krawędzie przycięcia poza widocznym obszarem)"""
+        pad_x = (self.xlim[1] - self.xlim[0]) * fraction
+        pad_y = (self.ylim[1] - self.ylim[0]) * fraction
+        return (self.xlim[0] - pad_x, self.ylim[0] - pad_y, self.xlim[1] + pad_x, self.ylim[1] + pad_y)
+
+    def axes_position(self):
+        """Pozycja osi matplotlib w ułamkach figury (left, bottom, width, height)"""
+        return (self.left / self.width, FRAME_PAD / self.height,
+                self.map_width / self.width, self.map_height / self.height)
+
+    def to_svg(self, coords):
+        """📍 Tablica (N, 2) w jednostkach kadru -> (N, 2) punktów SVG (oś y w dół)"""
+        coords = np.asarray(coords, dtype='float64')
+        x = self.left + (coords[..., 0] - self.xlim[0]) * self.sx
+        y = self.top + (self.ylim[1] - coords[..., 1]) * self.sy
+        return np.stack([x, y], axis=-1)
+
+    def path_data(self, lines):
+        """〰️ Atrybut d ścieżki dla listy linii (N, 2)"""
+        parts = []
+        for line in lines:
+            points = self.to_svg(line)
+            if len(points) < 2:
+                continue
+            parts.append('M' + ' L'.join(f'{_fmt(x)} {_fmt(y)}' for x, y in points))
+        return ' '.join(parts)
+
+    def clip_path(self, clip_id):
+        """✂️ Definicja przycinania do obszaru mapy (jak osie matplotlib)"""
+        return (f'<defs><clipPath id="{clip_id}"><rect x="{_fmt(self.left)}" y="{_fmt(self.top)}" '
+                f'width="{_fmt(self.map_width)}" height="{_fmt(self.map_height)}"/></clipPath></defs>')
+
+
+def lines_overlay(frame, geometries, color, width, opacity, clip_id=None):
+    """🌊 Linie (Multi)LineString jako jedna ścieżka SVG"""
+    lines = shapely.get_parts(np.atleast_1d(np.asarray(geometries, dtype=object)))
+    path = frame.path_data(shapely.get_coordinates(line) for line in lines if not line.is_empty)
+    if not path:
+        return ''
+    clip = f' clip-path="url(#{clip_id})"' if clip_id else ''
+    return (f'<path d="{path}" fill="none" stroke="{color}" stroke-width="{_fmt(width)}" '
+            f'stroke-opacity="{opacity}" stroke-linecap="round" stroke-linejoin="round"{clip}/>')
+
+
+def polygons_overlay(frame, geometries, color, opacity, width=1.5, clip_id=None):
+    """💧 Wielokąty (jeziora) jako jedna wypełniona ścieżka SVG - pierścienie wewnętrzne to wyspy"""
+    polygons = shapely.get_parts(np.atleast_1d(np.asarray(geometries, dtype=object)))
+    rings = [ring for polygon in polygons if not polygon.is_empty
+             for ring in (polygon.exterior, *polygon.interiors)]
+    path = frame.path_data(shapely.get_coordinates(ring) for ring in rings)
+    if not path:
+        return ''
+    clip = f' clip-path="url(#{clip_id})"' if clip_id else ''
+    return (f'<path d="{path}" fill="{color}" fill-opacity="{opacity}" fill-rule="evenodd" '
+            f'stroke="{color}" stroke-width="{_fmt(width)}" stroke-linejoin="round"{clip}/>')
+
+
+def capital_marker_overlay(frame, point, ring_radius=CAPITAL_RING_RADIUS):
+    """🏛️ Kropka stolicy z pierścieniem (promień pierścienia w stopniach)"""
+    (x, y), = frame.to_svg([point])
+    radius = ring_radius * frame.units_per_degree
+    return (f'<ellipse cx="{_fmt(x)}" cy="{_fmt(y)}" rx="{_fmt(radius * frame.sx)}" '
+            f'ry="{_fmt(radius * frame.sy)}" fill="none" stroke="#d32f2f" stroke-width="2" '
+            f'stroke-opacity="0.7"/>'
+            f'<circle cx="{_fmt(x)}" cy="{_fmt(y)}" r="7.5" fill="#d32f2f" stroke="#b71c1c" stroke-width="3"/>'
+            f'<circle cx="{_fmt(x)}" cy="{_fmt(y)}" r="3" fill="#ffcdd2"/>')
+
+
+def label_size(text, font_size=12):
+    """📏 Szacowany rozmiar ramki etykiety (bez dostępu do metryk czcionki)"""
+    pad = font_size * 0.5
+    text_width = sum(0.8 if char.isupper() else 0.65 for char in text) * font_size
+    return text_width + 2 * pad, font_size + 2 * pad
+
+
+def label_overlay(x, y, text, color, font_size=12):
+    """🏷️ Pogrubiona etykieta w zaokrąglonej białej ramce; (x, y) to lewy górny róg ramki"""
+    pad = font_size * 0.5
+    box_width, box_height = label_size(text, font_size)
+    return (f'<rect x="{_fmt(x)}" y="{_fmt(y)}" width="{_fmt(box_width)}" height="{_fmt(box_height)}" '
+            f'rx="{_fmt(pad)}" fill="white" fill-opacity="0.9" stroke="{color}"/>'
+            f'<text x="{_fmt(x + pad)}" y="{_fmt(y + pad + font_size * 0.8)}" fill="{color}" '
+            f'font-family="{FONT_FAMILY}" font-size="{font_size}" font-weight="bold">{escape(text)}</text>')
+
+
+def corner_label_overlay(frame, text, color):
+    """🏷️ Etykieta w lewym górnym rogu mapy (jak tekst w 0.05, 0.95 osi)"""
+    x = frame.left + frame.map_width * 0.05
+    y = frame.top + frame.map_height * 0.05
+    return label_overlay(x, y, text, color)
+
+
+def point_label_overlay(frame, point, text, color, offset=12):
+    """📍 Etykieta obok punktu - po prawej, a przy prawej krawędzi mapy po lewej"""
+    (x, y), = frame.to_svg([point])
+    box_width, box_height = label_size(text)
+    if x + offset + box_width > frame.left + frame.map_width:
+        left = x - offset - box_width
+    else:
+        left = x + offset
+    return label_overlay(left, y - box_height / 2, text, color)
+
+
+def capital_label_overlay(frame, point, text, color, ring_radius=CAPITAL_RING_RADIUS):
+    """🏛️ Nazwa stolicy obok pierścienia znacznika"""
+    ring = ring_radius * frame.units_per_degree * frame.sx
+    return point_label_overlay(frame, point, text, color, offset=max(12, ring + 4))
+
+
+def line_label_point(frame, geometries, avoid=None):
+    """🎯 Miejsce na podpis linii: środek najdłuższego widocznego odcinka,
+    a przy podanym punkcie avoid - miejsce na linii jak najdalej od niego"""
+    visible = shapely.clip_by_rect(shapely.union_all(np.asarray(geometries, dtype=object)),
+                                   frame.xlim[0], frame.ylim[0], frame.xlim[1], frame.ylim[1])
+    parts = [part for part in shapely.get_parts(visible) if part.length > 0]
+    if not parts:
+        return None
+    longest = max(parts, key=lambda part: part.length)
+    candidates = [longest.interpolate(fraction, normalized=True) for fraction in (0.5, 0.3, 0.7, 0.15, 0.85)]
+    if avoid is not None:
+        avoid_point = shapely.Point(avoid)
+        candidates.sort(key=lambda point: -point.distance(avoid_point))
+    return candidates[0].x, candidates[0].y
+
+
+def title_overlay(frame, title):
+    """📝 Tytuł wyśrodkowany nad mapą"""
+    x = frame.left + frame.map_width / 2
+    y = frame.top - TITLE_GAP
+    return (f'<text x="{_fmt(x)}" y="{_fmt(y)}" text-anchor="middle" fill="#000000" '
+            f'font-family="{FONT_FAMILY}" font-size="{TITLE_FONT_SIZE}" font-weight="bold">{escape(title)}</text>')
+
+
+def group(group_id, content, hidden=False):
+    """📦 Nazwana grupa <g id=...>; ukrytą frontend włącza usuwając atrybut display"""
+    display = ' display="none"' if hidden else ''
+    return f'<g id={quoteattr(group_id)}{display}>{content}</g>'
+
+
+def compose_svg(base_svg, overlays):
+    """🧅 Dokleja grupy nakładek na końcu dokumentu SVG podkładki
+    Podkładka w bytes daje SvgDocument z widokami na nią - bez kopii podkładki na każde pytanie."""
+    if isinstance(base_svg, bytes):
+        end = base_svg.rindex(b'</svg>')
+        base = memoryview(base_svg)
+        return SvgDocument(base[:end], (''.join(overlays) + '\n').encode('utf-8'), base[end:])
+    end = base_svg.rindex('</svg>')
+    return base_svg[:end] + ''.join(overlays) + '\n' + base_svg[end:]
@@ -0,0 +1,851 @@
+#!/usr/bin/env python3
+"""
+🏭 Wspólny pipeline generowania pytań wizualnych
+Jeden proces, dane ładowane raz: źródło danych -> geometria -> render -> kodowanie -> zapis.
+Każdy typ pytania to wtyczka zarejestrowana w PLUGINS, więc jeden przebieg
+renderuje wszystkie typy na współdzielonych danych i cache.
+"""
+
+import argparse
+import fnmatch
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from build_manifest import BuildManifest, manifest_path_for
+from generation_checkpoints import CheckpointStore
+from svg_encoding import Base64DataUrl, dump_json, iter_json, svg_bytes
+
+PLUGINS = {}
+ALL_DATASETS = ('countries', 'rivers', 'lakes')
+
+
+def register_plugin(cls):
+    """🔌 Rejestruje klasę wtyczki pod jej nazwą"""
+    PLUGINS[cls.name] = cls
+    return cls
+
+
+class GeoDataSource:
+    """📂 Źródło danych - Natural Earth pobierane i ładowane raz na cały przebieg"""
+
+    def __init__(self, generator=None):
+        self.generator = generator
+        self.loaded = set()
+
+    def load(self, datasets=ALL_DATASETS):
+        """Zwraca VisualQuestionGenerator z załadowanymi (tylko brakującymi) zbiorami danych"""
+        if self.generator is None:
+            from visual_question_generator import VisualQuestionGenerator
+            self.generator = VisualQuestionGenerator()
+        missing = set(datasets) - self.loaded
+        if missing:
+            if not self.generator.download_natural_earth_data(missing):
+                raise RuntimeError("Nie udało się pobrać danych Natural Earth")
+            if not self.generator.load_geodata(missing):
+                raise RuntimeError("Nie udało się załadować danych geograficznych")
+            self.loaded |= missing
+        return self.generator
+
+
+class Base64Encoder:
+    """📝 Kodowanie SVG -> data URL (leniwy: base64 powstaje kawałkami dopiero przy zapisie pliku)"""
+
+    def encode(self, svg_content):
+        return Base64DataUrl(svg_content)
+
+
+def _iter_question_json(question):
+    """Tekst jednego elementu tablicy dokładnie tak, jak zapisuje go json.dump(..., indent=2) - kawałkami"""
+    chunks = iter_json([question], ensure_ascii=False, indent=2)
+    previous = next(chunks)[2:]
+    for chunk in chunks:
+        yield previous
+        previous = chunk
+    yield previous[:-2]
+
+
+def _array_element_spans(text):
+    """Zwraca [(start, end, obiekt)] dla elementów tablicy JSON najwyższego poziomu"""
+    decoder = json.JSONDecoder()
+    spans = []
+    pos = text.index('[') + 1
+    while True:
+        while text[pos].isspace():
+            pos += 1
+        if text[pos] == ']':
+            return spans, pos
+        obj, end = decoder.raw_decode(text, pos)
+        spans.append((pos, end, obj))
+        pos = end
+        while text[pos].isspace():
+            pos += 1
+        if text[pos] == ',':
+            pos += 1
+
+
+def merge_questions_into_file(output_file, questions, remove_ids=()):
+    """🔀 Podmienia/usuwa pytania po ID w istniejącym pliku, nie ruszając bajtów pozostałych"""
+    output_file = Path(output_file)
+    if not output_file.exists():
+        with open(output_file, 'w', encoding='utf-8') as f:
+            dump_json(questions, f, ensure_ascii=False, indent=2)
+        return len(questions), 0, 0
+
+    with open(output_file, encoding='utf-8') as f:
+        text = f.read()
+    spans, close_pos = _array_element_spans(text)
+
+    pending = {question['id']: question for question in questions}
+    remove_ids = set(remove_ids)
+    # Elementy to wycinki istniejącego tekstu (str) albo pytania do zapisania strumieniowo (dict)
+    elements = []
+    replaced = removed = 0
+    for start, end, existing in spans:
+        question_id = existing.get('id') if isinstance(existing, dict) else None
+        if question_id in remove_ids and question_id not in pending:
+            removed += 1
+        elif question_id in pending:
+            elements.append(pending.pop(question_id))
+            replaced += 1
+        else:
+            elements.append('  ' + text[start:end])
+
+    # Nowe pytania dopisujemy na końcu tablicy
+    added = list(pending.values())
+    elements.extend(added)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(text[:text.index('[')])
+        f.write('[\n' if elements else '[]')
+        for index, element in enumerate(elements):
+            if index:
+                f.write(',\n')
+            if isinstance(element, str):
+                f.write(element)
+            else:
+                f.writelines(_iter_question_json(element))
+        f.write(('\n]' if elements else '') + text[close_pos + 1:])
+    return len(added), replaced, removed
+
+
+class JsonFileSink:
+    """💾 Zbiera pytania per plik wyjściowy i zapisuje je na końcu przebiegu"""
+
+    def __init__(self, output_dir, merge=False):
+        self.output_dir = Path(output_dir)
+        self.merge = merge
+        self.files = {}
+        self.removed = {}
+
+    def add(self, output, question):
+        self.files.setdefault(output, []).append(question)
+
+    def remove(self, output, question_ids):
+        """Oznacza pytania do usunięcia z pliku (istotne przy scalaniu)"""
+        self.files.setdefault(output, [])
+        self.removed.setdefault(output, set()).update(question_ids)
+
+    def existing(self, output):
+        """📖 Pytania obecnie zapisane w pliku wyjściowym: {id: pytanie}"""
+        output_file = self.output_dir / output
+        if not output_file.exists():
+            return {}
+        with open(output_file, encoding='utf-8') as f:
+            return {question.get('id'): question for question in json.load(f) if isinstance(question, dict)}
+
+    def close(self):
+        self.output_dir.mkdir(exist_ok=True)
+        for output, questions in self.files.items():
+            output_file = self.output_dir / output
+            if self.merge:
+                added, replaced, removed = merge_questions_into_file(
+                    output_file, questions, self.removed.get(output, ()))
+                print(f"🔀 {output_file}: podmieniono {replaced}, dodano {added}, usunięto {removed} pytań")
+                continue
+            with open(output_file, 'w', encoding='utf-8') as f:
+                dump_json(questions, f, ensure_ascii=False, indent=2)
+            print(f"💾 Zapisano {len(questions)} pytań do {output_file}")
+
+
+class SpecFilter:
+    """🎯 Filtr wyboru pytań: kody/nazwy krajów i wzorce ID (fnmatch)"""
+
+    def __init__(self, countries=None, ids=None):
+        self.countries = {country.strip().lower() for country in countries or [] if country.strip()}
+        self.ids = [pattern.strip() for pattern in ids or [] if pattern.strip()]
+
+    def __bool__(self):
+        return bool(self.countries or self.ids)
+
+    def matches_id(self, question_id):
+        return not self.ids or any(fnmatch.fnmatch(question_id, pattern) for pattern in self.ids)
+
+    def matches_spec(self, spec, generator=None):
+        if not self.matches_id(spec['id']):
+            return False
+        if not self.countries:
+            return True
+        country = spec.get('country', '')
+        if country.lower() in self.countries:
+            return True
+        if generator is None:
+            return False
+        country_data = generator.get_country_data(country)
+        if country_data is None:
+            return False
+        codes = {str(country_data.get(field, '')).lower() for field in ('ISO_A2_EH', 'ISO_A2', 'ADM0_A3')}
+        return bool(codes & self.countries)
+
+
+class PipelineContext:
+    """🧰 Wspólny stan przebiegu: etapy i instancje generatorów"""
+
+    def __init__(self, source, encoder, sink, spec_filter=None):
+        self.source = source
+        self.encoder = encoder
+        self.sink = sink
+        self.spec_filter = spec_filter or SpecFilter()
+        self.shared = {}
+        self.manifests = {}
+        self.existing = {}
+        self.checkpoint_stores = {}
+
+    def checkpoints(self, output):
+        """💾 Punkty kontrolne pliku wyjściowego w questions/.checkpoints/<plik>/"""
+        if output not in self.checkpoint_stores:
+            directory = self.sink.output_dir / '.checkpoints' / Path(output).stem
+            self.checkpoint_stores[output] = CheckpointStore(directory)
+        return self.checkpoint_stores[output]
+
+    def manifest(self, output):
+        """📒 Manifest budowania dla pliku wyjściowego (jeden na przebieg)"""
+        if output not in self.manifests:
+            self.manifests[output] = BuildManifest(manifest_path_for(self.sink.output_dir / output))
+        return self.manifests[output]
+
+    def existing_questions(self, output):
+        if output not in self.existing:
+            self.existing[output] = self.sink.existing(output)
+        return self.existing[output]
+
+    def shared_instance(self, key, factory):
+        """Zwraca jedną instancję na przebieg (np. generator z cache)"""
+        if key not in self.shared:
+            self.shared[key] = factory()
+        return self.shared[key]
+
+
+class QuestionPlugin:
+    """🔌 Bazowa wtyczka: specyfikacje -> render SVG -> pytanie"""
+
+    name = None
+    output = None
+    datasets = ()
+    # Czy typ wchodzi do przebiegu bez --types (tryb świata tylko na życzenie)
+    default = True
+    # Czy wtyczka umie zawęzić pytania do --countries
+    filters_countries = True
+
+    def specs(self, ctx):
+        return []
+
+    def selected_specs(self, ctx):
+        return [spec for spec in self.specs(ctx) if ctx.spec_filter.matches_spec(spec)]
+
+    def render(self, ctx, spec):
+        raise NotImplementedError
+
+    def build(self, ctx, spec, image):
+        raise NotImplementedError
+
+    def fingerprint_inputs(self, ctx, spec):
+        """(styl, wersja danych) dla manifestu; None = wtyczka zawsze renderuje od nowa"""
+        return None
+
+    def produce(self, ctx, spec):
+        """Render -> kodowanie -> pytanie (None gdy nie udało się utworzyć mapy)"""
+        svg_content = self.render(ctx, spec)
+        if not svg_content:
+            return None
+        question = self.build(ctx, spec, ctx.encoder.encode(svg_content))
+        print(f"✅ [{self.name}] {spec['id']}")
+        return question
+
+    def generate(self, ctx):
+        for spec in self.selected_specs(ctx):
+            question = self.produce(ctx, spec)
+            if question:
+                yield question
+
+    def render_all(self, ctx, reverse=False):
+        """🔬 (id, SVG) wybranych pytań do weryfikacji; reverse zmienia kolejność rozgrzewania cache"""
+        specs = self.selected_specs(ctx)
+        for spec in reversed(specs) if reverse else specs:
+            yield spec['id'], self.render(ctx, spec)
+
+
+class NaturalEarthPlugin(QuestionPlugin):
+    """🌍 Typy z visual_question_generator.py - specyfikacje, render i budowa pytania z generatora"""
+
+    output = 'natural_earth_geography.json'
+    datasets = ('countries',)
+    kind = None
+    # Prefiks metody specyfikacji: '' = map_specs/*.json, 'world_' = wszystkie kraje z danych
+    specs_prefix = ''
+
+    def specs(self, ctx):
+        return getattr(ctx.source.load(self.datasets), f'{self.specs_prefix}{self.kind}_specs')()
+
+    def selected_specs(self, ctx):
+        generator = ctx.source.load(self.datasets)
+        return [spec for spec in self.specs(ctx) if ctx.spec_filter.matches_spec(spec, generator)]
+
+    def render(self, ctx, spec):
+        return getattr(ctx.source.load(self.datasets), f'render_{self.kind}_map')(spec)
+
+    def build(self, ctx, spec, image):
+        return getattr(ctx.source.load(self.datasets), f'build_{self.kind}_question')(spec, image)
+
+    def fingerprint_inputs(self, ctx, spec):
+        from visual_question_generator import RENDER_VERSION
+        generator = ctx.source.load(self.datasets)
+        style = dict(generator.get_map_style(self.question_type),
+                     question_type=self.question_type, renderer=RENDER_VERSION)
+        return style, generator.geodata_version(self.datasets)
+
+
+@register_plugin
+class CapitalPlugin(NaturalEarthPlugin):
+    name = 'capital'
+    kind = 'capital'
+    question_type = 'capital'
+
+
+@register_plugin
+class CountryPlugin(NaturalEarthPlugin):
+    name = 'country'
+    kind = 'country'
+    question_type = 'country'
+
+
+@register_plugin
+class ContextPlugin(NaturalEarthPlugin):
+    name = 'context'
+    kind = 'context'
+    question_type = 'context'
+    datasets = ('countries', 'lakes')
+
+
+@register_plugin
+class RiverPlugin(NaturalEarthPlugin):
+    name = 'river'
+    kind = 'river'
+    question_type = 'river'
+    datasets = ('countries', 'rivers')
+
+
+@register_plugin
+class ComboPlugin(NaturalEarthPlugin):
+    name = 'combo'
+    kind = 'combo'
+    question_type = 'river'
+    datasets = ('countries', 'rivers')
+
+
+@register_plugin
+class LakePlugin(NaturalEarthPlugin):
+    name = 'lake'
+    kind = 'lake'
+    question_type = 'lake'
+    datasets = ('countries', 'lakes')
+
+
+class WorldPlugin(NaturalEarthPlugin):
+    """🌐 Tryb świata: specyfikacje dla każdego kraju z countries_gdf, osobny plik wyjściowy"""
+
+    output = 'natural_earth_world.json'
+    specs_prefix = 'world_'
+    default = False
+
+
+@register_plugin
+class WorldCapitalPlugin(WorldPlugin):
+    name = 'world-capital'
+    kind = 'capital'
+    question_type = 'capital'
+    datasets = ('countries', 'places')
+
+
+@register_plugin
+class WorldCountryPlugin(WorldPlugin):
+    name = 'world-country'
+    kind = 'country'
+    question_type = 'country'
+
+
+@register_plugin
+class WorldContextPlugin(WorldPlugin):
+    name = 'world-context'
+    kind = 'context'
+    question_type = 'context'
+    datasets = ('countries', 'lakes')
+
+
+@register_plugin
+class WorldLakePlugin(WorldPlugin):
+    name = 'world-lake'
+    kind = 'lake'
+    question_type = 'lake'
+    datasets = ('countries', 'lakes')
+
+
+@register_plugin
+class WorldComboPlugin(WorldPlugin):
+    name = 'world-combo'
+    kind = 'combo'
+    question_type = 'river'
+    datasets = ('countries', 'rivers', 'places')
+
+
+class BatchPlugin(QuestionPlugin):
+    """📦 Wtyczka dla starszych generatorów, które tworzą całą partię pytań jedną metodą"""
+
+    method = None
+    # Gotowe pytania nie niosą kraju w jednolitej postaci - zostaje tylko filtr --ids
+    filters_countries = False
+
+    def instance(self, ctx):
+        raise NotImplementedError
+
+    def generate(self, ctx):
+        # Starsze generatory nie mają specyfikacji - filtrujemy gotowe pytania po ID
+        questions = [question for question in getattr(self.instance(ctx), self.method)()
+                     if ctx.spec_filter.matches_id(question['id'])]
+        for question in questions:
+            yield question
+        print(f"✅ [{self.name}] {len(questions)} pytań")
+
+    def render_all(self, ctx, reverse=False):
+        # Bez specyfikacji porównujemy obrazy pełnych partii
+        for question in self.generate(ctx):
+            image = question.get('image')
+            yield question['id'], image and str(image)
+
+
+class AttributePlugin(BatchPlugin):
+    """📊 attribute_questions.py - pytania tekstowe z kolumn countries_gdf (bez map, tylko przez --types)"""
+
+    output = 'attribute-geography.json'
+    datasets = ('countries',)
+    default = False
+
+    def instance(self, ctx):
+        def factory():
+            from attribute_questions import AttributeQuestionGenerator
+            return AttributeQuestionGenerator(ctx.source.load(self.datasets).countries_gdf)
+        return ctx.shared_instance('attributes', factory)
+
+    def render_all(self, ctx, reverse=False):
+        # Pytania bez obrazów - weryfikacja bajtów SVG ich nie dotyczy
+        return iter(())
+
+
+@register_plugin
+class AttributePopulationPlugin(AttributePlugin):
+    name = 'attr_population'
+    method = 'generate_population_questions'
+
+
+@register_plugin
+class AttributeAreaPlugin(AttributePlugin):
+    name = 'attr_area'
+    method = 'generate_area_questions'
+
+
+@register_plugin
+class AttributeContinentPlugin(AttributePlugin):
+    name = 'attr_continent'
+    method = 'generate_continent_questions'
+
+
+class HighQualityPlugin(BatchPlugin):
+    """✨ generate_high_quality_maps.py - paczka współrzędnych ładowana raz"""
+
+    output = 'high-quality-geography.json'
+
+    def instance(self, ctx):
+        from generate_high_quality_maps import HighQualityMapGenerator
+        return ctx.shared_instance('high_quality', HighQualityMapGenerator)
+
+
+@register_plugin
+class HighQualityCapitalPlugin(HighQualityPlugin):
+    name = 'hq_capital'
+    method = 'generate_capital_questions'
+
+
+@register_plugin
+class HighQualityOutlinePlugin(HighQualityPlugin):
+    name = 'hq_outline'
+    method = 'generate_country_outline_questions'
+
+
+@register_plugin
+class HighQualityRiverPlugin(HighQualityPlugin):
+    name = 'hq_river'
+    method = 'generate_river_questions'
+
+
+@register_plugin
+class HighQualityComboPlugin(HighQualityPlugin):
+    name = 'hq_combo'
+    method = 'generate_combination_questions'
+
+
+class LegacyNaturalEarthPlugin(BatchPlugin):
+    """🗺️ generate_natural_earth_maps.py - korzysta z danych już załadowanych przez GeoDataSource"""
+
+    output = 'natural-earth-geography.json'
+    datasets = ('countries', 'rivers')
+
+    def instance(self, ctx):
+        def factory():
+            from generate_natural_earth_maps import NaturalEarthMapGenerator
+            source = ctx.source.load(self.datasets)
+            generator = NaturalEarthMapGenerator()
+            generator.countries_gdf = source.countries_gdf
+            generator.rivers_gdf = source.rivers_gdf
+            return generator
+        return ctx.shared_instance('legacy_natural_earth', factory)
+
+
+@register_plugin
+class LegacyCapitalPlugin(LegacyNaturalEarthPlugin):
+    name = 'legacy_capital'
+    method = 'generate_capital_questions'
+
+
+@register_plugin
+class LegacyOutlinePlugin(LegacyNaturalEarthPlugin):
+    name = 'legacy_outline'
+    method = 'generate_country_outline_questions'
+
+
+@register_plugin
+class LegacyRiverPlugin(LegacyNaturalEarthPlugin):
+    name = 'legacy_river'
+    method = 'generate_river_questions'
+
+
+@register_plugin
+class LegacyComboPlugin(LegacyNaturalEarthPlugin):
+    name = 'legacy_combo'
+    method = 'generate_combination_questions'
+
+
+class RealisticPlugin(BatchPlugin):
+    """🎨 generate_real_maps.py - ręcznie rysowane ścieżki SVG"""
+
+    output = 'realistic-geography.json'
+
+    def instance(self, ctx):
+        from generate_real_maps import RealMapGenerator
+        return ctx.shared_instance('realistic', RealMapGenerator)
+
+
+@register_plugin
+class RealisticRiverPlugin(RealisticPlugin):
+    name = 'real_river'
+    method = 'generate_river_questions'
+
+
+@register_plugin
+class RealisticCapitalPlugin(RealisticPlugin):
+    name = 'real_capital'
+    method = 'generate_capital_questions'
+
+
+@register_plugin
+class OsmPlugin(BatchPlugin):
+    """🛰️ generate_osm_maps.py - granice z Overpass API (wymaga sieci, tylko przez --types)"""
+
+    name = 'osm'
+    output = 'osm-geography.json'
+    default = False
+    method = 'generate_osm_questions'
+
+    def instance(self, ctx):
+        from generate_osm_maps import OSMMapGenerator
+        return ctx.shared_instance('osm', OSMMapGenerator)
+
+
+class RestCountriesPlugin(BatchPlugin):
+    """📡 generate_visual_questions.py - dane z REST Countries pobierane raz (wymaga sieci, tylko przez --types)"""
+
+    output = 'visual-geography.json'
+    default = False
+
+    def instance(self, ctx):
+        def factory():
+            from generate_visual_questions import VisualQuestionGenerator as RestCountriesGenerator
+            generator = RestCountriesGenerator()
+            generator.load_countries_data()
+            return generator
+        return ctx.shared_instance('rest_countries', factory)
+
+
+@register_plugin
+class RestCapitalPlugin(RestCountriesPlugin):
+    name = 'rest_capital'
+    method = 'generate_capital_questions'
+
+
+@register_plugin
+class RestRiverPlugin(RestCountriesPlugin):
+    name = 'rest_river'
+    method = 'generate_river_questions'
+
+
+class MapPipeline:
+    """🏭 Uruchamia wybrane wtyczki w jednym przebiegu na wspólnych etapach"""
+
+    def __init__(self, types=None, source=None, encoder=None, sink=None, output_dir=None,
+                 spec_filter=None, merge=False, incremental=True, resume=False):
+        base_dir = Path(__file__).parent
+        by_country = bool(spec_filter and spec_filter.countries)
+        # Z --countries domyślny zestaw pomija wtyczki, które nie umieją filtrować po kraju
+        self.types = list(types) if types else [name for name, cls in PLUGINS.items()
+                                                if cls.default and (cls.filters_countries or not by_country)]
+        unknown = [name for name in self.types if name not in PLUGINS]
+        if unknown:
+            raise ValueError(f"Nieznane typy pytań: {', '.join(unknown)} (dostępne: {', '.join(PLUGINS)})")
+        unfiltered = [name for name in self.types if by_country and not PLUGINS[name].filters_countries]
+        if unfiltered:
+            raise ValueError(f"--countries nie działa dla typów: {', '.join(unfiltered)} (użyj --ids)")
+        self.ctx = PipelineContext(
+            source=source or GeoDataSource(),
+            encoder=encoder or Base64Encoder(),
+            sink=sink or JsonFileSink(output_dir or base_dir / 'questions', merge=merge),
+            spec_filter=spec_filter,
+        )
+        self.incremental = incremental
+        self.resume = resume
+        self.failures = []
+
+    def record_failure(self, plugin, question_id, reason, checkpoint=True):
+        """❌ Zapamiętuje błąd pojedynczego pytania zamiast przerywać cały przebieg"""
+        self.failures.append((plugin.name, question_id, reason))
+        if checkpoint:
+            self.ctx.checkpoints(plugin.output).record_failure(question_id, reason)
+        print(f"❌ [{plugin.name}] {question_id}: {reason}")
+
+    def run_incremental(self, plugin):
+        """📒 Renderuje tylko nowe/zmienione specyfikacje, resztę bierze z pliku; zwraca (render, reuse)"""
+        ctx = self.ctx
+        manifest = ctx.manifest(plugin.output)
+        existing = ctx.existing_questions(plugin.output)
+        checkpoints = ctx.checkpoints(plugin.output)
+        rendered = reused = 0
+        spec_ids = set()
+
+        for spec in plugin.selected_specs(ctx):
+            spec_ids.add(spec['id'])
+            style, geodata = plugin.fingerprint_inputs(ctx, spec)
+            fingerprint = manifest.fingerprint(plugin.name, spec, style, geodata)
+            current = existing.get(spec['id'])
+            if self.incremental and manifest.is_fresh(spec['id'], fingerprint, current):
+                ctx.sink.add(plugin.output, current)
+                reused += 1
+                continue
+
+            question = checkpoints.load(spec['id'], fingerprint) if self.resume else None
+            if question is None:
+                try:
+                    question = plugin.produce(ctx, spec)
+                    if not question:
+                        raise ValueError("nie udało się utworzyć mapy")
+                except Exception as e:
+                    self.record_failure(plugin, spec['id'], f"{type(e).__name__}: {e}")
+                    # Ostatnia dobra wersja zostaje w pliku do czasu udanego renderu
+                    if current is not None:
+                        ctx.sink.add(plugin.output, current)
+                    continue
+                checkpoints.save(question, fingerprint)
+                rendered += 1
+            else:
+                reused += 1
+            manifest.record(spec['id'], fingerprint, question)
+            ctx.sink.add(plugin.output, question)
+
+        # Usunięte specyfikacje znikają z pliku i manifestu (tylko gdy widzimy pełną listę)
+        if not ctx.spec_filter:
+            removed = manifest.prune(plugin.name, spec_ids)
+            if removed:
+                ctx.sink.remove(plugin.output, removed)
+                print(f"🧹 [{plugin.name}] usunięto {len(removed)} nieaktualnych pytań")
+        return rendered, reused
+
+    def run(self):
+        print(f"🏭 Pipeline: {', '.join(self.types)}")
+        plugins = [PLUGINS[name]() for name in self.types]
+        if not self.resume:
+            for output in {plugin.output for plugin in plugins}:
+                self.ctx.checkpoints(output).clear()
+
+        rendered = reused = 0
+        for plugin in plugins:
+            if isinstance(plugin, BatchPlugin):
+                try:
+                    questions = list(plugin.generate(self.ctx))
+                except Exception as e:
+                    self.record_failure(plugin, plugin.name, f"{type(e).__name__}: {e}")
+                    continue
+                for question in questions:
+                    self.ctx.sink.add(plugin.output, question)
+                rendered += len(questions)
+                continue
+            plugin_rendered, plugin_reused = self.run_incremental(plugin)
+            rendered += plugin_rendered
+            reused += plugin_reused
+
+        self.ctx.sink.close()
+        for manifest in self.ctx.manifests.values():
+            manifest.save()
+        print(f"🎉 Wyrenderowano {rendered} pytań, bez zmian {reused} (jeden przebieg)")
+        self.report_failures()
+        return rendered + reused
+
+    def verify(self):
+        """🔬 Renderuje każde wybrane pytanie tutaj i w świeżym procesie, porównuje bajty; zwraca liczbę rozbieżności
+        Osobny proces (spawn) ma własny matplotlib, rcParams i losowe haszowanie napisów, więc wykrywa też
+        niedeterminizm między procesami, a odwrotna kolejność renderów - zależność od stanu cache."""
+        print(f"🔬 Weryfikacja deterministyczności: {', '.join(self.types)}")
+        checked = 0
+        mismatches = []
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            copy = pool.submit(_render_copy, self.types, self.ctx.spec_filter)
+            first_pass = []
+            for name in self.types:
+                plugin = PLUGINS[name]()
+                try:
+                    first_pass.extend((plugin, question_id, svg) for question_id, svg in plugin.render_all(self.ctx))
+                except Exception as e:
+                    self.record_failure(plugin, plugin.name, f"{type(e).__name__}: {e}", checkpoint=False)
+            second_pass = copy.result()
+
+        for plugin, question_id, first in first_pass:
+            if not first:
+                self.record_failure(plugin, question_id, "nie udało się utworzyć mapy", checkpoint=False)
+                continue
+            checked += 1
+            first = svg_bytes(first)
+            second = second_pass.get((plugin.name, question_id))
+            if first != second:
+                mismatches.append((plugin.name, question_id, _first_difference(first.decode('utf-8'),
+                                                                               second and second.decode('utf-8'))))
+
+        for plugin_name, question_id, difference in mismatches:
+            print(f"   ≠ [{plugin_name}] {question_id}: {difference}")
+        status = "✅" if not mismatches else "❌"
+        print(f"{status} Sprawdzono {checked} map, różnych bajtów: {len(mismatches)}")
+        if self.failures:
+            print(f"⚠️ Nie udało się wyrenderować {len(self.failures)} map (pominięte w porównaniu)")
+        return len(mismatches)
+
+    def report_failures(self):
+        """📋 Raport końcowy: lista błędów z przyczynami (punkty kontrolne zostają do --resume)"""
+        if not self.failures:
+            for store in self.ctx.checkpoint_stores.values():
+                store.clear()
+            return
+        print(f"\n⚠️ Nie udało się wygenerować {len(self.failures)} pytań:")
+        for plugin_name, question_id, reason in self.failures:
+            print(f"   • [{plugin_name}] {question_id}: {reason}")
+        print("🔁 Popraw dane i uruchom ponownie z --resume - gotowe pytania nie będą renderowane od nowa")
+
+
+def _render_copy(types, spec_filter):
+    """🔬 Drugi egzemplarz map dla verify - wywoływany w świeżym procesie, w odwrotnej kolejności"""
+    pipeline = MapPipeline(types=types, spec_filter=spec_filter)
+    images = {}
+    for name in types:
+        plugin = PLUGINS[name]()
+        try:
+            for question_id, svg in plugin.render_all(pipeline.ctx, reverse=True):
+                # SvgDocument trzyma widoki memoryview - do procesu nadrzędnego wracają gotowe bajty
+                images[(name, question_id)] = svg and svg_bytes(svg)
+        except Exception as e:
+            print(f"❌ [{name}] drugi przebieg: {type(e).__name__}: {e}")
+    return images
+
+
+def _first_difference(first, second):
+    """Opis pierwszej różnicy dwóch tekstów (pozycja i fragmenty)"""
+    if second is None:
+        return "brak w drugim przebiegu"
+    position = next((i for i, (a, b) in enumerate(zip(first, second)) if a != b), min(len(first), len(second)))
+    return f"bajt {position}: {first[position:position + 40]!r} vs {second[position:position + 40]!r}"
+
+
+def _csv(value):
+    return [item for item in value.split(',') if item.strip()] if value else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="🏭 Generator pytań wizualnych - wszystkie typy w jednym przebiegu")
+    subparsers = parser.add_subparsers(dest='command')
+
+    generate_parser = subparsers.add_parser('generate', help='generuje (wybrane) pytania')
+    list_parser = subparsers.add_parser('list', help='wypisuje typy pytań lub ID wybranych pytań')
+    verify_parser = subparsers.add_parser('verify', help='renderuje dwa razy i sprawdza, czy bajty SVG są identyczne')
+    for sub in (generate_parser, list_parser, verify_parser):
+        sub.add_argument('--types', type=_csv, default=None, help='np. river,combo')
+        sub.add_argument('--countries', type=_csv, default=None, help='kody ISO lub nazwy, np. PL,DE')
+        sub.add_argument('--ids', type=_csv, default=None, help='wzorce ID, np. ne_river_*')
+    generate_parser.add_argument('--output-dir', default=None)
+    generate_parser.add_argument('--replace', action='store_true',
+                                 help='nadpisz pliki zamiast scalać (domyślnie przy braku filtrów)')
+    generate_parser.add_argument('--full', action='store_true',
+                                 help='ignoruj manifest i renderuj wszystko od nowa')
+    generate_parser.add_argument('--resume', action='store_true',
+                                 help='wznów przerwany przebieg z punktów kontrolnych (ponawia tylko błędy i braki)')
+
+    args = parser.parse_args(argv)
+    command = args.command or 'generate'
+    types = getattr(args, 'types', None)
+    spec_filter = SpecFilter(getattr(args, 'countries', None), getattr(args, 'ids', None))
+
+    if command == 'list':
+        if not types and not spec_filter:
+            for name, plugin_cls in PLUGINS.items():
+                extra = '' if plugin_cls.default else '  (tylko przez --types)'
+                print(f"{name:16} -> {plugin_cls.output}{extra}")
+            return 0
+        pipeline = MapPipeline(types=types, spec_filter=spec_filter)
+        for name in pipeline.types:
+            plugin = PLUGINS[name]()
+            if isinstance(plugin, BatchPlugin):
+                print(f"{name:16} (partia - ID znane dopiero po wygenerowaniu)")
+                continue
+            for spec in plugin.selected_specs(pipeline.ctx):
+                print(f"{name:16} {spec['id']}")
+        return 0
+
+    if command == 'verify':
+        pipeline = MapPipeline(types=types, spec_filter=spec_filter)
+        mismatches = pipeline.verify()
+        return 1 if mismatches or pipeline.failures else 0
+
+    partial = bool(types) or bool(spec_filter)
+    merge = partial and not getattr(args, 'replace', False)
+    pipeline = MapPipeline(types=types, output_dir=getattr(args, 'output_dir', None),
+                           spec_filter=spec_filter, merge=merge, incremental=not getattr(args, 'full', False),
+                           resume=getattr(args, 'resume', False))
+    pipeline.run()
+    return 1 if pipeline.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
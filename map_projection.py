@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+🌐 Warstwa odwzorowań map (pyproj)
+Mapy rysowane w surowych stopniach lon/lat rozciągają kraje północne (Norwegia, Finlandia).
+Każdy kraj dostaje lokalne odwzorowanie azymutalne równopolowe (LAEA) ze środkiem w jego
+środku, obiekty Transformer trzymane są per CRS (i per wątek - pyproj nie jest thread-safe),
+a cała tablica współrzędnych geometrii przechodzi przez transformację jednym wywołaniem.
+"""
+
+import threading
+
+import numpy as np
+import shapely
+from pyproj import CRS, Transformer
+from pyproj.enums import TransformDirection
+
+GEOGRAPHIC_CRS = 'EPSG:4326'
+
+# Odwzorowanie równopolowe całego świata do powierzchni (World Cylindrical Equal Area)
+EQUAL_AREA_CRS = 'EPSG:6933'
+
+# Długość jednego stopnia szerokości (m) - przeliczanie promieni podanych w stopniach
+METERS_PER_DEGREE = 111_320.0
+
+_local = threading.local()
+
+
+def crs_center(bounds):
+    """🎯 Środek odwzorowania lokalnego: środek bounds zaokrąglony do 0.1°"""
+    return round((bounds[0] + bounds[2]) / 2, 1), round((bounds[1] + bounds[3]) / 2, 1)
+
+
+def local_crs(bounds):
+    """📍 Lokalne LAEA ze środkiem w środku bounds (zaokrąglonym, by kraje dzieliły Transformery)"""
+    lon, lat = crs_center(bounds)
+    return f'+proj=laea +lat_0={lat:g} +lon_0={lon:g} +x_0=0 +y_0=0 +datum=WGS84 +units=m +no_defs'
+
+
+def get_transformer(crs):
+    """🔁 Transformer EPSG:4326 -> crs (tworzony raz na CRS w każdym wątku)"""
+    transformers = getattr(_local, 'transformers', None)
+    if transformers is None:
+        transformers = _local.transformers = {}
+    if crs not in transformers:
+        transformers[crs] = Transformer.from_crs(GEOGRAPHIC_CRS, CRS.from_user_input(crs), always_xy=True)
+    return transformers[crs]
+
+
+def project_coords(coords, crs):
+    """📐 Tablica (N, 2) lon/lat -> (N, 2) współrzędnych w crs (jedno wywołanie pyproj)"""
+    coords = np.asarray(coords, dtype='float64')
+    x, y = get_transformer(crs).transform(coords[..., 0], coords[..., 1])
+    return np.stack([x, y], axis=-1)
+
+
+def unproject_coords(coords, crs):
+    """↩️ Tablica (N, 2) w crs -> (N, 2) lon/lat"""
+    coords = np.asarray(coords, dtype='float64')
+    lon, lat = get_transformer(crs).transform(coords[..., 0], coords[..., 1],
+                                              direction=TransformDirection.INVERSE)
+    return np.stack([lon, lat], axis=-1)
+
+
+def project(geometries, crs):
+    """🗺️ Geometrie shapely w crs - współrzędne wszystkich geometrii transformowane naraz"""
+    transformer = get_transformer(crs)
+    return shapely.transform(geometries, lambda x, y: transformer.transform(x, y), interleaved=False)
+
+
+def geographic_bounds(bounds, crs, densify=21):
+    """📦 Prostokąt w crs -> obejmujący go prostokąt lon/lat (do zapytań i przycinania w stopniach)
+    Kadr przecinający antypołudnik (west > east, np. Kanada, Australia) dostaje pełny zakres długości."""
+    west, south, east, north = get_transformer(crs).transform_bounds(*bounds, densify_pts=densify,
+                                                                     direction=TransformDirection.INVERSE)
+    if west > east:
+        west, east = -180.0, 180.0
+    return west, south, east, north
+
+
+class ProjectionCache:
+    """💾 Rzutowane (i opcjonalnie uproszczone) geometrie per (klucz, CRS, LOD)
+    LOD to tolerancja upraszczania w jednostkach CRS (None = pełna szczegółowość)."""
+
+    def __init__(self):
+        self._projected = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._projected)
+
+    def get(self, key, geometry, crs, lod=None):
+        cache_key = (key, crs, lod)
+        with self._lock:
+            cached = self._projected.get(cache_key)
+        if cached is not None:
+            return cached
+        if lod is None:
+            projected = project(geometry, crs)
+        else:
+            projected = shapely.simplify(self.get(key, geometry, crs), lod, preserve_topology=True)
+        with self._lock:
+            return self._projected.setdefault(cache_key, projected)
+
+    def clear(self):
+        with self._lock:
+            self._projected.clear()
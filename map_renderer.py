@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+🖼️ Sesja renderowania map SVG
+Jedna Figure/Axes tworzona przez obiektowe API matplotlib (bez pyplot i jego stanu globalnego)
+i używana ponownie dla kolejnych map - między mapami usuwane są tylko narysowane artysty.
+Każdy wątek (i każdy proces) dostaje własną sesję, więc rendery mogą biec równolegle.
+Zapis SVG jest deterministyczny: stała sól identyfikatorów i brak daty w metadanych.
+"""
+
+import io
+import threading
+
+import numpy as np
+import shapely
+import matplotlib
+from matplotlib.backends.backend_svg import FigureCanvasSVG
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.path import Path
+
+from map_layers import BASE_GROUP
+from svg_variants import MAP_VIEW_ID
+
+DEFAULT_FIGSIZE = (10, 8)
+
+# Stała sól dla identyfikatorów clip-path/markerów (domyślnie matplotlib losuje uuid) i brak daty:
+# ten sam rysunek zawsze daje te same bajty SVG (atrybuty XMLWriter zapisuje posortowane)
+SVG_HASH_SALT = 'pytajka-maps'
+SVG_METADATA = {'Date': None}
+
+# Sól jest stała, więc ustawiamy ją raz przy imporcie: rc_context przy każdym zapisie zmieniał globalne
+# rcParams i wątek wychodzący z kontekstu przywracał losową sól innemu wątkowi w trakcie savefig
+matplotlib.rcParams['svg.hashsalt'] = SVG_HASH_SALT
+
+_local = threading.local()
+
+
+class RenderSession:
+    """🖼️ Figura i osie wielokrotnego użytku dla kolejnych map"""
+
+    def __init__(self, figsize=DEFAULT_FIGSIZE):
+        self.figsize = figsize
+        self.figure = Figure(figsize=figsize)
+        self.canvas = FigureCanvasSVG(self.figure)
+        self.ax = self.figure.add_subplot(1, 1, 1)
+        self._subplot_position = self.ax.get_position(original=True)
+        self.renders = 0
+
+    def begin(self, bg_color):
+        """🧹 Czyści artysty poprzedniej mapy i przygotowuje osie; zwraca Axes"""
+        ax = self.ax
+        for artist in list(ax.collections) + list(ax.patches) + list(ax.lines) + list(ax.texts):
+            artist.remove()
+        ax.set_title('')
+        self.figure.set_gid(None)
+        ax.set_gid(None)
+        self.figure.set_size_inches(self.figsize)
+        ax.set_position(self._subplot_position)
+        ax.set_aspect('equal')
+        ax.set_facecolor(bg_color)
+        ax.axis('off')
+        return ax
+
+    def to_svg(self, bg_color, bbox_inches='tight', pad_inches=0.2, dpi=200):
+        """💾 Zapisuje bieżącą mapę do tekstu SVG"""
+        return self._save(io.StringIO(), bg_color, bbox_inches, pad_inches, dpi)
+
+    def to_svg_bytes(self, bg_color, bbox_inches='tight', pad_inches=0.2, dpi=200):
+        """💾 Zapisuje bieżącą mapę prosto do bufora bajtów UTF-8 (bez pośredniego str)"""
+        return self._save(io.BytesIO(), bg_color, bbox_inches, pad_inches, dpi)
+
+    def _save(self, svg_buffer, bg_color, bbox_inches, pad_inches, dpi):
+        save_svg(self.figure, svg_buffer, bbox_inches=bbox_inches, pad_inches=pad_inches,
+                 facecolor=bg_color, edgecolor='none', dpi=dpi, transparent=False)
+        self.renders += 1
+        return svg_buffer.getvalue()
+
+    def render_layer(self, frame, bg_color, collections, gid=BASE_GROUP):
+        """🧱 Renderuje kolekcje w stałym kadrze MapFrame - bez przycinania do zawartości,
+        więc współrzędne SVG nakładek można wyliczyć z frame.to_svg; zwraca bytes"""
+        ax = self.begin(bg_color)
+        self.figure.set_size_inches(frame.width / 72, frame.height / 72)
+        self.figure.set_gid(gid)
+        ax.set_gid(MAP_VIEW_ID)
+        ax.set_position(frame.axes_position())
+        ax.set_aspect('auto')
+        ax.set_xlim(*frame.xlim)
+        ax.set_ylim(*frame.ylim)
+        for collection in collections:
+            ax.add_collection(collection)
+        return self.to_svg_bytes(bg_color, bbox_inches=None)
+
+
+def save_svg(figure, buffer, **kwargs):
+    """💾 figure.savefig do SVG z deterministycznymi identyfikatorami (sól z importu) i bez znacznika czasu"""
+    figure.savefig(buffer, format='svg', metadata=SVG_METADATA, **kwargs)
+
+
+def _split_coords(geometries):
+    """Zwraca listę tablic (N, 2) - po jednej na geometrię (jedno wywołanie shapely dla wszystkich)"""
+    coords, index = shapely.get_coordinates(geometries, return_index=True)
+    counts = np.bincount(index, minlength=len(geometries))
+    return np.split(coords, np.cumsum(counts)[:-1])
+
+
+def polygon_collection(geometries, **kwargs):
+    """🗺️ Warstwa (Multi)Polygon jako jedna PolyCollection - każda geometria to jedna ścieżka z wyspami i dziurami"""
+    polygons, geometry_index = shapely.get_parts(np.atleast_1d(np.asarray(geometries, dtype=object)),
+                                                 return_index=True)
+    rings, polygon_index = shapely.get_rings(polygons, return_index=True)
+    ring_geometry = geometry_index[polygon_index]
+    ring_coords = _split_coords(rings)
+
+    # Zewnętrzny pierścień przeciwnie do wskazówek zegara, dziury zgodnie - reguła nonzero wycina dziury
+    is_exterior = np.r_[True, polygon_index[1:] != polygon_index[:-1]][:len(rings)]
+    ccw = shapely.is_ccw(rings)
+
+    verts, codes, paths_for = [], [], []
+    for coords, exterior, counter_clockwise, owner in zip(ring_coords, is_exterior, ccw, ring_geometry):
+        if exterior != counter_clockwise:
+            coords = coords[::-1]
+        ring_codes = np.full(len(coords), Path.LINETO, dtype=Path.code_type)
+        ring_codes[0] = Path.MOVETO
+        ring_codes[-1] = Path.CLOSEPOLY
+        if not paths_for or paths_for[-1] != owner:
+            paths_for.append(owner)
+            verts.append([])
+            codes.append([])
+        verts[-1].append(coords)
+        codes[-1].append(ring_codes)
+
+    collection = PolyCollection([], **kwargs)
+    collection.set_verts_and_codes([np.concatenate(v) for v in verts], [np.concatenate(c) for c in codes])
+    return collection
+
+
+def line_collection(geometries, **kwargs):
+    """〰️ Wszystkie linie warstwy (Multi)LineString jako jedna LineCollection"""
+    lines = shapely.get_parts(np.atleast_1d(np.asarray(geometries, dtype=object)))
+    lines = lines[~shapely.is_empty(lines)]
+    return LineCollection(_split_coords(lines), **kwargs)
+
+
+def get_render_session(figsize=DEFAULT_FIGSIZE):
+    """🧵 Zwraca sesję renderowania bieżącego wątku (tworzoną przy pierwszym użyciu)"""
+    sessions = getattr(_local, 'sessions', None)
+    if sessions is None:
+        sessions = _local.sessions = {}
+    if figsize not in sessions:
+        sessions[figsize] = RenderSession(figsize)
+    return sessions[figsize]
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+📄 Specyfikacje pytań mapowych: pliki danych i tryb całego świata
+Ręcznie wybrane pytania (Europa) leżą w map_specs/*.json - jeden obiekt na linię, bez kodu.
+Tryb świata wyprowadza specyfikacje dla każdego kraju z countries_gdf kilkoma przebiegami
+kolumnowymi (pandas/numpy): polskie nazwy z kolumny NAME_PL, stolice z warstwy
+populated places Natural Earth, błędne odpowiedzi z grafu sąsiedztwa (country_graph.py),
+a w pytaniach o kontury także kraj o podobnym kształcie (shape_index.py). Pary stolica-rzeka
+do pytań kombinowanych odkrywa jedno złączenie przestrzenne stolic z indeksem rzek (river_index.py),
+a pytania o jeziora czytają gotową tabelę kraj -> jeziora (lake_index.py).
+"""
+
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import shapely
+
+SPECS_DIR = Path(__file__).parent / 'map_specs'
+
+# Kraje pomijane w trybie świata (brak sensownego konturu do rozpoznania)
+WORLD_EXCLUDED_CONTINENTS = ('Antarctica', 'Seven seas (open ocean)')
+WORLD_EXCLUDED_TYPES = ('Indeterminate',)
+WRONG_ANSWERS = 3
+
+# Ile błędnych odpowiedzi pytania o kontur pochodzi z indeksu kształtów (reszta z grafu sąsiedztwa)
+SHAPE_DISTRACTORS = 1
+
+# Odległość stolicy od rzeki (stopnie, ~5 km): bufor punktu stolicy w złączeniu dwithin
+CAPITAL_RIVER_DISTANCE = 0.05
+COMBO_QUESTION = 'Która rzeka przepływa przez stolicę tego kraju?'
+
+LAKE_QUESTION = 'Które jezioro jest podświetlone na mapie?'
+
+# Seed błędnych odpowiedzi - zmiana daje inny (ale znów powtarzalny) zestaw pytań
+DISTRACTOR_SEED = 0
+
+
+def load_spec_file(name, specs_dir=SPECS_DIR):
+    """📖 Zawartość map_specs/<name>.json (nowa kopia przy każdym wywołaniu)"""
+    with open(Path(specs_dir) / f'{name}.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def id_slug(value):
+    """🔤 Fragment ID pytania: małe litery, ciągi spacji i znaków interpunkcji jako jeden '_'"""
+    return re.sub(r'\W+', '_', str(value).lower()).strip('_')
+
+
+def polish_names(countries):
+    """🇵🇱 Polskie nazwy krajów z NAME_PL (NAME, gdy brak tłumaczenia)"""
+    if 'NAME_PL' not in countries.columns:
+        return countries['NAME'].astype(str)
+    return countries['NAME_PL'].where(countries['NAME_PL'].notna() & (countries['NAME_PL'] != ''),
+                                      countries['NAME']).astype(str)
+
+
+def world_countries(countries):
+    """🌍 Kraje trybu świata: bez Antarktydy, oceanów i terenów nieokreślonych, unikalne NAME"""
+    keep = ~countries['CONTINENT'].isin(WORLD_EXCLUDED_CONTINENTS) & ~countries['TYPE'].isin(WORLD_EXCLUDED_TYPES)
+    return countries[keep].drop_duplicates('NAME')
+
+
+def _graph_rows(all_countries, countries):
+    """Pozycje wybranych krajów w countries_gdf (wiersze grafu sąsiedztwa)"""
+    return all_countries.index.get_indexer(countries.index)
+
+
+def merge_rows(first, second, count):
+    """🔀 (N, count) wierszy: najpierw first, potem second bez powtórzeń (-1 = brak) - bez pętli po pytaniach"""
+    merged = np.concatenate([first, second], axis=1)
+    # Para (i, j) z j < i i tą samą wartością = powtórka wcześniejszego kandydata
+    earlier = np.tri(merged.shape[1], k=-1, dtype=bool)
+    duplicate = ((merged[:, :, None] == merged[:, None, :]) & earlier).any(axis=2)
+    usable = (merged >= 0) & ~duplicate
+    position = np.cumsum(usable, axis=1) - 1
+    keep = usable & (position < count)
+    result = np.full((len(merged), count), -1, dtype=np.intp)
+    result[np.nonzero(keep)[0], position[keep]] = merged[keep]
+    return result
+
+
+def world_country_specs(all_countries, graph, seed=DISTRACTOR_SEED, shapes=None):
+    """🗺️ Pytania o kontury wszystkich krajów: id z ADM0_A3, błędne odpowiedzi z grafu sąsiedztwa
+    Z indeksem kształtów (shapes) pierwsze SHAPE_DISTRACTORS odpowiedzi to kraje o podobnym konturze."""
+    countries = world_countries(all_countries)
+    rows = _graph_rows(all_countries, countries)
+    names_pl = polish_names(all_countries).to_numpy()
+    picked = graph.distractors(rows, WRONG_ANSWERS, seed=seed, candidates=rows)
+    if shapes is not None:
+        similar = shapes.similar_rows(rows, SHAPE_DISTRACTORS, candidates=rows)
+        picked = merge_rows(similar, picked, WRONG_ANSWERS)
+    peers = names_pl[picked]
+    frame = pd.DataFrame({
+        'country': countries['NAME'].to_numpy(),
+        'name_pl': names_pl[rows],
+        'wrong_answers': peers.tolist(),
+        'id': 'ne_world_country_' + countries['ADM0_A3'].str.lower().to_numpy(),
+    })
+    return frame.to_dict('records')
+
+
+def capital_table(places):
+    """🏛️ Stolica każdego kraju z populated places: ADM0_A3 -> nazwa (PL), lon, lat
+    Przy kilku stolicach (np. Holandia, Boliwia) wygrywa główna (Admin-0 capital), potem ludniejsza."""
+    capitals = places[places['ADM0CAP'] == 1]
+    primary = capitals['FEATURECLA'] == 'Admin-0 capital'
+    table = pd.DataFrame({
+        'ADM0_A3': capitals['ADM0_A3'],
+        'capital': polish_names(capitals),
+        'lon': capitals.geometry.x,
+        'lat': capitals.geometry.y,
+        'primary': primary,
+        'population': capitals['POP_MAX'],
+    })
+    table = table.sort_values(['primary', 'population'], ascending=False, kind='stable')
+    return table.drop_duplicates('ADM0_A3').set_index('ADM0_A3')
+
+
+def largest_cities(places, count=WRONG_ANSWERS):
+    """🏙️ ADM0_A3 -> lista (PL) największych miast kraju bez stolic - grupowanie bez pętli po krajach"""
+    places = places[places['ADM0CAP'] != 1]
+    cities = pd.DataFrame({'ADM0_A3': places['ADM0_A3'], 'name': polish_names(places),
+                           'population': places['POP_MAX']})
+    cities = cities.sort_values(['ADM0_A3', 'population'], ascending=[True, False], kind='stable')
+    cities = cities[cities.groupby('ADM0_A3').cumcount() < count]
+    return cities.groupby('ADM0_A3')['name'].agg(list)
+
+
+def world_capital_specs(all_countries, places, graph, seed=DISTRACTOR_SEED):
+    """🏛️ Pytania o stolice wszystkich krajów ze stolicą w populated places
+    Błędne odpowiedzi: największe miasta kraju, uzupełnione stolicami sąsiadów z grafu."""
+    countries = world_countries(all_countries)
+    capitals = capital_table(places)
+    all_capitals = capitals['capital'].reindex(all_countries['ADM0_A3'].to_numpy()).to_numpy()
+    rows = _graph_rows(all_countries, countries)
+    peers = graph.distractors(rows, WRONG_ANSWERS * 2, seed=seed, candidates=rows)
+    codes = countries['ADM0_A3'].to_numpy()
+    capital_names = all_capitals[rows]
+    cities = largest_cities(places).reindex(codes)
+
+    specs = []
+    for index in np.flatnonzero(pd.notna(capital_names)):
+        own = cities.iloc[index] if isinstance(cities.iloc[index], list) else []
+        nearby = [name for name in all_capitals[peers[index]] if isinstance(name, str)]
+        wrong = list(dict.fromkeys(name for name in own + nearby if name != capital_names[index]))
+        if len(wrong) < WRONG_ANSWERS:
+            continue
+        specs.append({
+            'country': countries['NAME'].iloc[index],
+            'capital': capital_names[index],
+            'wrong_answers': wrong[:WRONG_ANSWERS],
+            'id': f'ne_world_capital_{codes[index].lower()}',
+        })
+    return specs
+
+
+def capital_coordinates(countries, places):
+    """📍 NAME kraju -> (lon, lat) stolicy dla znacznika na mapie"""
+    capitals = capital_table(places)
+    joined = pd.DataFrame({'country': countries['NAME'].to_numpy(), 'ADM0_A3': countries['ADM0_A3'].to_numpy()})
+    joined = joined.join(capitals[['lon', 'lat']], on='ADM0_A3').dropna(subset=['lon'])
+    return {country: (lon, lat) for country, lon, lat in joined[['country', 'lon', 'lat']].itertuples(index=False)}
+
+
+def capital_rivers(countries, places, river_index, distance=CAPITAL_RIVER_DISTANCE):
+    """🔗 Wszystkie pary stolica-rzeka jednym złączeniem: punkty stolic (z buforem distance) x STRtree rzek
+    Wynik: ADM0_A3, capital, river_id, scalerank, distance - od najważniejszej rzeki każdej stolicy."""
+    capitals = capital_table(places).reindex(countries['ADM0_A3'].unique()).dropna(subset=['lon'])
+    points = shapely.points(capitals['lon'].to_numpy(float), capitals['lat'].to_numpy(float))
+    capital_rows, river_ids = river_index.tree.query(points, predicate='dwithin', distance=distance)
+    pairs = pd.DataFrame({
+        'ADM0_A3': capitals.index.to_numpy()[capital_rows],
+        'capital': capitals['capital'].to_numpy()[capital_rows],
+        'river_id': river_ids,
+        'scalerank': river_index.scaleranks[river_ids],
+        'distance': shapely.distance(points[capital_rows], river_index.geometries[river_ids]),
+    })
+    return pairs.sort_values(['ADM0_A3', 'scalerank', 'distance'], kind='stable').reset_index(drop=True)
+
+
+def world_combo_specs(all_countries, places, river_index, graph, seed=DISTRACTOR_SEED):
+    """🌍 Pytania kombinowane dla każdej stolicy leżącej nad rzeką (najważniejsza rzeka wg scalerank)
+    Błędne odpowiedzi: inne rzeki kraju od najważniejszych, uzupełnione rzekami sąsiadów z grafu."""
+    countries = world_countries(all_countries)
+    rows = _graph_rows(all_countries, countries)
+    best = capital_rivers(countries, places, river_index).drop_duplicates('ADM0_A3').set_index('ADM0_A3')
+
+    # Rzeki każdego kraju - jedno zapytanie do STRtree dla wszystkich krajów
+    country_rows, river_ids = river_index.tree.query(all_countries.geometry.values, predicate='intersects')
+    crossing = pd.DataFrame({'row': country_rows, 'river_id': river_ids,
+                             'scalerank': river_index.scaleranks[river_ids]})
+    crossing = crossing.sort_values(['row', 'scalerank', 'river_id'], kind='stable')
+    country_rivers = crossing.groupby('row')['river_id'].agg(list).reindex(range(len(all_countries)))
+    peers = graph.distractors(rows, WRONG_ANSWERS, seed=seed, candidates=rows)
+
+    codes = countries['ADM0_A3'].to_numpy()
+    names_pl = np.asarray(river_index.names_pl, dtype=object)
+    specs = []
+    for index in np.flatnonzero(np.isin(codes, best.index)):
+        pair = best.loc[codes[index]]
+        # Render szuka rzeki po nazwie - pomijamy nazwy, które wskazują inną (ważniejszą) rzekę
+        if river_index.lookup(river_index.names[pair['river_id']]) != pair['river_id']:
+            continue
+        candidates = []
+        for row in [rows[index], *peers[index]]:
+            if isinstance(country_rivers.iloc[row], list):
+                candidates.extend(country_rivers.iloc[row])
+        river_pl = names_pl[pair['river_id']]
+        wrong = list(dict.fromkeys(name for name in names_pl[candidates] if name != river_pl)) if candidates else []
+        if len(wrong) < WRONG_ANSWERS:
+            continue
+        specs.append({
+            'country': countries['NAME'].iloc[index],
+            'capital': pair['capital'],
+            'river': river_index.names[pair['river_id']],
+            'river_pl': river_pl,
+            'question': COMBO_QUESTION,
+            'wrong_answers': wrong[:WRONG_ANSWERS],
+            'id': f'ne_world_combo_{codes[index].lower()}',
+        })
+    return specs
+
+
+def lake_specs(all_countries, countries, lake_index, graph, id_format, seed=DISTRACTOR_SEED):
+    """💧 Pytanie o największe jezioro każdego kraju z tabeli kraj -> jeziora
+    Błędne odpowiedzi: kolejne jeziora kraju wg powierzchni, uzupełnione jeziorami sąsiadów z grafu.
+    id_format dostaje name (NAME), code (ADM0_A3) i lake (klucz jeziora jak id w topologii) - jako id_slug."""
+    rows = _graph_rows(all_countries, countries)
+    # Jeziora sąsiadów to dobre błędne odpowiedzi także wtedy, gdy o sąsiada nikt nie pyta
+    peers = graph.distractors(rows, WRONG_ANSWERS * 2, seed=seed)
+    names_pl = lake_index.names_pl
+
+    specs = []
+    for index, row in enumerate(rows):
+        own = lake_index.lakes_in(row)
+        if not own:
+            continue
+        lake_id = own[0]
+        candidates = own[1:] + [lake for peer in peers[index] for lake in lake_index.lakes_in(peer)]
+        wrong = list(dict.fromkeys(names_pl[lake] for lake in candidates if names_pl[lake] != names_pl[lake_id]))
+        if len(wrong) < WRONG_ANSWERS:
+            continue
+        country = countries['NAME'].iloc[index]
+        specs.append({
+            'country': country,
+            'lake': lake_index.names[lake_id],
+            'lake_pl': names_pl[lake_id],
+            'area_km2': round(float(lake_index.areas[lake_id])),
+            'wrong_answers': wrong[:WRONG_ANSWERS],
+            'id': id_format.format(name=id_slug(country), code=id_slug(countries['ADM0_A3'].iloc[index]),
+                                   lake=id_slug(lake_index.ids[lake_id])),
+        })
+    return specs
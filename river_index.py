@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+🌊 Indeks rzek Natural Earth: scalone geometrie i nazwy alternatywne
+Odcinki tej samej rzeki (ten sam wikidataid, a bez niego ta sama nazwa) łączone są w jedną
+geometrię. Wszystkie pola name_* i name_alt trafiają do słownika aliasów, więc
+"Danube", "Donau" i "Dunaj" wskazują tę samą rzekę, a names_pl trzyma nazwę do odpowiedzi.
+Fragmenty przycięte do kadru kraju liczone są raz na parę rzeka-kraj.
+"""
+
+import numpy as np
+import shapely
+
+
+def _aliases(value):
+    """Rozbija pole nazwy (name_alt bywa listą rozdzieloną ; lub ,) na znormalizowane aliasy"""
+    if not isinstance(value, str):
+        return []
+    parts = value.replace(';', ',').split(',')
+    return [part.strip().lower() for part in parts if part.strip()]
+
+
+class RiverIndex:
+    """🌊 Scalone rzeki z indeksem nazw, rangą (scalerank) i cache fragmentów per kraj"""
+
+    def __init__(self, rivers_gdf):
+        rivers = rivers_gdf[rivers_gdf.geometry.notna() & rivers_gdf['name'].notna()]
+        if 'wikidataid' in rivers.columns:
+            keys = rivers['wikidataid'].fillna(rivers['name'])
+        else:
+            keys = rivers['name']
+        name_fields = ['name', 'name_en'] + sorted(
+            column for column in rivers.columns if column.startswith('name_') and column != 'name_en')
+
+        self.names = []
+        self.names_pl = []
+        # Klucz grupy (wikidataid lub nazwa) - id rzeki w warstwie rivers topologii (topology_export.py)
+        self.ids = []
+        geometries = []
+        scaleranks = []
+        # Najważniejsze rzeki (najniższy scalerank) pierwsze - wygrywają przy konfliktach aliasów
+        groups = list(rivers.groupby(keys, sort=True))
+        if 'scalerank' in rivers.columns:
+            groups.sort(key=lambda item: item[1]['scalerank'].min())
+        row_river = {}
+        for river_id, (key, group) in enumerate(groups):
+            self.ids.append(key)
+            english = group['name_en'].dropna() if 'name_en' in group.columns else group['name']
+            self.names.append(english.iloc[0] if len(english) else group['name'].iloc[0])
+            polish = group['name_pl'].dropna() if 'name_pl' in group.columns else english
+            self.names_pl.append(polish.iloc[0] if len(polish) else self.names[-1])
+            geometries.append(shapely.line_merge(shapely.union_all(group.geometry.values)))
+            scaleranks.append(int(group['scalerank'].min()) if 'scalerank' in group.columns else 0)
+            row_river.update(dict.fromkeys(group.index, river_id))
+
+        # Aliasy zbierane kolumnami (jedno przejście po każdym polu name_*), w kolejności rzek
+        found = {}
+        for field in name_fields:
+            for row, value in rivers[field].dropna().items():
+                for alias in _aliases(value):
+                    river_id = row_river[row]
+                    if found.get(alias, river_id + 1) > river_id:
+                        found[alias] = river_id
+        self.aliases = dict(sorted(found.items(), key=lambda item: item[1]))
+
+        self.geometries = np.asarray(geometries, dtype=object)
+        self.scaleranks = np.asarray(scaleranks, dtype='int16')
+        self.tree = shapely.STRtree(self.geometries)
+        self._country_pieces = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, river_name):
+        """🔑 Numer rzeki dla dowolnej nazwy lub aliasu (bez rozróżniania wielkości liter) albo None"""
+        if not river_name:
+            return None
+        return self.aliases.get(river_name.strip().lower())
+
+    def geometry(self, river_name):
+        river_id = self.lookup(river_name)
+        return None if river_id is None else self.geometries[river_id]
+
+    def rivers_crossing(self, geometry, max_scalerank=None):
+        """🗺️ Numery rzek przecinających geometrię (zapytanie do STRtree), opcjonalnie do danej rangi"""
+        river_ids = np.sort(self.tree.query(geometry, predicate='intersects'))
+        if max_scalerank is not None:
+            river_ids = river_ids[self.scaleranks[river_ids] <= max_scalerank]
+        return river_ids
+
+    def country_pieces(self, river_id, country_key, bounds):
+        """✂️ Rzeka przycięta do prostokąta kadru kraju - liczona raz na parę rzeka-kraj"""
+        key = (river_id, country_key)
+        if key not in self._country_pieces:
+            clipped = shapely.clip_by_rect(self.geometries[river_id], *bounds)
+            parts = shapely.get_parts(clipped)
+            self._country_pieces[key] = parts[~shapely.is_empty(parts)]
+        return self._country_pieces[key]
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+🔷 Indeks podobieństwa kształtów krajów (deskryptory Fouriera + KD-drzewo)
+Kontur głównego terytorium każdego kraju (w lokalnym odwzorowaniu równopolowym) jest
+próbkowany równomiernie po obwodzie, a moduły współczynników FFT znormalizowane przez
+pierwszą harmoniczną dają deskryptor niezależny od położenia, skali, obrotu i punktu startu
+(a przy stałej orientacji pierścienia także od odbicia lustrzanego - jak wariant 'mirror').
+Deskryptory liczone są raz, a KD-drzewa (scipy, jedno na kontynent) zwracają k najbardziej
+podobnych kształtów w mikrosekundach - trudne błędne odpowiedzi do pytań o kontury bez ręcznego
+wybierania. Drobne wyspy i archipelagi mają prawie taki sam deskryptor (kontur bliski kołu),
+więc nie trafiają do indeksu, a do deskryptora dochodzi logarytm powierzchni.
+"""
+
+import numpy as np
+import shapely
+from scipy.spatial import cKDTree
+
+from map_projection import EQUAL_AREA_CRS, crs_center, project
+
+# Punkty próbkowania konturu i liczba harmonicznych w deskryptorze
+SAMPLES = 256
+HARMONICS = 12
+
+# Kraje w indeksie: główne terytorium >= MIN_AREA_KM2 i >= MIN_MAIN_SHARE powierzchni kraju (bez archipelagów)
+MIN_AREA_KM2 = 5000
+MIN_MAIN_SHARE = 0.5
+# Waga log(powierzchni) względem harmonicznych - Czechy bliżej Węgier niż Rosji o podobnym obrysie
+AREA_WEIGHT = 0.3
+
+
+def main_territory(geometry):
+    """🌍 Największy wielokąt kraju (kształt rozpoznawalny na mapie)"""
+    parts = shapely.get_parts(geometry)
+    return parts[np.argmax(shapely.area(parts))]
+
+
+def laea_coords(lon, lat, lon_0, lat_0):
+    """Sferyczne LAEA (promień 1) ze środkiem per punkt - kształt jak w local_crs, bez Transformera na kraj"""
+    lon, lat, lon_0, lat_0 = (np.radians(value) for value in (lon, lat, lon_0, lat_0))
+    cos_delta = np.cos(lat) * np.cos(lon - lon_0)
+    k = np.sqrt(2 / np.maximum(1 + np.sin(lat_0) * np.sin(lat) + np.cos(lat_0) * cos_delta, 1e-12))
+    x = k * np.cos(lat) * np.sin(lon - lon_0)
+    y = k * (np.cos(lat_0) * np.sin(lat) - np.sin(lat_0) * cos_delta)
+    return np.stack([x, y], axis=-1)
+
+
+def fourier_descriptors(polygons, samples=SAMPLES, harmonics=HARMONICS):
+    """🔢 Deskryptory (N, 2K-1) dla tablicy wielokątów lon/lat - wszystkie kontury naraz
+    |F[2..K]| i |F[-1..-K]| podzielone przez |F[1]|; pierścienie zewnętrzne zorientowane CCW."""
+    rings = shapely.get_exterior_ring(shapely.orient_polygons(polygons))
+    coords, index = shapely.get_coordinates(rings, return_index=True)
+    centers = np.array([crs_center(bounds) for bounds in shapely.bounds(rings)])[index]
+    rings = shapely.set_coordinates(rings.copy(), laea_coords(coords[:, 0], coords[:, 1],
+                                                              centers[:, 0], centers[:, 1]))
+    fractions = np.linspace(0, 1, samples, endpoint=False)
+    points = shapely.line_interpolate_point(rings[:, None], fractions[None, :], normalized=True)
+    contour = shapely.get_coordinates(points.ravel()).reshape(len(rings), samples, 2)
+    spectrum = np.abs(np.fft.fft(contour[..., 0] + 1j * contour[..., 1], axis=1))
+    positive = spectrum[:, 2:harmonics + 1]
+    negative = spectrum[:, -1:-harmonics - 1:-1]
+    return np.concatenate([positive, negative], axis=1) / spectrum[:, 1:2]
+
+
+class ShapeIndex:
+    """🔷 Deskryptory kształtów wierszy countries_gdf i KD-drzewa kontynentów do wyszukiwania podobnych"""
+
+    def __init__(self, countries, samples=SAMPLES, harmonics=HARMONICS):
+        self.names = countries['NAME'].to_numpy()
+        self.rows = {}
+        for row, name in enumerate(self.names):
+            self.rows.setdefault(name, row)
+        self.continents = (countries['CONTINENT'].to_numpy(str) if 'CONTINENT' in countries.columns
+                           else np.full(len(countries), ''))
+        territories = np.array([main_territory(geometry) for geometry in countries.geometry.values])
+        main_area = shapely.area(project(territories, EQUAL_AREA_CRS)) / 1e6
+        total_area = shapely.area(project(countries.geometry.values, EQUAL_AREA_CRS)) / 1e6
+        self.indexed = (main_area >= MIN_AREA_KM2) & (main_area >= MIN_MAIN_SHARE * total_area)
+        self.descriptors = np.hstack([fourier_descriptors(territories, samples, harmonics),
+                                      AREA_WEIGHT * np.log(main_area)[:, None]])
+        self.trees = {}
+        for continent in np.unique(self.continents[self.indexed]):
+            members = np.flatnonzero(self.indexed & (self.continents == continent))
+            self.trees[continent] = (members, cKDTree(self.descriptors[members]))
+
+    def __len__(self):
+        return len(self.names)
+
+    def similar_rows(self, rows, k=3, candidates=None):
+        """🎯 (len(rows), k) wierszy z tego samego kontynentu o najbardziej podobnym kształcie, od najbliższego
+        candidates ogranicza wynik do podanych wierszy; brakujące miejsca mają wartość -1."""
+        rows = np.asarray(rows, dtype=np.intp)
+        allowed = np.ones(len(self), dtype=bool)
+        if candidates is not None:
+            allowed[:] = False
+            allowed[np.asarray(candidates, dtype=np.intp)] = True
+        result = np.full((len(rows), k), -1, dtype=np.intp)
+
+        # Pętla po kontynentach, nie po pytaniach: wszystkie kraje kontynentu jednym zapytaniem
+        for continent in np.unique(self.continents[rows]):
+            if continent not in self.trees:
+                continue
+            members, tree = self.trees[continent]
+            selected = np.flatnonzero(self.continents[rows] == continent)
+            # Zapas na siebie samego i wiersze spoza candidates
+            query_k = min(len(members), 4 * (k + 1))
+            _, found = tree.query(self.descriptors[rows[selected]], k=query_k)
+            found = members[np.asarray(found).reshape(len(selected), query_k)]
+            usable = (found != rows[selected, None]) & allowed[found]
+
+            # Pozycja każdego dozwolonego trafienia w wierszu wyniku - bez pętli po pytaniach
+            position = np.cumsum(usable, axis=1) - 1
+            keep = usable & (position < k)
+            result[selected[np.nonzero(keep)[0]], position[keep]] = found[keep]
+        return result
+
+    def similar(self, name, k=3):
+        """🔷 Nazwy k krajów o najbardziej podobnym kształcie"""
+        row = self.rows.get(name)
+        if row is None:
+            return []
+        return [self.names[i] for i in self.similar_rows([row], k)[0] if i >= 0]
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+📝 Wspólne kodowanie obrazów SVG do pytań (data URL base64)
+Jedna implementacja dla wszystkich generatorów map.
+
+Ścieżka strumieniowa: SVG to sekwencja fragmentów bajtowych (podkładka z cache + nakładki
+pytania), a data URL jest kodowany do base64 dopiero przy zapisie - kawałkami, prosto do pliku.
+Pytanie nie trzyma więc w pamięci ani sklejonego SVG, ani jego kopii base64.
+"""
+
+import base64
+import json
+import re
+import secrets
+
+SVG_DATA_URL_PREFIX = "data:image/svg+xml;base64,"
+
+# Wielokrotność 3 bajtów - kawałki base64 sklejają się bez dopełnienia '='
+BASE64_CHUNK = 3 * 4 * 1024
+
+# Znacznik obrazu w szkielecie JSON (znak NUL ma tę samą ucieczkę \u0000 przy każdym ensure_ascii);
+# losowy nonce na wywołanie - zwykły napis wyglądający jak znacznik nie zostanie podmieniony
+_IMAGE_TOKEN = '\x00image:{}:{}\x00'
+_IMAGE_PLACEHOLDER = r'"\\u0000image:{}:(\d+)\\u0000"'
+
+
+def svg_bytes(svg_content):
+    """SVG (str, bytes lub SvgDocument) jako bytes UTF-8"""
+    if isinstance(svg_content, str):
+        return svg_content.encode('utf-8')
+    return bytes(svg_content)
+
+
+def svg_to_base64(svg_content):
+    """Konwertuje SVG (str, bytes lub SvgDocument) do data URL base64"""
+    base64_string = base64.b64encode(svg_bytes(svg_content)).decode('ascii')
+    return f"{SVG_DATA_URL_PREFIX}{base64_string}"
+
+
+class SvgDocument:
+    """🧩 Dokument SVG jako fragmenty bajtowe (widoki memoryview) - składany bez kopiowania podkładki"""
+
+    __slots__ = ('parts',)
+
+    def __init__(self, *parts):
+        self.parts = tuple(memoryview(part) for part in parts)
+
+    def __len__(self):
+        return sum(part.nbytes for part in self.parts)
+
+    def __bytes__(self):
+        return b''.join(self.parts)
+
+    def __str__(self):
+        return bytes(self).decode('utf-8')
+
+    def __eq__(self, other):
+        if isinstance(other, (SvgDocument, bytes, str)):
+            return bytes(self) == svg_bytes(other)
+        return NotImplemented
+
+    __hash__ = None
+
+
+def iter_base64(parts, chunk_size=BASE64_CHUNK):
+    """🔁 Base64 ciągu fragmentów bajtowych kawałkami - prosto z widoków memoryview, bez bufora pośredniego
+    (reszta fragmentu niepodzielna przez 3 dokleja się do początku następnego)"""
+    carry = b''
+    for part in parts:
+        view = memoryview(part)
+        if carry:
+            head = carry + bytes(view[:3 - len(carry)])
+            view = view[3 - len(carry):]
+            if len(head) < 3:
+                carry = head
+                continue
+            yield base64.b64encode(head).decode('ascii')
+        usable = view.nbytes - view.nbytes % 3
+        for start in range(0, usable, chunk_size):
+            yield base64.b64encode(view[start:min(start + chunk_size, usable)]).decode('ascii')
+        carry = bytes(view[usable:])
+    if carry:
+        yield base64.b64encode(carry).decode('ascii')
+
+
+class Base64DataUrl:
+    """📨 Leniwy data URL: base64 powstaje kawałkami dopiero przy zapisie (dump_json/iter_json)"""
+
+    __slots__ = ('content', 'prefix')
+
+    def __init__(self, content, prefix=SVG_DATA_URL_PREFIX):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        self.content = content if isinstance(content, SvgDocument) else SvgDocument(content)
+        self.prefix = prefix
+
+    def chunks(self, chunk_size=BASE64_CHUNK):
+        yield self.prefix
+        yield from iter_base64(self.content.parts, chunk_size)
+
+    def __len__(self):
+        return len(self.prefix) + -(-len(self.content) // 3) * 4
+
+    def __str__(self):
+        return ''.join(self.chunks())
+
+    def __eq__(self, other):
+        if isinstance(other, (Base64DataUrl, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    __hash__ = None
+
+
+def _with_placeholders(value, images, nonce):
+    """Kopia struktury z obrazami Base64DataUrl zastąpionymi krótkimi znacznikami"""
+    if isinstance(value, Base64DataUrl):
+        images.append(value)
+        return _IMAGE_TOKEN.format(nonce, len(images) - 1)
+    if isinstance(value, dict):
+        return {key: _with_placeholders(item, images, nonce) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_with_placeholders(item, images, nonce) for item in value]
+    return value
+
+
+def iter_json(value, **dumps_kwargs):
+    """🧵 Tekst json.dumps(value, **dumps_kwargs) kawałkami - obrazy Base64DataUrl kodowane strumieniowo
+    (base64 nie wymaga ucieczek, więc wynik jest identyczny jak dla data URL w postaci str)"""
+    images = []
+    nonce = secrets.token_hex(8)
+    skeleton = json.dumps(_with_placeholders(value, images, nonce), **dumps_kwargs)
+    position = 0
+    for match in re.finditer(_IMAGE_PLACEHOLDER.format(nonce), skeleton):
+        # Cudzysłowy znacznika zostają w szkielecie, w środek trafia data URL
+        yield skeleton[position:match.start() + 1]
+        yield from images[int(match.group(1))].chunks()
+        position = match.end() - 1
+    yield skeleton[position:]
+
+
+def dump_json(value, f, **dumps_kwargs):
+    """💾 json.dump ze strumieniowym zapisem obrazów - szczyt pamięci to kawałek obrazu, nie jego kopie"""
+    for chunk in iter_json(value, **dumps_kwargs):
+        f.write(chunk)
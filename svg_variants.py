@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+🔄 Tanie warianty map przez transformacje SVG (bez ponownego renderowania)
+Kontur mapy siedzi w zagnieżdżonym <svg id="map-viewport"> z grupą <g id="map-view">.
+Obrót i odbicie to atrybut transform grupy, a przybliżenie to zmiana viewBox okna mapy.
+Pytanie przechowuje tylko krótkie opisy wariantów; backend wybiera jeden na sesję gry.
+"""
+
+import random
+import re
+
+MAP_VIEWPORT_ID = 'map-viewport'
+MAP_VIEW_ID = 'map-view'
+
+# Warianty i ich etykiety (poziomy trudności)
+VARIANT_LABELS = {
+    'rotate90': 'obrócona o 90°',
+    'rotate180': 'obrócona o 180°',
+    'rotate270': 'obrócona o 270°',
+    'mirror': 'lustrzane odbicie',
+    'zoom': 'przybliżony fragment',
+}
+
+_GROUP_TAG = re.compile(r'<g\b|</g>')
+_GROUP_TAG_BYTES = re.compile(rb'<g\b|</g>')
+
+
+def _fmt(value):
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+def wrap_map_viewport(svg, frame):
+    """🪟 Zamyka grupę map-view w zagnieżdżonym <svg> o obszarze mapy (przycina przybliżenia); str lub bytes"""
+    binary = isinstance(svg, bytes)
+    text = (lambda value: value.encode('utf-8')) if binary else str
+    start = svg.index(text(f'<g id="{MAP_VIEW_ID}">'))
+    depth = 0
+    for match in (_GROUP_TAG_BYTES if binary else _GROUP_TAG).finditer(svg, start):
+        depth += 1 if match.group() == text('<g') else -1
+        if depth == 0:
+            end = match.end()
+            break
+    else:
+        raise ValueError(f'Niedomknięta grupa {MAP_VIEW_ID}')
+
+    box = ' '.join(_fmt(v) for v in (frame.left, frame.top, frame.map_width, frame.map_height))
+    viewport = (f'<svg id="{MAP_VIEWPORT_ID}" x="{_fmt(frame.left)}" y="{_fmt(frame.top)}" '
+                f'width="{_fmt(frame.map_width)}" height="{_fmt(frame.map_height)}" viewBox="{box}" '
+                f'overflow="hidden">')
+    return svg[:start] + text(viewport) + svg[start:end] + text('</svg>') + svg[end:]
+
+
+def variant_specs(frame, seed, zoom=1.8):
+    """🎲 Opisy wariantów dla mapy w kadrze frame; punkt przybliżenia zależy deterministycznie od seed"""
+    cx = frame.left + frame.map_width / 2
+    cy = frame.top + frame.map_height / 2
+    width, height = frame.map_width, frame.map_height
+    around = f'translate({_fmt(cx)} {_fmt(cy)})'
+    back = f'translate({_fmt(-cx)} {_fmt(-cy)})'
+
+    # Obrót o 90° zamienia szerokość z wysokością - skala dopasowuje mapę do okna
+    fit = min(width / height, height / width)
+    variants = [
+        {'id': 'rotate90', 'transform': f'{around} rotate(90) scale({_fmt(fit)}) {back}'},
+        {'id': 'rotate180', 'transform': f'{around} rotate(180) {back}'},
+        {'id': 'rotate270', 'transform': f'{around} rotate(270) scale({_fmt(fit)}) {back}'},
+        {'id': 'mirror', 'transform': f'{around} scale(-1 1) {back}'},
+    ]
+
+    # Przybliżenie: okno 1/zoom wokół losowego (ale stałego dla seed) punktu środkowej części mapy
+    rng = random.Random(seed)
+    view_width, view_height = width / zoom, height / zoom
+    focus_x = cx + rng.uniform(-0.25, 0.25) * width
+    focus_y = cy + rng.uniform(-0.25, 0.25) * height
+    left = min(max(focus_x - view_width / 2, frame.left), frame.left + width - view_width)
+    top = min(max(focus_y - view_height / 2, frame.top), frame.top + height - view_height)
+    variants.append({'id': 'zoom', 'viewBox': ' '.join(_fmt(v) for v in (left, top, view_width, view_height))})
+
+    for variant in variants:
+        variant['label'] = VARIANT_LABELS[variant['id']]
+    return variants
+
+
+def apply_variant(svg, variant):
+    """🔄 Nakłada opis wariantu na warstwowe SVG (ta sama operacja co w backendzie)"""
+    if variant.get('transform'):
+        svg = svg.replace(f'<g id="{MAP_VIEW_ID}">',
+                          f'<g id="{MAP_VIEW_ID}" transform="{variant["transform"]}">', 1)
+    if variant.get('viewBox'):
+        svg = re.sub(rf'(<svg id="{MAP_VIEWPORT_ID}"[^>]*? viewBox=")[^"]*(")',
+                     lambda match: match.group(1) + variant['viewBox'] + match.group(2), svg, count=1)
+    return svg
@@ -0,0 +1,100 @@
+"""Testy stanu budowania: manifest (build_manifest.py) i punkty kontrolne (generation_checkpoints.py)"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from build_manifest import BuildManifest, manifest_path_for, stable_hash
+from generation_checkpoints import CheckpointStore
+from svg_encoding import Base64DataUrl, svg_to_base64
+
+SVG = '<svg>Polska</svg>'
+
+
+def question(image=None):
+    return {'id': 'capital_pl', 'question': 'Stolica Polski?', 'image': image or svg_to_base64(SVG)}
+
+
+def test_stable_hash_streams_images_like_strings():
+    assert stable_hash(question(Base64DataUrl(SVG))) == stable_hash(question())
+    assert stable_hash({'b': 1, 'a': 2}) == stable_hash({'a': 2, 'b': 1})
+
+
+def test_manifest_is_fresh_after_save_and_reload(tmp_path):
+    path = manifest_path_for(tmp_path / 'questions.json')
+    manifest = BuildManifest(path)
+    fingerprint = manifest.fingerprint('capital', {'country': 'Poland'}, {'color': 'red'}, 'ne-5.1')
+    manifest.record('capital_pl', fingerprint, question(Base64DataUrl(SVG)))
+    manifest.save()
+
+    reloaded = BuildManifest(path)
+    assert path.name == 'questions.json.manifest'
+    assert reloaded.is_fresh('capital_pl', fingerprint, question())
+    assert not reloaded.is_fresh('capital_pl', fingerprint, None)
+    assert not reloaded.is_fresh('capital_de', fingerprint, question())
+    # Zmiana stylu, ręczna edycja pytania albo inna wersja danych wymuszają ponowny render
+    assert not reloaded.is_fresh('capital_pl', dict(fingerprint, style=stable_hash({'color': 'blue'})), question())
+    assert not reloaded.is_fresh('capital_pl', fingerprint, dict(question(), question='Stolica?'))
+    assert not reloaded.is_fresh('capital_pl', dict(fingerprint, geodata='ne-5.2'), question())
+
+
+def test_manifest_ignores_other_versions(tmp_path):
+    path = tmp_path / 'questions.json.manifest'
+    path.write_text(json.dumps({'version': 0, 'entries': {'capital_pl': {}}}), encoding='utf-8')
+
+    assert BuildManifest(path).entries == {}
+
+
+def test_rewrite_output_follows_stripped_question(tmp_path):
+    manifest = BuildManifest(tmp_path / 'questions.json.manifest')
+    fingerprint = manifest.fingerprint('capital', {}, {}, None)
+    manifest.record('capital_pl', fingerprint, question())
+    stripped = dict(question(), image=None, imageRef='images/abc.svg')
+
+    assert manifest.rewrite_output('capital_pl', question(), stripped)
+    assert manifest.is_fresh('capital_pl', fingerprint, stripped)
+    assert not manifest.is_fresh('capital_pl', fingerprint, question())
+    # Wpis niepasujący do poprzedniej wersji (ręczna edycja) zostaje nieświeży
+    assert not manifest.rewrite_output('capital_pl', question(), stripped)
+    assert not manifest.rewrite_output('capital_de', question(), stripped)
+
+
+def test_manifest_prune_only_touches_own_plugin(tmp_path):
+    manifest = BuildManifest(tmp_path / 'questions.json.manifest')
+    manifest.record('capital_pl', manifest.fingerprint('capital', {}, {}, None), question())
+    manifest.record('capital_de', manifest.fingerprint('capital', {}, {}, None), question())
+    manifest.record('river_pl', manifest.fingerprint('river', {}, {}, None), question())
+
+    assert manifest.prune('capital', {'capital_pl'}) == ['capital_de']
+    assert sorted(manifest.entries) == ['capital_pl', 'river_pl']
+
+
+def test_checkpoint_resume_returns_saved_questions(tmp_path):
+    directory = tmp_path / '.checkpoints' / 'questions'
+    store = CheckpointStore(directory)
+    store.record_failure('capital_pl', 'timeout')
+    store.record_failure('capital_de', 'timeout')
+    store.save(question(Base64DataUrl(SVG)), fingerprint={'spec': 'abc'})
+
+    # Wznowienie = nowy obiekt na tym samym katalogu
+    resumed = CheckpointStore(directory)
+    assert resumed.load('capital_pl', {'spec': 'abc'}) == question()
+    assert resumed.load('capital_pl') == question()
+    assert resumed.load('capital_pl', {'spec': 'changed'}) is None
+    assert resumed.load('capital_de') is None
+    assert resumed.failures() == {'capital_de': 'timeout'}
+
+
+def test_checkpoint_ignores_damaged_files_and_clears(tmp_path):
+    directory = tmp_path / '.checkpoints' / 'questions'
+    store = CheckpointStore(directory)
+    store.save(question())
+    store._path('capital_pl').write_text('{"question": ', encoding='utf-8')
+
+    assert store.load('capital_pl') is None
+
+    store.clear()
+    assert not directory.exists()
+    assert not directory.parent.exists()
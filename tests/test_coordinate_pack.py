@@ -0,0 +1,67 @@
+"""Testy coordinate_pack.py - paczka .npz zbudowana z małych shapefile'i i odczytana przez mmap"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import LineString, Polygon
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from coordinate_pack import CoordinatePack, build_coordinate_pack, load_npz_mmap
+
+# Zewnętrzny pierścień CCW, otwór CW - tak jak zapisuje je _polygon_rings
+OUTER = [(0.0, 0.0), (8.0, 0.0), (8.0, 8.0), (0.0, 8.0), (0.0, 0.0)]
+HOLE = [(2.0, 2.0), (2.0, 6.0), (6.0, 6.0), (6.0, 2.0), (2.0, 2.0)]
+
+
+def write_geodata(data_dir):
+    (data_dir / 'countries').mkdir(parents=True)
+    (data_dir / 'rivers').mkdir(parents=True)
+    gpd.GeoDataFrame(
+        {'NAME': ['Ringland', 'Squareland'], 'ADM0_A3': ['RNG', 'SQR'], 'NAME_PL': ['Pierścieniowo', 'Kwadratowo']},
+        geometry=[Polygon(OUTER, [HOLE]), Polygon([(20, 20), (21, 20), (21, 21), (20, 21)])], crs='EPSG:4326',
+    ).to_file(data_dir / 'countries' / 'ne_50m_admin_0_countries.shp')
+    gpd.GeoDataFrame(
+        {'name': ['Donau', 'Danube', 'Lonely'], 'name_pl': [None, 'Dunaj', None],
+         'wikidataid': ['Q1653', 'Q1653', None], 'scalerank': [3, 1, 5]},
+        geometry=[LineString([(0, 0), (1, 1)]), LineString([(1, 1), (2, 3)]), LineString([(5, 5), (6, 5)])],
+        crs='EPSG:4326',
+    ).to_file(data_dir / 'rivers' / 'ne_50m_rivers_lake_centerlines.shp')
+
+
+def test_round_trip_keeps_rings_holes_and_river_groups(tmp_path):
+    write_geodata(tmp_path)
+    pack = CoordinatePack(build_coordinate_pack(tmp_path, tmp_path / 'pack.npz'))
+
+    outer, hole = pack.country_rings('Ringland')
+    assert np.array_equal(outer, np.asarray(OUTER, dtype='float32'))
+    assert np.array_equal(hole, np.asarray(HOLE, dtype='float32'))
+    assert shapely.Polygon(outer).exterior.is_ccw
+    assert not shapely.LinearRing(hole).is_ccw
+    assert pack.country_rings('sqr') is not None
+    assert pack.country_rings('Kwadratowo') is not None
+    assert pack.country_names() == ['Ringland', 'Squareland']
+
+    # Dwa odcinki z jednym wikidataid to jedna rzeka pod nazwą najważniejszego odcinka
+    assert sorted(pack.river_names()) == ['Danube', 'Lonely']
+    danube = sorted(line.tolist() for line in pack.river_lines('Dunaj'))
+    assert danube == [[[0, 0], [1, 1]], [[1, 1], [2, 3]]]
+    assert sorted(line.tolist() for line in pack.river_lines('Donau')) == danube
+    assert pack.river_lines('Wisła') is None
+
+
+def test_load_npz_mmap_matches_np_load(tmp_path):
+    path = tmp_path / 'arrays.npz'
+    arrays = {'coords': np.arange(12, dtype='float32').reshape(6, 2), 'empty': np.zeros((0, 2)),
+              'names': np.asarray(['a', 'bb'], dtype='U')}
+    np.savez(path, **arrays)
+
+    mapped = load_npz_mmap(path)
+
+    assert isinstance(mapped['coords'], np.memmap)
+    for name, array in arrays.items():
+        assert mapped[name].dtype == array.dtype
+        assert np.array_equal(mapped[name], array)
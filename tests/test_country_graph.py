@@ -0,0 +1,69 @@
+"""Testy country_graph.py - sąsiedztwo i błędne odpowiedzi na danych Natural Earth z geodata/"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from country_graph import TIER_NEIGHBOUR, TIER_SECOND_NEIGHBOUR, CountryGraph
+
+COUNTRIES = ROOT / 'geodata' / 'countries' / 'ne_50m_admin_0_countries.shp'
+
+
+@pytest.fixture(scope='module')
+def graph():
+    return CountryGraph(gpd.read_file(COUNTRIES))
+
+
+def test_neighbours_of_poland(graph):
+    neighbours = set(graph.neighbours('Poland'))
+
+    assert {'Germany', 'Czechia', 'Slovakia', 'Ukraine', 'Belarus', 'Lithuania', 'Russia'} <= neighbours
+    assert 'France' not in neighbours
+    assert 'Poland' in graph.neighbours('Germany')
+
+
+def test_islands_and_unknown_names_have_no_neighbours(graph):
+    assert graph.neighbours('Iceland') == []
+    assert graph.neighbours('Atlantyda') == []
+
+
+def test_adjacency_is_symmetric_without_self_loops(graph):
+    adjacency = graph.adjacency()
+
+    assert np.array_equal(adjacency, adjacency.T)
+    assert not adjacency.diagonal().any()
+
+
+def test_tiers(graph):
+    tiers = graph.tiers()
+    poland, germany, france = (graph.rows[name] for name in ('Poland', 'Germany', 'France'))
+
+    assert tiers[poland, germany] == TIER_NEIGHBOUR
+    assert tiers[poland, france] == TIER_SECOND_NEIGHBOUR
+
+
+def test_distractors_prefer_neighbours_and_are_repeatable(graph):
+    rows = [graph.rows['Poland'], graph.rows['Chile']]
+
+    picked = graph.distractors(rows, count=3, seed=7)
+
+    assert picked.shape == (2, 3)
+    assert set(graph.names[picked[0]]) <= set(graph.neighbours('Poland'))
+    assert set(graph.names[picked[1]]) <= set(graph.neighbours('Chile'))
+    assert rows[0] not in picked[0]
+    assert np.array_equal(graph.distractors(rows, count=3, seed=7), picked)
+
+
+def test_distractors_respect_candidates(graph):
+    candidates = [graph.rows[name] for name in ('Germany', 'Japan', 'Brazil', 'Chile')]
+
+    picked = graph.distractors([graph.rows['Poland']], count=2, candidates=candidates)
+
+    assert graph.names[picked[0][0]] == 'Germany'
+    assert set(picked[0]) <= set(candidates)
@@ -0,0 +1,67 @@
+"""Testy geometry_store.py - zapis i odczyt magazynu bez utraty geometrii"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import LineString, MultiLineString, MultiPolygon, Polygon
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from geometry_store import GeometryStore, build_geometry_store
+
+SQUARE_WITH_HOLE = Polygon([(0, 0), (4, 0), (4, 4), (0, 4)], [[(1, 1), (1, 2), (2, 2), (2, 1)]])
+TWO_ISLANDS = MultiPolygon([Polygon([(10, 10), (11, 10), (11, 11)]), Polygon([(12, 12), (13, 12), (13, 13)])])
+
+
+def build(tmp_path, dtype='float64'):
+    countries = gpd.GeoDataFrame(
+        {'ADM0_A3': ['AAA', 'NUL', 'BBB']},
+        geometry=[SQUARE_WITH_HOLE, None, TWO_ISLANDS], crs='EPSG:4326')
+    rivers = gpd.GeoDataFrame(
+        geometry=[LineString([(0, 0), (1, 1), (2, 0)]), MultiLineString([[(5, 5), (6, 6)], [(7, 7), (8, 9)]])],
+        crs='EPSG:4326')
+    path = tmp_path / 'store.bin'
+    build_geometry_store(path, {'countries': (countries, 'ADM0_A3'), 'rivers': (rivers, None)}, dtype=dtype)
+    return GeometryStore(path)
+
+
+def test_round_trip_keeps_geometries_ids_and_rows(tmp_path):
+    store = build(tmp_path)
+    countries = store['countries']
+
+    assert countries.ids == ['AAA', 'BBB']
+    assert countries.rows == [0, 2]
+    assert countries.crs == 'EPSG:4326'
+    assert shapely.equals_exact(countries.geometry('AAA'), MultiPolygon([SQUARE_WITH_HOLE]), 0)
+    assert shapely.equals_exact(countries.geometry('BBB'), TWO_ISLANDS, 0)
+    assert len(countries.rings('AAA')) == 2
+
+    rivers = store['rivers']
+    assert rivers.ids == ['0', '1']
+    assert shapely.equals_exact(rivers.geometry('1'), MultiLineString([[(5, 5), (6, 6)], [(7, 7), (8, 9)]]), 0)
+
+
+def test_whole_layer_matches_single_rows(tmp_path):
+    layer = build(tmp_path)['countries']
+    single = [layer.geometry(geom_id) for geom_id in layer.ids]
+
+    fresh = build(tmp_path)['countries']
+    assert all(shapely.equals_exact(a, b, 0) for a, b in zip(fresh.geometries(), single))
+
+
+def test_bounds_and_bbox_query(tmp_path):
+    layer = build(tmp_path)['countries']
+
+    assert layer.bounds('BBB') == (10.0, 10.0, 13.0, 13.0)
+    assert layer.query_bbox(3, 3, 5, 5) == ['AAA']
+    assert layer.query_bbox(-5, -5, 20, 20) == ['AAA', 'BBB']
+
+
+def test_float32_store_stays_within_precision(tmp_path):
+    layer = build(tmp_path, dtype='float32')['rivers']
+
+    assert layer.coords_array.dtype == np.float32
+    assert shapely.equals_exact(layer.geometry('0'), MultiLineString([[(0, 0), (1, 1), (2, 0)]]), 1e-6)
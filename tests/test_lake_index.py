@@ -0,0 +1,93 @@
+"""Testy lake_index.py - aliasy jezior i tabela kraj -> jeziora na danych Natural Earth"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from country_graph import CountryGraph
+from lake_index import LakeIndex, lake_keys
+from question_specs import id_slug, lake_specs
+
+LAKES = ROOT / 'geodata' / 'lakes' / 'ne_50m_lakes.shp'
+COUNTRIES = ROOT / 'geodata' / 'countries' / 'ne_50m_admin_0_countries.shp'
+
+
+@pytest.fixture(scope='module')
+def countries():
+    return gpd.read_file(COUNTRIES)
+
+
+@pytest.fixture(scope='module')
+def lakes(countries):
+    return LakeIndex(gpd.read_file(LAKES), countries)
+
+
+def row_of(countries, name):
+    return countries.index[countries['NAME'] == name][0]
+
+
+@pytest.mark.parametrize('english, aliases, polish, key', [
+    ('Ladoga', ['Lake Ladoga', 'Ładoga', 'ŁADOGA'], 'Ładoga', 'Q15288'),
+    ('Geneva', ['Lake Geneva', 'Jezioro Genewskie'], 'Jezioro Genewskie', 'Q6403'),
+    ('Constance', ['Bodensee', 'Jezioro Bodeńskie', ' bodensee '], 'Jezioro Bodeńskie', 'Q4127'),
+])
+def test_aliases_point_to_one_lake(lakes, english, aliases, polish, key):
+    lake_id = lakes.lookup(english)
+
+    assert lake_id is not None
+    assert lakes.names_pl[lake_id] == polish
+    assert lakes.ids[lake_id] == key
+    assert [lakes.lookup(alias) for alias in aliases] == [lake_id] * len(aliases)
+
+
+def test_unknown_names(lakes):
+    assert lakes.lookup('Atlantyda') is None
+    assert lakes.lookup('') is None
+
+
+def test_lakes_by_country_from_largest(lakes, countries):
+    finland = lakes.lakes_in(row_of(countries, 'Finland'))
+    switzerland = lakes.lakes_in(row_of(countries, 'Switzerland'))
+
+    assert lakes.names[finland[0]] == 'Saimaa'
+    assert list(lakes.areas[finland]) == sorted(lakes.areas[finland], reverse=True)
+    assert {'Geneva', 'Constance'} <= {lakes.names[lake] for lake in switzerland}
+    assert lakes.lakes_in(row_of(countries, 'Russia'), limit=2) == [lakes.lookup('Baikal'), lakes.lookup('Ladoga')]
+    assert lakes.lakes_in(row_of(countries, 'Malta')) == []
+
+
+def test_shared_lake_belongs_to_each_shore(lakes, countries):
+    geneva = lakes.lookup('Geneva')
+
+    assert geneva in lakes.lakes_in(row_of(countries, 'Switzerland'))
+    assert geneva in lakes.lakes_in(row_of(countries, 'France'))
+
+
+def test_lake_keys_fall_back_to_name():
+    lakes = pd.DataFrame({'name': ['Lake A', 'Lake B'], 'wikidataid': ['Q1', None]})
+
+    assert lake_keys(lakes).tolist() == ['Q1', 'Lake B']
+    assert lake_keys(lakes[['name']]).tolist() == ['Lake A', 'Lake B']
+
+
+def test_lake_spec_ids_use_country_code_and_lake_key(lakes, countries):
+    selected = countries[countries['NAME'].isin(['United Kingdom', 'Finland'])]
+
+    specs = lake_specs(countries, selected, lakes, CountryGraph(countries), 'ne_lake_{code}_{lake}')
+
+    ids = {spec['country']: spec['id'] for spec in specs}
+    assert ids['United Kingdom'] == 'ne_lake_gbr_' + id_slug(lakes.ids[lakes.lookup('Neagh')])
+    assert ids['Finland'] == 'ne_lake_fin_' + id_slug(lakes.ids[lakes.lookup('Saimaa')])
+    assert all(' ' not in spec_id for spec_id in ids.values())
+
+
+def test_id_slug():
+    assert id_slug('United Kingdom') == 'united_kingdom'
+    assert id_slug("Lake of the Woods (Ontario)") == 'lake_of_the_woods_ontario'
+    assert id_slug('Q6403') == 'q6403'
@@ -0,0 +1,106 @@
+"""Testy CLI i wyboru wtyczek map_pipeline.py (bez renderowania)"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import map_pipeline
+from svg_encoding import Base64DataUrl, SvgDocument, svg_to_base64
+
+
+class FakePipeline:
+    created = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.failures = []
+        FakePipeline.created.append(self)
+
+    def run(self):
+        return 0
+
+
+def test_main_without_subcommand_runs_generate(monkeypatch):
+    FakePipeline.created = []
+    monkeypatch.setattr(map_pipeline, 'MapPipeline', FakePipeline)
+
+    assert map_pipeline.main([]) == 0
+
+    pipeline, = FakePipeline.created
+    assert pipeline.kwargs['incremental'] is True
+    assert pipeline.kwargs['resume'] is False
+    assert pipeline.kwargs['merge'] is False
+    assert pipeline.kwargs['types'] is None
+
+
+def test_main_generate_flags(monkeypatch):
+    FakePipeline.created = []
+    monkeypatch.setattr(map_pipeline, 'MapPipeline', FakePipeline)
+
+    assert map_pipeline.main(['generate', '--types', 'river', '--full', '--resume']) == 0
+
+    pipeline, = FakePipeline.created
+    assert pipeline.kwargs['incremental'] is False
+    assert pipeline.kwargs['resume'] is True
+    assert pipeline.kwargs['merge'] is True
+    assert pipeline.kwargs['types'] == ['river']
+
+
+def test_network_plugins_are_opt_in():
+    types = map_pipeline.MapPipeline().types
+
+    assert 'osm' not in types
+    assert 'rest_capital' not in types
+    assert 'capital' in types
+
+
+def test_countries_filter_skips_batch_plugins_by_default():
+    spec_filter = map_pipeline.SpecFilter(countries=['PL'])
+    types = map_pipeline.MapPipeline(spec_filter=spec_filter).types
+
+    assert 'capital' in types
+    assert not [name for name in types if isinstance(map_pipeline.PLUGINS[name](), map_pipeline.BatchPlugin)]
+
+
+def test_countries_filter_rejects_batch_plugins():
+    spec_filter = map_pipeline.SpecFilter(countries=['PL'])
+
+    with pytest.raises(ValueError, match='hq_capital'):
+        map_pipeline.MapPipeline(types=['hq_capital'], spec_filter=spec_filter)
+
+
+def test_merge_keeps_untouched_entries_byte_identical(tmp_path):
+    output_file = tmp_path / 'questions.json'
+    # Ręcznie sformatowany element i znaki spoza ASCII - merge nie może ich przepisać
+    untouched = '{"id": "keep",   "question": "Gdzie płynie Wisła?",\n    "answers": [1, 2]}'
+    output_file.write_text(
+        '[\n  ' + untouched + ',\n  {"id": "old", "image": "x"},\n  {"id": "gone"}\n]\n', encoding='utf-8')
+    image = Base64DataUrl(SvgDocument(b'<svg>', b'</svg>'))
+
+    counts = map_pipeline.merge_questions_into_file(
+        output_file, [{'id': 'old', 'image': image}, {'id': 'new', 'image': image}], remove_ids=['gone'])
+
+    assert counts == (1, 1, 1)
+    text = output_file.read_text(encoding='utf-8')
+    assert text.startswith('[\n  ' + untouched + ',\n')
+    assert text.endswith('\n]\n')
+    assert [question['id'] for question in json.loads(text)] == ['keep', 'old', 'new']
+    assert json.loads(text)[1]['image'] == svg_to_base64(b'<svg></svg>')
+
+
+def test_merge_of_unchanged_questions_rewrites_identical_bytes(tmp_path):
+    output_file = tmp_path / 'questions.json'
+    questions = [{'id': f'q{i}', 'question': 'Który to kraj?', 'image': svg_to_base64(f'<svg>{i}</svg>')}
+                 for i in range(3)]
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(questions, f, ensure_ascii=False, indent=2)
+    before = output_file.read_bytes()
+
+    streamed = [dict(question, image=Base64DataUrl(f'<svg>{i}</svg>')) for i, question in enumerate(questions)]
+    map_pipeline.merge_questions_into_file(output_file, streamed[1:2])
+
+    assert output_file.read_bytes() == before
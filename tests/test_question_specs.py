@@ -0,0 +1,72 @@
+"""Testy question_specs.py - pliki map_specs/ i wybór krajów trybu świata na danych Natural Earth"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from question_specs import SPECS_DIR, WRONG_ANSWERS, load_spec_file, polish_names, world_countries
+from topology_export import in_topology
+
+COUNTRIES = ROOT / 'geodata' / 'countries' / 'ne_50m_admin_0_countries.shp'
+
+
+@pytest.fixture(scope='module')
+def countries():
+    return gpd.read_file(COUNTRIES)
+
+
+@pytest.mark.parametrize('name, answer', [('capital', 'capital'), ('country', 'name_pl'),
+                                          ('river', 'river_pl'), ('combo', 'river_pl')])
+def test_spec_files_have_distinct_wrong_answers(name, answer):
+    specs = load_spec_file(name)
+
+    assert specs
+    for spec in specs:
+        assert len(spec['wrong_answers']) == WRONG_ANSWERS
+        assert len(set(spec['wrong_answers'])) == WRONG_ANSWERS
+        assert spec[answer] not in spec['wrong_answers']
+
+
+def test_load_spec_file_returns_fresh_copy():
+    first = load_spec_file('capital')
+    first[0]['capital'] = 'zmienione'
+
+    assert load_spec_file('capital')[0]['capital'] != 'zmienione'
+    assert (SPECS_DIR / 'capital.json').exists()
+
+
+def test_curated_capitals_have_coordinates():
+    coordinates = load_spec_file('capital_coordinates')
+
+    assert {spec['country'] for spec in load_spec_file('capital')} <= set(coordinates)
+
+
+def test_world_countries_skip_antarctica_and_duplicates(countries):
+    world = world_countries(countries)
+
+    assert 'Antarctica' not in set(world['NAME'])
+    assert world['NAME'].is_unique
+    assert {'Poland', 'Chile', 'Japan'} <= set(world['NAME'])
+
+
+def test_polish_names_fall_back_to_name(countries):
+    names = dict(zip(countries['NAME'], polish_names(countries)))
+
+    assert names['Poland'] == 'Polska'
+    assert names['Germany'] == 'Niemcy'
+    assert all(isinstance(name, str) and name for name in names.values())
+
+
+def test_in_topology_rejects_overseas_territories(countries):
+    geometry = dict(zip(countries['NAME'], countries.geometry))
+
+    assert in_topology(geometry['Poland'])
+    assert in_topology(geometry['Iceland'])
+    # Francja z Gujaną Francuską wychodzi poza kadr Europy
+    assert not in_topology(geometry['France'])
+    assert not in_topology(geometry['Brazil'])
@@ -0,0 +1,87 @@
+"""Testy river_index.py - aliasy nazw rzek i złączenie stolic z rzekami na danych Natural Earth"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Point, box
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from question_specs import capital_rivers
+from river_index import RiverIndex
+
+RIVERS = ROOT / 'geodata' / 'rivers' / 'ne_50m_rivers_lake_centerlines.shp'
+COUNTRIES = ROOT / 'geodata' / 'countries' / 'ne_50m_admin_0_countries.shp'
+
+
+@pytest.fixture(scope='module')
+def rivers():
+    return RiverIndex(gpd.read_file(RIVERS))
+
+
+@pytest.mark.parametrize('english, aliases, polish', [
+    ('Danube', ['Donau', 'Dunaj', 'DANUBE', ' danube '], 'Dunaj'),
+    ('Vistula', ['Wisła', 'Wisla'], 'Wisła'),
+    ('Oder', ['Odra'], 'Odra'),
+    ('Elbe', ['Łaba'], 'Łaba'),
+])
+def test_aliases_point_to_one_river(rivers, english, aliases, polish):
+    river_id = rivers.lookup(english)
+
+    assert river_id is not None
+    assert rivers.names[river_id] == english
+    assert rivers.names_pl[river_id] == polish
+    assert [rivers.lookup(alias) for alias in aliases] == [river_id] * len(aliases)
+
+
+def test_unknown_names(rivers):
+    assert rivers.lookup('Atlantyda') is None
+    assert rivers.lookup('') is None
+    assert rivers.lookup(None) is None
+    assert rivers.geometry('Atlantyda') is None
+
+
+def test_segments_with_one_wikidataid_are_merged(rivers):
+    # Danube i Donau to osobne odcinki w shapefile'u, ale jedna rzeka w indeksie
+    danube = rivers.geometry('Danube')
+
+    assert danube.intersects(box(16.0, 48.0, 16.6, 48.4))  # Wiedeń
+    assert danube.intersects(box(28.5, 44.5, 29.8, 45.5))  # delta
+
+
+def test_rivers_crossing_respects_scalerank(rivers):
+    poland = box(14.1, 49.0, 24.2, 54.9)
+    crossing = rivers.rivers_crossing(poland)
+    major = rivers.rivers_crossing(poland, max_scalerank=5)
+
+    assert rivers.lookup('Vistula') in major
+    assert set(major) <= set(crossing)
+    assert (rivers.scaleranks[major] <= 5).all()
+
+
+def test_capital_rivers_single_join(rivers):
+    places = gpd.GeoDataFrame({
+        'NAME': ['Warsaw', 'Budapest', 'Madrid', 'Kraków'],
+        'NAME_PL': ['Warszawa', 'Budapeszt', 'Madryt', 'Kraków'],
+        'ADM0_A3': ['POL', 'HUN', 'ESP', 'POL'],
+        'ADM0CAP': [1, 1, 1, 0],
+        'FEATURECLA': ['Admin-0 capital'] * 3 + ['Populated place'],
+        'POP_MAX': [1_800_000, 1_750_000, 3_300_000, 770_000],
+    }, geometry=[Point(21.0122, 52.2297), Point(19.0402, 47.4979), Point(-3.7038, 40.4168), Point(19.94, 50.06)],
+        crs='EPSG:4326')
+
+    pairs = capital_rivers(gpd.read_file(COUNTRIES, ignore_geometry=True), places, rivers)
+    first = pairs.drop_duplicates('ADM0_A3').set_index('ADM0_A3')
+
+    assert first.loc['POL', 'capital'] == 'Warszawa'
+    assert first.loc['POL', 'river_id'] == rivers.lookup('Vistula')
+    assert first.loc['HUN', 'river_id'] == rivers.lookup('Danube')
+    assert 'ESP' not in first.index
+
+
+def test_ids_are_wikidata_keys(rivers):
+    assert rivers.ids[rivers.lookup('Danube')] == 'Q1653'
+    assert len(set(rivers.ids)) == len(rivers)
@@ -0,0 +1,44 @@
+"""Testy shape_index.py na danych Natural Earth z geodata/ (podobne kontury krajów)"""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shape_index import ShapeIndex
+
+COUNTRIES = ROOT / 'geodata' / 'countries' / 'ne_50m_admin_0_countries.shp'
+
+
+@pytest.fixture(scope='module')
+def shapes():
+    return ShapeIndex(gpd.read_file(COUNTRIES))
+
+
+def test_central_european_lookalikes(shapes):
+    assert 'Czechia' in shapes.similar('Slovakia', 5)
+    assert 'Czechia' in shapes.similar('Austria', 5)
+    assert 'Hungary' in shapes.similar('Czechia', 5)
+
+
+def test_small_islands_are_not_lookalikes(shapes):
+    assert not shapes.indexed[shapes.rows['Maldives']]
+    for name in ('Slovakia', 'Italy', 'Chile', 'Poland'):
+        similar = shapes.similar(name, 10)
+        assert 'Maldives' not in similar
+        assert 'Marshall Is.' not in similar
+
+
+def test_similar_rows_respects_candidates(shapes):
+    rows = [shapes.rows['Slovakia'], shapes.rows['Chile']]
+    candidates = [shapes.rows[name] for name in ('Czechia', 'Argentina', 'Peru')]
+
+    similar = shapes.similar_rows(rows, k=2, candidates=candidates)
+
+    assert similar.shape == (2, 2)
+    assert set(similar[0]) <= set(candidates) | {-1}
+    assert shapes.names[similar[1][0]] in ('Argentina', 'Peru')
@@ -0,0 +1,70 @@
+"""Testy svg_encoding.py - strumieniowy base64 i JSON muszą dawać bajty jak base64/json z biblioteki"""
+
+import base64
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from svg_encoding import Base64DataUrl, SvgDocument, dump_json, iter_base64, iter_json, svg_to_base64
+
+PAYLOAD = bytes(range(256)) * 7 + '<svg>żółw</svg>'.encode('utf-8')
+
+
+@pytest.mark.parametrize('cuts', [
+    [],
+    [1],
+    [2],
+    [1, 2],
+    [1, 2, 3, 5],
+    [4, 5, 6, 10, 11, 1000],
+    [0, 0, 7, 7],
+])
+@pytest.mark.parametrize('chunk_size', [3, 6, 12, 3 * 4 * 1024])
+def test_iter_base64_matches_b64encode_across_part_boundaries(cuts, chunk_size):
+    bounds = [0, *cuts, len(PAYLOAD)]
+    parts = [PAYLOAD[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+    encoded = ''.join(iter_base64(parts, chunk_size))
+
+    assert encoded == base64.b64encode(PAYLOAD).decode('ascii')
+
+
+@pytest.mark.parametrize('size', [0, 1, 2, 3, 4, 5])
+def test_iter_base64_short_inputs(size):
+    parts = [PAYLOAD[:1]] * size
+
+    assert ''.join(iter_base64(parts)) == base64.b64encode(PAYLOAD[:1] * size).decode('ascii')
+
+
+def test_data_url_matches_eager_encoding():
+    document = SvgDocument(PAYLOAD[:100], PAYLOAD[100:101], PAYLOAD[101:])
+    url = Base64DataUrl(document)
+
+    assert str(url) == svg_to_base64(PAYLOAD)
+    assert len(url) == len(svg_to_base64(PAYLOAD))
+
+
+@pytest.mark.parametrize('dumps_kwargs', [{}, {'indent': 2}, {'ensure_ascii': False, 'indent': 2}])
+def test_iter_json_matches_json_dumps(dumps_kwargs):
+    images = [PAYLOAD[:10], PAYLOAD, b'']
+    value = [
+        {'id': 'q1', 'question': 'Jaki to kraj? "Ż"', 'image': Base64DataUrl(SvgDocument(images[0], images[1])),
+         'answers': ['Polska', 'Czechy'], 'meta': {'nested': Base64DataUrl(images[2])}},
+        {'id': 'q2', 'image': None, 'note': '\x00image:0\x00'},
+    ]
+    expected = [
+        {'id': 'q1', 'question': 'Jaki to kraj? "Ż"', 'image': svg_to_base64(images[0] + images[1]),
+         'answers': ['Polska', 'Czechy'], 'meta': {'nested': svg_to_base64(images[2])}},
+        {'id': 'q2', 'image': None, 'note': '\x00image:0\x00'},
+    ]
+
+    assert ''.join(iter_json(value, **dumps_kwargs)) == json.dumps(expected, **dumps_kwargs)
+
+    buffer = io.StringIO()
+    dump_json(value, buffer, **dumps_kwargs)
+    assert buffer.getvalue() == json.dumps(expected, **dumps_kwargs)
@@ -0,0 +1,124 @@
+"""Testy topology_export.py - łuki topologii dekodowane z powrotem do pierścieni wejściowych"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from shapely.geometry import LineString, MultiPolygon, Polygon
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from build_manifest import BuildManifest, manifest_path_for
+from topology_export import TopologyBuilder, strip_images
+
+# Siatka 11 x 11 na kadrze 0..10 - jednostka kwantyzacji to 1°, współrzędne przechodzą bez zaokrągleń
+BOUNDS = (0, 0, 10, 10)
+WEST = Polygon([(0, 0), (2, 0), (2, 2), (0, 2)])
+EAST = Polygon([(2, 0), (4, 0), (4, 2), (2, 2)])
+ISLANDS = MultiPolygon([Polygon([(6, 6), (7, 6), (7, 7)]), Polygon([(8, 8), (9, 8), (9, 9), (8, 9)],
+                                                                    [[(8.0, 8.0), (8.0, 8.0), (8.0, 8.0)]])])
+
+
+def decode_arcs(topology):
+    """Łuki w bezwzględnych współrzędnych siatki (odwrócenie kodowania różnicowego)"""
+    return [np.cumsum(np.asarray(arc), axis=0).tolist() for arc in topology['arcs']]
+
+
+def stitch(arcs, refs):
+    """Sklejenie łuków linii; ~indeks to łuk w odwrotnym kierunku"""
+    points = []
+    for ref in refs:
+        arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+        points.extend(arc if not points else arc[1:])
+    return points
+
+
+def same_ring(decoded, coords):
+    """Pierścienie równe z dokładnością do punktu startowego i kierunku (clip_by_rect zmienia orientację)"""
+    ring = [list(map(int, point)) for point in coords][:-1]
+    decoded = decoded[:-1]
+    if len(decoded) != len(ring) or ring[0] not in decoded:
+        return False
+    for candidate in (decoded, decoded[::-1]):
+        start = candidate.index(ring[0])
+        if candidate[start:] + candidate[:start] == ring:
+            return True
+    return False
+
+
+def build():
+    builder = TopologyBuilder(BOUNDS, quantization=11)
+    builder.add('countries', WEST, feature_id='WST', properties={'name': 'West'})
+    builder.add('countries', EAST, feature_id='EST')
+    builder.add('countries', ISLANDS, feature_id='ISL')
+    builder.add('rivers', LineString([(1, 5), (3, 5), (5, 5), (5, 8)]), feature_id='Q1')
+    return builder, builder.build()
+
+
+def test_arcs_decode_back_to_input_rings():
+    _, topology = build()
+    arcs = decode_arcs(topology)
+    countries = {geometry['id']: geometry for geometry in topology['objects']['countries']['geometries']}
+
+    (west,), = countries['WST']['arcs']
+    (east,), = countries['EST']['arcs']
+    assert same_ring(stitch(arcs, west), WEST.exterior.coords)
+    assert same_ring(stitch(arcs, east), EAST.exterior.coords)
+    assert countries['WST']['properties'] == {'name': 'West'}
+    assert 'properties' not in countries['EST']
+
+    # Zdegenerowany otwór wyspy znika, wyspy zostają osobnymi wielokątami
+    triangle, square = countries['ISL']['arcs']
+    assert len(triangle) == len(square) == 1
+    assert same_ring(stitch(arcs, triangle[0]), ISLANDS.geoms[0].exterior.coords)
+    assert same_ring(stitch(arcs, square[0]), ISLANDS.geoms[1].exterior.coords)
+
+    river, = topology['objects']['rivers']['geometries']
+    assert river['type'] == 'MultiLineString'
+    assert stitch(arcs, river['arcs'][0]) == [[1, 5], [3, 5], [5, 5], [5, 8]]
+
+
+def test_shared_border_is_stored_once():
+    _, topology = build()
+    countries = {geometry['id']: geometry for geometry in topology['objects']['countries']['geometries']}
+    (west,), = countries['WST']['arcs']
+    (east,), = countries['EST']['arcs']
+
+    # Wspólna granica x=2 to jeden łuk: raz wprost, raz odwrócony (~indeks)
+    shared = {ref if ref >= 0 else ~ref for ref in west} & {ref if ref >= 0 else ~ref for ref in east}
+    assert len(shared) == 1
+    arc, = shared
+    assert decode_arcs(topology)[arc] in ([[2, 0], [2, 2]], [[2, 2], [2, 0]])
+    assert (arc in west) != (arc in east)
+    # Dwa kwadraty to trzy łuki: wspólna granica i reszta obwodu każdego z nich
+    assert len({ref if ref >= 0 else ~ref for ref in west + east}) == 3
+
+
+def test_geometry_outside_bounds_is_skipped():
+    builder = TopologyBuilder(BOUNDS, quantization=11)
+
+    assert not builder.add('countries', Polygon([(20, 20), (21, 20), (21, 21)]), feature_id='FAR')
+    assert builder.build()['objects'] == {}
+
+
+def test_strip_images_keeps_manifest_fresh(tmp_path):
+    questions_file = tmp_path / 'questions.json'
+    questions = [
+        {'id': 'country_pl', 'image': 'data:image/svg+xml;base64,AAAA', 'mapSpec': {'highlight': ['POL']}},
+        {'id': 'capital_pl', 'image': 'data:image/svg+xml;base64,BBBB'},
+    ]
+    questions_file.write_text(json.dumps(questions, ensure_ascii=False, indent=2), encoding='utf-8')
+    manifest = BuildManifest(manifest_path_for(questions_file))
+    fingerprints = {question['id']: manifest.fingerprint('country', question['id'], {}, None)
+                    for question in questions}
+    for question in questions:
+        manifest.record(question['id'], fingerprints[question['id']], question)
+    manifest.save()
+
+    assert strip_images(questions_file) == len(questions[0]['image'])
+
+    stripped = json.loads(questions_file.read_text(encoding='utf-8'))
+    assert stripped == [{'id': 'country_pl', 'mapSpec': {'highlight': ['POL']}}, questions[1]]
+    reloaded = BuildManifest(manifest_path_for(questions_file))
+    assert all(reloaded.is_fresh(question['id'], fingerprints[question['id']], question) for question in stripped)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+🧩 Eksport topologii Europy (format TopoJSON) do rysowania map po stronie klienta
+Sąsiednie kraje dzielą granice, a każde SVG pytania trzyma własną kopię tych granic.
+Topologia zapisuje każdy wspólny łuk (arc) raz: współrzędne są kwantowane do siatki liczb
+całkowitych, dzielone w węzłach (punktach, gdzie spotykają się więcej niż dwie granice)
+i kodowane różnicowo. Pytanie niesie tylko mapSpec (co podświetlić, znaczniki), a TV
+pobiera jedną topologię na sesję zamiast obrazu 30-90 KB na pytanie.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+from build_manifest import BuildManifest, manifest_path_for
+from lake_index import lake_keys
+
+TOPOLOGY_NAME = 'europe'
+TOPOLOGY_DIR = 'topology'
+TOPOLOGY_SUFFIX = '.topojson'
+
+# Kadr topologii (lon/lat): Europa z Islandią, Svalbardem i wybrzeżem Afryki dla map kontekstowych
+EUROPE_BOUNDS = (-32.0, 27.0, 45.0, 82.0)
+DEFAULT_QUANTIZATION = 100_000
+
+
+def in_topology(geometry, bounds=EUROPE_BOUNDS):
+    """🔍 Czy geometria mieści się w kadrze topologii (poza nim klient narysowałby pustą mapę)"""
+    return shapely.contains(shapely.box(*bounds), geometry)
+
+
+def topology_path(output_dir, name=TOPOLOGY_NAME):
+    """📁 Ścieżka pliku topologii - podkatalog, więc backend nie wczyta go jako pytań"""
+    return Path(output_dir) / TOPOLOGY_DIR / f'{name}{TOPOLOGY_SUFFIX}'
+
+
+class TopologyBuilder:
+    """🧩 Zbiera geometrie warstw i buduje z nich topologię ze wspólnymi łukami"""
+
+    def __init__(self, bounds=EUROPE_BOUNDS, quantization=DEFAULT_QUANTIZATION):
+        self.bounds = tuple(float(v) for v in bounds)
+        self.quantization = int(quantization)
+        self.translate = np.array(self.bounds[:2])
+        self.scale = (np.array(self.bounds[2:]) - self.translate) / (self.quantization - 1)
+        self.lines = []
+        self.objects = {}
+
+    def _quantize(self, coords, closed):
+        """🔢 Współrzędne -> siatka całkowita bez powtórzonych kolejnych punktów (None gdy zdegenerowane)"""
+        points = np.rint((coords - self.translate) / self.scale).astype('int64')
+        keep = np.r_[True, np.any(points[1:] != points[:-1], axis=1)]
+        points = points[keep]
+        if len(points) < (4 if closed else 2):
+            return None
+        self.lines.append((points, closed))
+        return len(self.lines) - 1
+
+    def add(self, object_name, geometry, feature_id=None, properties=None):
+        """➕ Dodaje (Multi)Polygon lub (Multi)LineString przycięty do kadru topologii"""
+        geometry = shapely.clip_by_rect(geometry, *self.bounds)
+        parts = []
+        for part in shapely.get_parts(geometry):
+            if isinstance(part, shapely.Polygon):
+                rings = [self._quantize(shapely.get_coordinates(ring), True) for ring in shapely.get_rings(part)]
+                if rings[0] is not None:
+                    parts.append([ring for ring in rings if ring is not None])
+            elif isinstance(part, shapely.LineString):
+                line = self._quantize(shapely.get_coordinates(part), False)
+                if line is not None:
+                    parts.append(line)
+        if not parts:
+            return False
+
+        kind = 'MultiPolygon' if isinstance(parts[0], list) else 'MultiLineString'
+        feature = {'type': kind, 'parts': parts}
+        if feature_id is not None:
+            feature['id'] = feature_id
+        if properties:
+            feature['properties'] = properties
+        self.objects.setdefault(object_name, []).append(feature)
+        return True
+
+    def _junctions(self):
+        """🔀 Punkty, w których linia ma różnych sąsiadów w różnych wystąpieniach, oraz końce linii"""
+        neighbours = {}
+        junctions = set()
+        for points, closed in self.lines:
+            keys = list(map(tuple, points.tolist()))
+            if closed:
+                keys = keys[:-1]
+                before = keys[-1:] + keys[:-1]
+                after = keys[1:] + keys[:1]
+            else:
+                junctions.update((keys[0], keys[-1]))
+                before = [None] + keys[:-1]
+                after = keys[1:] + [None]
+            for point, previous, following in zip(keys, before, after):
+                pair = frozenset((previous, following))
+                if neighbours.setdefault(point, pair) != pair:
+                    junctions.add(point)
+        return junctions
+
+    @staticmethod
+    def _cut(points, closed, junctions):
+        """✂️ Dzieli linię na łuki w węzłach; pierścień bez węzłów zaczyna się od najmniejszego punktu"""
+        keys = list(map(tuple, points.tolist()))
+        if not closed:
+            cuts = [i for i, point in enumerate(keys) if point in junctions]
+            return [keys[start:end + 1] for start, end in zip(cuts, cuts[1:])]
+
+        ring = keys[:-1]
+        cuts = [i for i, point in enumerate(ring) if point in junctions]
+        start = cuts[0] if cuts else ring.index(min(ring))
+        rotated = ring[start:] + ring[:start] + [ring[start]]
+        cuts = sorted((i - start) % len(ring) for i in cuts) or [0]
+        cuts.append(len(ring))
+        return [rotated[a:b + 1] for a, b in zip(cuts, cuts[1:])]
+
+    def build(self):
+        """🏗️ Topologia: każdy wspólny łuk zapisany raz (odwrotny kierunek to ~indeks)"""
+        junctions = self._junctions()
+        arc_ids = {}
+        arcs = []
+        line_arcs = []
+        for points, closed in self.lines:
+            refs = []
+            for arc in self._cut(points, closed, junctions):
+                key = tuple(arc)
+                if key in arc_ids:
+                    refs.append(arc_ids[key])
+                elif key[::-1] in arc_ids:
+                    refs.append(~arc_ids[key[::-1]])
+                else:
+                    arc_ids[key] = len(arcs)
+                    refs.append(len(arcs))
+                    arcs.append(arc)
+            line_arcs.append(refs)
+
+        objects = {}
+        for name, features in self.objects.items():
+            geometries = []
+            for feature in features:
+                if feature['type'] == 'MultiPolygon':
+                    geometry_arcs = [[line_arcs[ring] for ring in polygon] for polygon in feature['parts']]
+                else:
+                    geometry_arcs = [line_arcs[line] for line in feature['parts']]
+                geometry = {'type': feature['type'], 'arcs': geometry_arcs}
+                for field in ('id', 'properties'):
+                    if field in feature:
+                        geometry[field] = feature[field]
+                geometries.append(geometry)
+            objects[name] = {'type': 'GeometryCollection', 'geometries': geometries}
+
+        encoded = []
+        for arc in arcs:
+            points = np.asarray(arc, dtype='int64')
+            encoded.append(np.vstack([points[:1], np.diff(points, axis=0)]).tolist())
+        return {
+            'type': 'Topology',
+            'bbox': list(self.bounds),
+            'transform': {'scale': self.scale.tolist(), 'translate': self.translate.tolist()},
+            'objects': objects,
+            'arcs': encoded,
+        }
+
+    def stats(self, topology):
+        """📊 Liczba punktów przed (każda granica osobno) i po współdzieleniu łuków"""
+        source = sum(len(points) for points, _ in self.lines)
+        shared = sum(len(arc) for arc in topology['arcs'])
+        return source, shared
+
+
+def build_europe_topology(generator, bounds=EUROPE_BOUNDS, quantization=DEFAULT_QUANTIZATION):
+    """🌍 Kraje (id ADM0_A3), scalone rzeki (id jak w indeksie rzek) i jeziora (id jak w indeksie jezior) w kadrze Europy"""
+    builder = TopologyBuilder(bounds, quantization)
+    area = shapely.box(*bounds)
+
+    countries = generator.countries_gdf
+    for row in countries.sindex.query(area, predicate='intersects'):
+        country = countries.iloc[row]
+        builder.add('countries', country.geometry, feature_id=country['ADM0_A3'],
+                    properties={'name': country['NAME']})
+
+    lakes = generator.lakes_gdf
+    if lakes is not None:
+        keys = lake_keys(lakes)
+        for row in lakes.sindex.query(area, predicate='intersects'):
+            lake = lakes.iloc[row]
+            key = keys.iloc[row]
+            properties = {'name': lake['name']} if isinstance(lake.get('name'), str) else None
+            builder.add('lakes', lake.geometry, feature_id=key if isinstance(key, str) else None,
+                        properties=properties)
+
+    river_index = generator.get_river_index()
+    if river_index is not None:
+        # Id to klucz indeksu (wikidataid), więc różne rzeki o tej samej nazwie zostają osobno
+        for river_id in river_index.rivers_crossing(area):
+            builder.add('rivers', river_index.geometries[river_id], feature_id=river_index.ids[river_id],
+                        properties={'name': river_index.names[river_id]})
+
+    topology = builder.build()
+    return topology, builder.stats(topology)
+
+
+def save_topology(topology, path):
+    """💾 Zwarty zapis JSON (bez wcięć - topologia to głównie tablice liczb)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(topology, f, ensure_ascii=False, separators=(',', ':'))
+    return path
+
+
+def strip_images(questions_file):
+    """✂️ Usuwa obrazy z pytań mających mapSpec (klient narysuje je z topologii); zwraca zaoszczędzone bajty"""
+    questions_file = Path(questions_file)
+    with open(questions_file, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+
+    saved = 0
+    stripped = {}
+    for index, question in enumerate(questions):
+        if question.get('mapSpec') and (question.get('image') or question.get('imageRef')):
+            saved += len(question.get('image', ''))
+            stripped[index] = {key: value for key, value in question.items()
+                               if key not in ('image', 'imageRef', 'imageVariants')}
+    if not stripped:
+        return saved
+
+    # Manifest pipeline'u wskazuje teraz na pytania bez obrazów - kolejny przebieg ich nie przywróci
+    manifest_file = manifest_path_for(questions_file)
+    if manifest_file.exists():
+        manifest = BuildManifest(manifest_file)
+        for index, question in stripped.items():
+            manifest.rewrite_output(question.get('id'), questions[index], question)
+        manifest.save()
+
+    for index, question in stripped.items():
+        questions[index] = question
+    tmp_file = questions_file.with_name(questions_file.name + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(questions, f, ensure_ascii=False, indent=2)
+    tmp_file.replace(questions_file)
+    return saved
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from visual_question_generator import VisualQuestionGenerator
+
+    base_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Buduje topologię Europy (TopoJSON) dla map rysowanych przez klienta")
+    parser.add_argument('--quantization', type=int, default=DEFAULT_QUANTIZATION,
+                        help='rozmiar siatki kwantyzacji współrzędnych')
+    parser.add_argument('--output-dir', default=str(base_dir / 'questions'))
+    parser.add_argument('--strip-images', nargs='*', default=[], metavar='PLIK',
+                        help='pliki pytań, z których usunąć obrazy zastąpione przez mapSpec')
+    args = parser.parse_args()
+
+    generator = VisualQuestionGenerator()
+    if not generator.load_geodata(['countries', 'rivers', 'lakes']):
+        raise SystemExit(1)
+
+    print("🧩 Budowanie topologii Europy...")
+    topology, (source_points, arc_points) = build_europe_topology(generator, quantization=args.quantization)
+    path = save_topology(topology, topology_path(args.output_dir))
+    counts = ', '.join(f"{name}: {len(obj['geometries'])}" for name, obj in topology['objects'].items())
+    print(f"✅ {counts}; łuków: {len(topology['arcs'])}")
+    print(f"🔗 Punkty: {source_points} -> {arc_points} po współdzieleniu granic")
+    print(f"💾 Zapisano {path} ({path.stat().st_size / 1024:.0f} KB)")
+
+    for questions_file in args.strip_images:
+        saved = strip_images(questions_file)
+        print(f"✂️ {questions_file}: usunięto obrazy zastąpione przez mapSpec ({saved / 1024:.0f} KB)")
@@ -5,18 +5,54 @@ Tworzy wysokiej jakości mapy geograficzne dla quiz'u "Wiedza to Potęga"
 """
 
 import os
-import json
-import base64
 import requests
 import zipfile
 import tempfile
 import geopandas as gpd
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+import numpy as np
+import shapely
 from pathlib import Path
+from map_layers import (QUESTION_GROUP, REVEAL_GROUP, MapFrame, capital_label_overlay, capital_marker_overlay,
+                        compose_svg, corner_label_overlay, group, line_label_point, lines_overlay,
+                        point_label_overlay, polygons_overlay, title_overlay)
+from map_projection import (METERS_PER_DEGREE, ProjectionCache, crs_center, geographic_bounds, local_crs, project,
+                            project_coords, unproject_coords)
+from map_renderer import get_render_session, polygon_collection
+from svg_variants import variant_specs, wrap_map_viewport
+from river_index import RiverIndex
+from lake_index import LakeIndex
+from country_graph import CountryGraph
+from shape_index import ShapeIndex
+from topology_export import TOPOLOGY_NAME, in_topology
+from geometry_store import DEFAULT_LAYERS, build_from_geodata, is_store_stale, open_geometry_store
+from svg_encoding import Base64DataUrl, dump_json, svg_to_base64
+import question_specs
+from question_specs import capital_coordinates, load_spec_file
 import warnings
 warnings.filterwarnings('ignore')
 
+# Style map per typ pytania (wypełnienie, granica, tło)
+MAP_STYLES = {
+    'capital': {'country_color': '#fff3e0', 'border_color': '#e65100', 'bg_color': '#fffef7'},
+    'river': {'country_color': '#f0f9ff', 'border_color': '#1e40af', 'bg_color': '#f0f9ff'},
+    'country': {'country_color': '#e8f4f8', 'border_color': '#2c5530', 'bg_color': '#f8f9fa'},
+    'lake': {'country_color': '#f1f8e9', 'border_color': '#33691e', 'bg_color': '#fafafa'},
+    # Tryb kontekstowy: kraj na tle szarych sąsiadów, morza i jezior
+    'context': {'country_color': '#ffe082', 'border_color': '#e65100', 'bg_color': '#e3f2fd',
+                'neighbour_color': '#eeeeee', 'neighbour_border': '#9e9e9e', 'lake_color': '#bbdefb',
+                'context': True},
+}
+
+# Rzeki o wyższym scalerank (drobne dopływy) pomijane w wyszukiwaniu rzek kraju
+RIVER_MAX_SCALERANK = 6
+
+# Zbiory Natural Earth pobierane domyślnie (populated places tylko na życzenie - tryb świata)
+DEFAULT_DATASETS = ('countries', 'rivers', 'lakes')
+LAYER_LABELS = {'countries': 'krajów', 'rivers': 'rzek i jezior', 'lakes': 'jezior'}
+
+# Podbij przy zmianie kodu renderującego - unieważnia manifest budowania
+RENDER_VERSION = 14
+
 class VisualQuestionGenerator:
     def __init__(self):
         self.base_dir = Path(__file__).parent
@@ -24,43 +60,35 @@ class VisualQuestionGenerator:
         self.data_dir = self.base_dir / "geodata"
         self.temp_dir = Path(tempfile.mkdtemp())
         
-        # Datasets
-        self.countries_gdf = None
-        self.rivers_gdf = None
-        self.lakes_gdf = None
-        
-        # Mapowanie krajów na nazwy polskie (lepsze niż emoji w SVG)
-        self.country_names = {
-            'Poland': 'POLSKA',
-            'Germany': 'NIEMCY', 
-            'France': 'FRANCJA',
-            'Spain': 'HISZPANIA',
-            'Italy': 'WŁOCHY',
-            'United Kingdom': 'W. BRYTANIA',
-            'Czech Republic': 'CZECHY',
-            'Austria': 'AUSTRIA',
-            'Hungary': 'WĘGRY',
-            'Romania': 'RUMUNIA',
-            'Netherlands': 'HOLANDIA',
-            'Portugal': 'PORTUGALIA',
-            'Serbia': 'SERBIA',
-            'Croatia': 'CHORWACJA',
-            'Slovakia': 'SŁOWACJA',
-            'Slovenia': 'SŁOWENIA',
-            'Switzerland': 'SZWAJCARIA',
-            'Belgium': 'BELGIA',
-            'Norway': 'NORWEGIA',
-            'Sweden': 'SZWECJA',
-            'Denmark': 'DANIA',
-            'Finland': 'FINLANDIA'
-        }
+        # Datasets: atrybuty warstw z magazynu czytane bez geometrii, geometrie z magazynu mmap
+        self.attributes = {}
+        self._layer_frames = {}
+        self.places_gdf = None
+        self.geometry_store = None
+        
+        # Cache wyszukiwań geometrii (współdzielony przez wszystkie typy pytań)
+        self._country_cache = {}
+        self._river_cache = {}
+        self._base_layer_cache = {}
+        self.projections = ProjectionCache()
+        self.river_index = None
+        self.lake_index = None
+        self.country_graph = None
+        self.shape_index = None
+        self.failures = []
+        
+        # Mapowanie krajów na nazwy polskie (lepsze niż emoji w SVG) - map_specs/country_labels.json
+        self.country_names = load_spec_file('country_labels')
+        self.capital_coordinates = {country: tuple(coords)
+                                    for country, coords in load_spec_file('capital_coordinates').items()}
+        self._world_capitals = None
         
         # Ensure directories exist
         self.output_dir.mkdir(exist_ok=True)
         self.data_dir.mkdir(exist_ok=True)
         
-    def download_natural_earth_data(self):
-        """📦 Pobiera dane Natural Earth - kontury krajów i rzeki"""
+    def download_natural_earth_data(self, datasets_to_load=None):
+        """📦 Pobiera dane Natural Earth - kontury krajów i rzeki (opcjonalnie tylko wybrane zbiory)"""
         print("🌍 Pobieranie danych Natural Earth...")
         
         datasets = {
@@ -75,10 +103,19 @@ class VisualQuestionGenerator:
             'lakes': {
                 'url': 'https://naciscdn.org/naturalearth/50m/physical/ne_50m_lakes.zip',
                 'shapefile': 'ne_50m_lakes.shp'
+            },
+            # Stolice i miasta - tylko dla trybu świata (domyślnie nie pobierane)
+            'places': {
+                'url': 'https://naciscdn.org/naturalearth/50m/cultural/ne_50m_populated_places.zip',
+                'shapefile': 'ne_50m_populated_places.shp'
             }
         }
+        wanted = set(datasets_to_load) if datasets_to_load is not None else set(DEFAULT_DATASETS)
         
         for name, info in datasets.items():
+            if name not in wanted:
+                continue
+            
             extract_dir = self.data_dir / name
             shapefile_path = extract_dir / info['shapefile']
             
@@ -113,52 +150,111 @@ class VisualQuestionGenerator:
                 
         return True
         
-    def load_geodata(self):
-        """📂 Ładuje dane geograficzne do pamięci"""
+    def load_geodata(self, datasets=None):
+        """📂 Ładuje dane geograficzne do pamięci (opcjonalnie tylko wybrane zbiory)"""
         print("📂 Ładowanie danych geograficznych...")
+        wanted = set(datasets) if datasets is not None else set(DEFAULT_DATASETS)
         
         try:
-            # Countries
-            countries_path = self.data_dir / 'countries' / 'ne_50m_admin_0_countries.shp'
-            if countries_path.exists():
-                self.countries_gdf = gpd.read_file(countries_path)
-                print(f"✅ Załadowano {len(self.countries_gdf)} krajów")
+            # Warstwy z magazynu: atrybuty bez geometrii (shapefile z geometrią czytany tylko przy budowie magazynu)
+            store_layers = [name for name in DEFAULT_LAYERS if name in wanted and name not in self.attributes]
+            if store_layers:
+                self.load_geometry_store()
+            for name in store_layers:
+                if name in self.geometry_store:
+                    folder, shapefile, _ = DEFAULT_LAYERS[name]
+                    attributes = gpd.read_file(self.data_dir / folder / shapefile, ignore_geometry=True)
+                    self.attributes[name] = attributes.iloc[self.geometry_store[name].rows]
+                    print(f"✅ Załadowano {len(self.attributes[name])} {LAYER_LABELS[name]}")
             
-            # Rivers
-            rivers_path = self.data_dir / 'rivers' / 'ne_50m_rivers_lake_centerlines.shp'
-            if rivers_path.exists():
-                self.rivers_gdf = gpd.read_file(rivers_path)
-                print(f"✅ Załadowano {len(self.rivers_gdf)} rzek i jezior")
+            # Populated places (stolice dla trybu świata) - poza magazynem
+            places_path = self.data_dir / 'places' / 'ne_50m_populated_places.shp'
+            if 'places' in wanted and self.places_gdf is None and places_path.exists():
+                self.places_gdf = gpd.read_file(places_path)
+                print(f"✅ Załadowano {len(self.places_gdf)} miejscowości")
             
-            # Lakes
-            lakes_path = self.data_dir / 'lakes' / 'ne_50m_lakes.shp'
-            if lakes_path.exists():
-                self.lakes_gdf = gpd.read_file(lakes_path)
-                print(f"✅ Załadowano {len(self.lakes_gdf)} jezior")
-                
             return True
             
         except Exception as e:
             print(f"❌ Błąd ładowania danych: {e}")
             return False
     
+    def load_geometry_store(self):
+        """🗃️ Otwiera magazyn geometrii mapowany do pamięci (buduje go gdy brak lub nieaktualny)"""
+        store_path = self.data_dir / 'geometry_store.bin'
+        
+        if is_store_stale(self.data_dir, store_path):
+            print("🗃️ Budowanie magazynu geometrii...")
+            build_from_geodata(self.data_dir, store_path)
+        elif self.geometry_store is not None:
+            return self.geometry_store
+        
+        self.geometry_store = open_geometry_store(store_path)
+        print(f"✅ Magazyn geometrii: {store_path.name}")
+        return self.geometry_store
+    
+    def layer_frame(self, name):
+        """🗺️ Warstwa jako GeoDataFrame dla operacji na całej warstwie (indeksy, graf) - geometrie
+        powstają raz, jednym wywołaniem na zmapowanych tablicach, i tylko gdy ktoś ich potrzebuje"""
+        if name not in self._layer_frames:
+            attributes = self.attributes.get(name)
+            if attributes is None:
+                return None
+            store_layer = self.geometry_store[name]
+            self._layer_frames[name] = gpd.GeoDataFrame(attributes, geometry=store_layer.geometries(),
+                                                        crs=store_layer.crs)
+        return self._layer_frames[name]
+    
+    @property
+    def countries_gdf(self):
+        return self.layer_frame('countries')
+    
+    @property
+    def rivers_gdf(self):
+        return self.layer_frame('rivers')
+    
+    @property
+    def lakes_gdf(self):
+        return self.layer_frame('lakes')
+    
+    def layer_geometries(self, name, ids):
+        """🧩 Geometrie o podanych ID magazynu - materializowane tylko te wiersze"""
+        store_layer = self.geometry_store[name]
+        geometries = np.empty(len(ids), dtype=object)
+        for position, geom_id in enumerate(ids):
+            geometries[position] = store_layer.geometry(geom_id)
+        return geometries
+    
     def get_country_data(self, country_name):
-        """🎯 Znajduje dane kraju w zbiorze danych"""
-        if self.countries_gdf is None:
+        """🎯 Znajduje dane kraju w zbiorze danych (z cache)"""
+        if country_name not in self._country_cache:
+            self._country_cache[country_name] = self._find_country_data(country_name)
+        return self._country_cache[country_name]
+    
+    def _find_country_data(self, country_name):
+        """🔎 Przeszukuje pola nazw w atrybutach krajów; geometria tylko tego kraju z magazynu"""
+        countries = self.attributes.get('countries')
+        if countries is None:
             return None
             
         # Try different name fields
         name_fields = ['NAME', 'NAME_EN', 'NAME_LONG', 'ADMIN']
         
-        for field in name_fields:
-            if field in self.countries_gdf.columns:
-                matches = self.countries_gdf[
-                    self.countries_gdf[field].str.contains(
-                        country_name, case=False, na=False
-                    )
-                ]
-                if not matches.empty:
-                    country_data = matches.iloc[0]
+        # Najpierw dokładna nazwa (tryb świata: "Niger" to nie "Nigeria"), potem fragment nazwy
+        lookups = [(field, exact) for exact in (True, False) for field in name_fields]
+        
+        for field, exact in lookups:
+            if field in countries.columns:
+                names = countries[field]
+                if exact:
+                    mask = names.str.lower() == country_name.lower()
+                else:
+                    mask = names.str.contains(country_name, case=False, na=False, regex=False)
+                rows = np.flatnonzero(mask.fillna(False).to_numpy())
+                if len(rows):
+                    country_data = countries.iloc[rows[0]].copy()
+                    store_ids = self.geometry_store['countries'].ids
+                    country_data['geometry'] = self.layer_geometries('countries', [store_ids[rows[0]]])[0]
                     
                     # 🚨 SPECIAL HANDLING: Fix oversized countries with overseas territories
                     geometry = country_data.geometry
@@ -181,7 +277,6 @@ class VisualQuestionGenerator:
                                     main_geometry = geom
                             if main_geometry:
                                 # Create new country data with filtered geometry
-                                import pandas as pd
                                 filtered_data = country_data.copy()
                                 filtered_data.geometry = main_geometry
                                 return filtered_data
@@ -191,42 +286,167 @@ class VisualQuestionGenerator:
         print(f"⚠️ Nie znaleziono kraju: {country_name}")
         return None
     
-    def get_rivers_in_country(self, country_name, river_name=None):
-        """🌊 Znajduje rzeki w danym kraju"""
-        if self.rivers_gdf is None:
+    def get_river_index(self):
+        """🌊 Indeks scalonych rzek z aliasami nazw (budowany raz)"""
+        if self.river_index is None and self.rivers_gdf is not None:
+            self.river_index = RiverIndex(self.rivers_gdf)
+        return self.river_index
+    
+    def get_lake_index(self):
+        """💧 Tabela kraj -> jeziora z jednego złączenia przestrzennego (budowana raz)"""
+        if self.lake_index is None and self.lakes_gdf is not None and self.countries_gdf is not None:
+            self.lake_index = LakeIndex(self.lakes_gdf, self.countries_gdf)
+        return self.lake_index
+    
+    def get_country_graph(self):
+        """🕸️ Graf sąsiedztwa krajów do błędnych odpowiedzi (budowany raz, jedno zapytanie do indeksu)"""
+        if self.country_graph is None and self.countries_gdf is not None:
+            self.country_graph = CountryGraph(self.countries_gdf)
+        return self.country_graph
+    
+    def get_shape_index(self):
+        """🔷 Indeks podobieństwa konturów krajów (deskryptory Fouriera + KD-drzewo, budowany raz)"""
+        if self.shape_index is None and self.countries_gdf is not None:
+            self.shape_index = ShapeIndex(self.countries_gdf)
+        return self.shape_index
+    
+    def get_rivers_in_country(self, country_name, max_scalerank=RIVER_MAX_SCALERANK):
+        """🌊 Nazwy rzek przecinających kraj, od najważniejszych (z cache)"""
+        key = (country_name, max_scalerank)
+        if key not in self._river_cache:
+            self._river_cache[key] = self._find_rivers_in_country(country_name, max_scalerank)
+        return self._river_cache[key]
+    
+    def _find_rivers_in_country(self, country_name, max_scalerank=None):
+        """🔎 Zapytanie przestrzenne do indeksu scalonych rzek"""
+        river_index = self.get_river_index()
+        country_data = self.get_country_data(country_name)
+        if river_index is None or country_data is None:
+            return []
+        
+        river_ids = river_index.rivers_crossing(country_data.geometry, max_scalerank)
+        river_ids = sorted(river_ids, key=lambda river_id: river_index.scaleranks[river_id])
+        return [river_index.names[river_id] for river_id in river_ids]
+    
+    def get_river_geometries(self, country_name, river_name, frame):
+        """✂️ Rzeka (po nazwie lub aliasie) przycięta do kadru kraju i rzutowana - ukryte wierzchołki nie trafiają do SVG"""
+        river_index = self.get_river_index()
+        river_id = river_index.lookup(river_name) if river_index is not None else None
+        if river_id is None:
+            print(f"⚠️ Nie znaleziono rzeki: {river_name}")
+            return np.empty(0, dtype=object)
+        pieces = river_index.country_pieces(river_id, country_name, geographic_bounds(frame.padded_bounds(), frame.crs))
+        return self.projections.get(('river', river_id, country_name), pieces, frame.crs)
+    
+    def get_lake_geometry(self, country_name, lake_name, frame):
+        """💧 Jezioro (po nazwie) przycięte do kadru kraju i rzutowane - z cache per jezioro i kraj"""
+        lake_index = self.get_lake_index()
+        lake_id = lake_index.lookup(lake_name) if lake_index is not None else None
+        if lake_id is None:
+            print(f"⚠️ Nie znaleziono jeziora: {lake_name}")
             return None
-            
+        clipped = shapely.clip_by_rect(lake_index.geometries[lake_id],
+                                       *geographic_bounds(frame.padded_bounds(), frame.crs))
+        projected = self.projections.get(('lake', lake_id, country_name), clipped, frame.crs)
+        projected = shapely.clip_by_rect(projected, frame.xlim[0], frame.ylim[0], frame.xlim[1], frame.ylim[1])
+        return None if projected.is_empty else projected
+    
+    def get_projected_country(self, country_name, crs, lod=None):
+        """🌐 Geometria kraju w odwzorowaniu crs (z cache per kraj, CRS i LOD)"""
         country_data = self.get_country_data(country_name)
-        if country_data is None:
+        return self.projections.get(('country', country_name), country_data.geometry, crs, lod)
+    
+    def frame_point(self, frame, lon_lat):
+        """📍 Punkt lon/lat we współrzędnych kadru"""
+        return tuple(project_coords(lon_lat, frame.crs))
+    
+    def create_map_svg(self, country_name, question_type='country', 
+                      show_capital=False, river_name=None, title="",
+                      reveal_country=None, reveal_capital=None, reveal_river=None,
+                      lake_name=None, reveal_lake=None):
+        """🎨 Tworzy warstwową mapę SVG: podkładka kraju + nakładka pytania + ukryta odpowiedź"""
+        base = self.get_base_layer(country_name, question_type, with_title=bool(title))
+        if base is None:
             return None
+        base_svg, frame = base
         
-        # Get rivers within country bounds
-        country_geom = country_data.geometry
-        
-        # Spatial intersection
-        rivers_in_country = self.rivers_gdf[
-            self.rivers_gdf.geometry.intersects(country_geom)
-        ]
+        defs = []
+        question = []
+        reveal = []
         
+        # Add rivers if requested
         if river_name:
-            # Filter by river name
-            name_fields = ['name', 'NAME', 'name_en']
-            for field in name_fields:
-                if field in rivers_in_country.columns:
-                    specific_river = rivers_in_country[
-                        rivers_in_country[field].str.contains(
-                            river_name, case=False, na=False
-                        )
-                    ]
-                    if not specific_river.empty:
-                        return specific_river
-        
-        return rivers_in_country
-    
-    def create_map_svg(self, country_name, question_type='country', 
-                      show_capital=False, river_name=None, title=""):
-        """🎨 Tworzy wysokiej jakości mapę SVG"""
+            rivers = self.get_river_geometries(country_name, river_name, frame)
+            if not len(rivers):
+                # Pytanie o rzekę bez rzeki na mapie nie ma sensu
+                return None
+            defs.append(frame.clip_path('map-area'))
+            question.append(lines_overlay(frame, rivers, '#1565c0', width=4,
+                                          opacity=0.8, clip_id='map-area'))
+            
+            # Add country name as context hint for river questions
+            country_label = self.country_names.get(country_name, country_name.upper())
+            question.append(corner_label_overlay(frame, country_label, '#1565c0'))
+            
+            # Reveal: highlighted river with its name
+            if reveal_river:
+                reveal.append(lines_overlay(frame, rivers, '#0d47a1', width=6,
+                                            opacity=1, clip_id='map-area'))
+                avoid = self.get_capital_coordinates(country_name) if show_capital else None
+                if avoid:
+                    avoid = self.frame_point(frame, avoid)
+                label_point = line_label_point(frame, rivers, avoid=avoid)
+                if label_point:
+                    reveal.append(point_label_overlay(frame, label_point, reveal_river, '#0d47a1'))
+        
+        # Podświetlone jezioro (geometria z tabeli jezior, bez przeszukiwania warstwy)
+        if lake_name:
+            lake = self.get_lake_geometry(country_name, lake_name, frame)
+            if lake is None:
+                return None
+            question.append(polygons_overlay(frame, lake, '#0277bd', opacity=0.85))
+            country_label = self.country_names.get(country_name, country_name.upper())
+            question.append(corner_label_overlay(frame, country_label, '#0277bd'))
+            if reveal_lake:
+                label_point = shapely.point_on_surface(lake)
+                reveal.append(point_label_overlay(frame, (label_point.x, label_point.y), reveal_lake, '#01579b'))
         
+        # Add capital if requested
+        if show_capital:
+            capital_coords = self.get_capital_coordinates(country_name)
+            if capital_coords:
+                capital_coords = self.frame_point(frame, capital_coords)
+                question.append(capital_marker_overlay(frame, capital_coords))
+                if reveal_capital:
+                    reveal.append(capital_label_overlay(frame, capital_coords, reveal_capital, '#b71c1c'))
+        
+        # Reveal: country name in the corner
+        if reveal_country:
+            border_color = self.get_map_style(question_type)['border_color']
+            reveal.append(corner_label_overlay(frame, reveal_country, border_color))
+        
+        # Add title if provided
+        if title:
+            question.append(title_overlay(frame, title))
+        
+        overlays = defs + [group(QUESTION_GROUP, ''.join(question))]
+        if reveal:
+            overlays.append(group(REVEAL_GROUP, ''.join(reveal), hidden=True))
+        return compose_svg(base_svg, overlays)
+    
+    def clear_render_caches(self):
+        """🧹 Zapomina wyrenderowane podkładki i rzutowane geometrie (np. przed powtórnym renderem)"""
+        self._base_layer_cache.clear()
+        self.projections.clear()
+    
+    def get_base_layer(self, country_name, question_type='country', with_title=True):
+        """🧱 Podkładka kraju (kontur w stałym kadrze) - renderowana raz na kraj i styl"""
+        key = (country_name, question_type, with_title)
+        if key not in self._base_layer_cache:
+            self._base_layer_cache[key] = self._render_base_layer(country_name, question_type, with_title)
+        return self._base_layer_cache[key]
+    
+    def _render_base_layer(self, country_name, question_type, with_title):
         country_data = self.get_country_data(country_name)
         if country_data is None:
             return None
@@ -245,62 +465,112 @@ class VisualQuestionGenerator:
         else:
             print(f"✅ {country_name}: Optymalne bounds ({width:.1f}° × {height:.1f}°)")
         
-        # Create figure
-        fig, ax = plt.subplots(1, 1, figsize=(10, 8))
-        ax.set_aspect('equal')
-        
         # Style based on question type
-        if question_type == 'capital':
-            country_color = '#fff3e0'
-            border_color = '#e65100'
-            bg_color = '#fffef7'
-        elif question_type == 'river':
-            country_color = '#f0f9ff'
-            border_color = '#1e40af'
-            bg_color = '#f0f9ff'
-        else:  # country outline
-            country_color = '#e8f4f8'
-            border_color = '#2c5530'
-            bg_color = '#f8f9fa'
-        
-        ax.set_facecolor(bg_color)
-        
-        # Plot country
-        country_gdf = gpd.GeoDataFrame([country_data])
-        country_gdf.plot(ax=ax, color=country_color, edgecolor=border_color, 
-                        linewidth=2.5, alpha=0.9)
+        style = self.get_map_style(question_type)
+        frame = self.country_frame(country_name, style, with_title)
+        country_geometry = self.get_projected_country(country_name, frame.crs)
+        
+        neighbours = lakes = ()
+        if style.get('context'):
+            # Kontekst mieści się w budżecie pojedynczego kraju - wszystko w rozdzielczości kadru
+            country_geometry = self.get_projected_country(country_name, frame.crs, lod=frame.resolution)
+            neighbours, lakes = self.context_geometries(country_data, frame)
+        
+        layers = [polygon_collection(country_geometry, facecolor=style['country_color'],
+                                     edgecolor=style['border_color'], linewidth=2.5, alpha=0.9)]
+        if style.get('context'):
+            if len(neighbours):
+                layers.insert(0, polygon_collection(neighbours, facecolor=style['neighbour_color'],
+                                                    edgecolor=style['neighbour_border'], linewidth=1))
+            if len(lakes):
+                layers.append(polygon_collection(lakes, facecolor=style['lake_color'],
+                                                 edgecolor=style['border_color'], linewidth=0.5))
+        
+        # Reuse this thread's figure instead of building a new one per map
+        svg_content = get_render_session().render_layer(frame, style['bg_color'], layers)
+        return wrap_map_viewport(svg_content, frame), frame
+    
+    def context_geometries(self, country_data, frame):
+        """🧭 Sąsiednie kraje i jeziora z prostokątów magazynu - przycięte do kadru
+        i uproszczone do jego rozdzielczości (Rosja na mapie Polski to tylko widoczny skrawek)"""
+        viewport = frame.padded_bounds()
+        geographic_viewport = geographic_bounds(viewport, frame.crs)
+        layers = []
+        for layer, exclude in (('countries', country_data['ADM0_A3']), ('lakes', None)):
+            if layer not in self.attributes:
+                layers.append(np.empty(0, dtype=object))
+                continue
+            # Filtr bbox bez budowania geometrii całej warstwy; kształty spoza kadru odpadną po przycięciu
+            ids = [geom_id for geom_id in self.geometry_store[layer].query_bbox(*geographic_viewport)
+                   if geom_id != exclude]
+            # Przycięcie w stopniach przed rzutowaniem (mniej wierzchołków), potem dokładnie do kadru
+            clipped = shapely.clip_by_rect(self.layer_geometries(layer, ids), *geographic_viewport)
+            clipped = shapely.clip_by_rect(project(clipped, frame.crs), *viewport)
+            simplified = shapely.simplify(clipped, 2 * frame.resolution, preserve_topology=True)
+            layers.append(simplified[~shapely.is_empty(simplified)])
+        return layers
+    
+    def country_frame(self, country_name, style, with_title=True):
+        """🌐 Kadr kraju w lokalnym odwzorowaniu równopolowym (bez rozciągania Norwegii)"""
+        crs = local_crs(self.get_country_data(country_name).geometry.bounds)
+        bounds = self.get_projected_country(country_name, crs).bounds
+        return self.map_frame(bounds, style, with_title, crs=crs)
+    
+    def map_spec(self, country_name, question_type='country', show_capital=False, river_name=None,
+                 reveal_country=None, reveal_capital=None, reveal_river=None, lake_name=None, reveal_lake=None):
+        """🧩 Opis mapy do narysowania przez klienta z topologii (topology_export.py) zamiast obrazu
+        None dla krajów spoza kadru topologii Europy (np. w trybie świata) - klient użyje obrazu."""
+        country_data = self.get_country_data(country_name)
+        if country_data is None or not in_topology(country_data.geometry):
+            return None
+        style = self.get_map_style(question_type)
+        frame = self.country_frame(country_name, style, with_title=False)
+        spec = {
+            'topology': TOPOLOGY_NAME,
+            'center': list(crs_center(country_data.geometry.bounds)),
+            'extent': [round(v) for v in (frame.xlim[0], frame.ylim[0], frame.xlim[1], frame.ylim[1])],
+            'country': country_data['ADM0_A3'],
+            'colors': {key: value for key, value in style.items() if isinstance(value, str)},
+            'context': bool(style.get('context')),
+            'reveal': [],
+        }
         
-        # Add rivers if requested
-        if river_name:
-            rivers = self.get_rivers_in_country(country_name, river_name)
-            if rivers is not None and not rivers.empty:
-                rivers.plot(ax=ax, color='#1565c0', linewidth=4, alpha=0.8)
-                
-                # Add country name as context hint for river questions
-                country_label = self.country_names.get(country_name, country_name.upper())
-                ax.text(0.05, 0.95, country_label, transform=ax.transAxes, fontsize=12,
-                       verticalalignment='top', horizontalalignment='left', fontweight='bold',
-                       color='#1565c0',
-                       bbox=dict(boxstyle="round,pad=0.5", facecolor='white', alpha=0.9, edgecolor='#1565c0'))
+        capital = self.get_capital_coordinates(country_name) if show_capital else None
+        if capital:
+            spec['capital'] = [round(v, 4) for v in capital]
+            if reveal_capital:
+                spec['reveal'].append({'text': reveal_capital, 'at': spec['capital'], 'kind': 'capital'})
         
-        # Add capital if requested
-        if show_capital:
-            capital_coords = self.get_capital_coordinates(country_name)
-            if capital_coords:
-                ax.plot(capital_coords[0], capital_coords[1], 'o', 
-                       color='#d32f2f', markersize=15, 
-                       markeredgecolor='#b71c1c', markeredgewidth=3,
-                       zorder=10)
-                # Ring around capital
-                circle = plt.Circle(capital_coords, 0.5, fill=False, 
-                                  color='#d32f2f', linewidth=2, alpha=0.7)
-                ax.add_patch(circle)
-                # Inner point
-                ax.plot(capital_coords[0], capital_coords[1], 'o', 
-                       color='#ffcdd2', markersize=6, zorder=11)
-        
-        # Set bounds with improved sizing
-        bounds = country_data.geometry.bounds
+        if river_name:
+            river_index = self.get_river_index()
+            river_id = river_index.lookup(river_name) if river_index is not None else None
+            if river_id is None:
+                return None
+            spec['rivers'] = [river_index.ids[river_id]]
+            if reveal_river:
+                rivers = self.get_river_geometries(country_name, river_name, frame)
+                avoid = self.frame_point(frame, capital) if capital else None
+                label_point = line_label_point(frame, rivers, avoid=avoid)
+                if label_point:
+                    at = unproject_coords(label_point, frame.crs)
+                    spec['reveal'].append({'text': reveal_river, 'at': [round(v, 4) for v in at], 'kind': 'river'})
+        
+        if lake_name:
+            lake_index = self.get_lake_index()
+            lake_id = lake_index.lookup(lake_name) if lake_index is not None else None
+            if lake_id is None:
+                return None
+            spec['lakes'] = [lake_index.ids[lake_id]]
+            if reveal_lake:
+                at = shapely.point_on_surface(lake_index.geometries[lake_id])
+                spec['reveal'].append({'text': reveal_lake, 'at': [round(at.x, 4), round(at.y, 4)], 'kind': 'lake'})
+        
+        if reveal_country:
+            spec['reveal'].append({'text': reveal_country, 'kind': 'country'})
+        return spec
+    
+    def map_frame(self, bounds, style, with_title=True, crs=None):
+        """📐 Kadr mapy: bounds kraju (w jednostkach crs) z minimalnym rozmiarem i marginesem"""
         width = bounds[2] - bounds[0]
         height = bounds[3] - bounds[1]
         
@@ -317,415 +587,367 @@ class VisualQuestionGenerator:
             
         # Generous margin for better visibility
         margin = max(width, height) * 0.15
-        ax.set_xlim(bounds[0] - margin, bounds[2] + margin)
-        ax.set_ylim(bounds[1] - margin, bounds[3] + margin)
-        
-        # Remove axes
-        ax.axis('off')
-        
-        # Add title if provided
-        if title:
-            plt.title(title, fontsize=16, fontweight='bold', pad=20)
-        
-        # Save to SVG string
-        import io
-        svg_buffer = io.StringIO()
-        plt.savefig(svg_buffer, format='svg', bbox_inches='tight', 
-                   pad_inches=0.2, facecolor=bg_color, edgecolor='none', 
-                   dpi=200, transparent=False)
-        plt.close()
-        
-        svg_content = svg_buffer.getvalue()
-        svg_buffer.close()
-        
-        return svg_content
+        return MapFrame((bounds[0] - margin, bounds[2] + margin),
+                        (bounds[1] - margin, bounds[3] + margin),
+                        title=with_title, crs=crs,
+                        units_per_degree=METERS_PER_DEGREE if crs else 1.0)
+    
+    def get_map_style(self, question_type):
+        """🎨 Styl mapy dla typu pytania (domyślnie kontur kraju)"""
+        return MAP_STYLES.get(question_type, MAP_STYLES['country'])
+    
+    def geodata_version(self, datasets=('countries', 'rivers', 'lakes')):
+        """🏷️ Wersja danych Natural Earth z plików *.VERSION.txt"""
+        versions = []
+        for name in sorted(datasets):
+            folder = self.data_dir / name
+            version_files = sorted(folder.glob('*.VERSION.txt')) if folder.exists() else []
+            version = version_files[0].read_text().strip() if version_files else 'brak'
+            versions.append(f'{name}={version}')
+        return ';'.join(versions)
     
     def get_capital_coordinates(self, country_name):
-        """🏛️ Zwraca współrzędne stolicy"""
-        capitals = {
-            # Europa Zachodnia
-            'Poland': (21.0122, 52.2297),
-            'Germany': (13.4050, 52.5200),
-            'France': (2.3522, 48.8566),
-            'Spain': (-3.7038, 40.4168),
-            'Italy': (12.4964, 41.9028),
-            'United Kingdom': (-0.1276, 51.5074),
-            'Portugal': (-9.1393, 38.7223),
-            'Netherlands': (4.9041, 52.3676),
-            'Belgium': (4.3517, 50.8503),
-            'Switzerland': (7.4474, 46.9480),
-            'Austria': (16.3738, 48.2082),
-            'Ireland': (-6.2603, 53.3498),
-            'Luxembourg': (6.1296, 49.8144),
-            
-            # Europa Środkowa i Wschodnia
-            'Czech Republic': (14.4378, 50.0755),
-            'Slovakia': (17.1077, 48.1486),
-            'Hungary': (19.0402, 47.4979),
-            'Romania': (26.1025, 44.4268),
-            'Bulgaria': (23.3219, 42.6977),
-            'Croatia': (15.9819, 45.8150),
-            'Slovenia': (14.5058, 46.0569),
-            'Serbia': (20.4489, 44.7866),
-            'Bosnia and Herzegovina': (18.4131, 43.8563),
-            'Montenegro': (19.2636, 42.4304),
-            'North Macedonia': (21.4254, 41.9917),
-            'Albania': (19.8187, 41.3275),
-            
-            # Europa Północna  
-            'Sweden': (18.0686, 59.3293),
-            'Norway': (10.7522, 59.9139),
-            'Denmark': (12.5683, 55.6761),
-            'Finland': (24.9384, 60.1699),
-            'Iceland': (-21.8174, 64.1466),
-            
-            # Europa Wschodnia
-            'Ukraine': (30.5234, 50.4501),
-            'Belarus': (27.5618, 53.9006),
-            'Lithuania': (25.2797, 54.6872),
-            'Latvia': (24.1052, 56.9496),
-            'Estonia': (24.7536, 59.4370),
-            
-            # Pozostałe
-            'Greece': (23.7275, 37.9838),
-            'Turkey': (32.8597, 39.9334),
-            'Cyprus': (33.4299, 35.1856),
-            'Malta': (14.3754, 35.8997)
-        }
-        return capitals.get(country_name)
+        """🏛️ Zwraca współrzędne stolicy (map_specs/capital_coordinates.json, potem populated places)"""
+        if country_name in self.capital_coordinates:
+            return self.capital_coordinates[country_name]
+        if self.places_gdf is None or self.countries_gdf is None:
+            return None
+        if self._world_capitals is None:
+            self._world_capitals = capital_coordinates(self.countries_gdf, self.places_gdf)
+        return self._world_capitals.get(country_name)
     
     def svg_to_base64(self, svg_content):
         """📝 Konwertuje SVG do base64 dla JSON"""
-        svg_bytes = svg_content.encode('utf-8')
-        base64_string = base64.b64encode(svg_bytes).decode('utf-8')
-        return f"data:image/svg+xml;base64,{base64_string}"
+        return svg_to_base64(svg_content)
+    
+    def capital_specs(self):
+        """🏛️ Specyfikacje pytań o stolice (map_specs/capital.json)"""
+        capitals_data = load_spec_file('capital')
+        
+        for data in capitals_data:
+            data['id'] = f'ne_capital_{data["country"].lower()}'
+        return capitals_data
+    
+    def render_capital_map(self, data):
+        """🎨 Mapa do pytania o stolicę"""
+        return self.create_map_svg(
+            data['country'], 
+            question_type='capital',
+            show_capital=True,
+            title="Jaka jest stolica tego kraju?",
+            reveal_capital=data['capital']
+        )
+    
+    def build_capital_question(self, data, image):
+        """📝 Pytanie o stolicę z gotowym obrazem"""
+        return {
+            'id': data['id'],
+            'question': 'Jaka jest stolica tego kraju?',
+            'image': image,
+            'answers': [data['capital']] + data['wrong_answers'],
+            'correct': 0,
+            'difficulty': 'medium',
+            'explanation': f'Stolica tego kraju to {data["capital"]}.',
+            'visualType': 'capital_with_dot',
+            'revealLayer': REVEAL_GROUP,
+            'mapSpec': self.map_spec(data['country'], 'capital', show_capital=True,
+                                     reveal_capital=data['capital'])
+        }
+    
+    def produce_question(self, data, render, build):
+        """🛡️ Renderuje i buduje jedno pytanie; błąd trafia do self.failures zamiast przerywać przebieg"""
+        try:
+            svg_content = render(data)
+            if not svg_content:
+                raise ValueError("nie udało się utworzyć mapy")
+            return build(data, Base64DataUrl(svg_content))
+        except Exception as e:
+            reason = f"{type(e).__name__}: {e}"
+            self.failures.append((data['id'], reason))
+            print(f"❌ {data['id']}: {reason}")
+            return None
     
     def generate_capital_questions(self):
         """🏛️ Generuje pytania o stolice z kropkami"""
         print("🏛️ Generowanie pytań o stolice...")
         questions = []
         
-        capitals_data = [
-            # Europa Zachodnia - łatwe
-            {'country': 'Poland', 'capital': 'Warszawa', 
-             'wrong_answers': ['Kraków', 'Wrocław', 'Gdańsk']},
-            {'country': 'Germany', 'capital': 'Berlin', 
-             'wrong_answers': ['Monachium', 'Hamburg', 'Frankfurt']},
-            {'country': 'France', 'capital': 'Paryż', 
-             'wrong_answers': ['Lyon', 'Marseille', 'Toulouse']},
-            {'country': 'Spain', 'capital': 'Madryt', 
-             'wrong_answers': ['Barcelona', 'Valencia', 'Sewilla']},
-            {'country': 'Italy', 'capital': 'Rzym', 
-             'wrong_answers': ['Mediolan', 'Neapol', 'Turyn']},
-            {'country': 'United Kingdom', 'capital': 'Londyn', 
-             'wrong_answers': ['Manchester', 'Birmingham', 'Liverpool']},
-            {'country': 'Portugal', 'capital': 'Lizbona', 
-             'wrong_answers': ['Porto', 'Braga', 'Coimbra']},
-            {'country': 'Netherlands', 'capital': 'Amsterdam', 
-             'wrong_answers': ['Haga', 'Rotterdam', 'Utrecht']},
-            
-            # Europa Środkowa - średnie
-            {'country': 'Czech Republic', 'capital': 'Praga', 
-             'wrong_answers': ['Brno', 'Ostrawa', 'Plzeń']},
-            {'country': 'Austria', 'capital': 'Wiedeń', 
-             'wrong_answers': ['Salzburg', 'Graz', 'Innsbruck']},
-            {'country': 'Hungary', 'capital': 'Budapeszt', 
-             'wrong_answers': ['Debreczyn', 'Szeged', 'Pecz']},
-            {'country': 'Switzerland', 'capital': 'Berno', 
-             'wrong_answers': ['Zurych', 'Genewa', 'Bazylea']},
-            {'country': 'Belgium', 'capital': 'Bruksela', 
-             'wrong_answers': ['Antwerpia', 'Gandawa', 'Brugia']},
+        for data in self.capital_specs():
+            question = self.produce_question(data, self.render_capital_map, self.build_capital_question)
             
-            # Europa Północna - średnie
-            {'country': 'Sweden', 'capital': 'Sztokholm', 
-             'wrong_answers': ['Göteborg', 'Malmö', 'Uppsala']},
-            {'country': 'Norway', 'capital': 'Oslo', 
-             'wrong_answers': ['Bergen', 'Trondheim', 'Stavanger']},
-            {'country': 'Denmark', 'capital': 'Kopenhaga', 
-             'wrong_answers': ['Aarhus', 'Odense', 'Aalborg']},
-            
-            # Europa Wschodnia i Bałkany - trudne
-            {'country': 'Romania', 'capital': 'Bukareszt', 
-             'wrong_answers': ['Kluż', 'Timișoara', 'Iași']},
-            {'country': 'Croatia', 'capital': 'Zagrzeb', 
-             'wrong_answers': ['Split', 'Rijeka', 'Osijek']},
-            {'country': 'Serbia', 'capital': 'Belgrad', 
-             'wrong_answers': ['Novi Sad', 'Niš', 'Kragujevac']},
-            {'country': 'Bulgaria', 'capital': 'Sofia', 
-             'wrong_answers': ['Płowdiw', 'Warna', 'Burgas']},
-            {'country': 'Slovakia', 'capital': 'Bratysława', 
-             'wrong_answers': ['Koszyce', 'Preszów', 'Žilina']},
-            {'country': 'Slovenia', 'capital': 'Lublana', 
-             'wrong_answers': ['Maribor', 'Celje', 'Kranj']},
-            
-            # Pozostałe
-            {'country': 'Greece', 'capital': 'Ateny', 
-             'wrong_answers': ['Saloniki', 'Patras', 'Iraklion']},
-            {'country': 'Ireland', 'capital': 'Dublin', 
-             'wrong_answers': ['Cork', 'Limerick', 'Galway']},
-        ]
-        
-        for data in capitals_data:
-            svg_content = self.create_map_svg(
-                data['country'], 
-                question_type='capital',
-                show_capital=True,
-                title="Jaka jest stolica tego kraju?"
-            )
-            
-            if svg_content:
-                question = {
-                    'id': f'ne_capital_{data["country"].lower()}',
-                    'question': 'Jaka jest stolica tego kraju?',
-                    'image': self.svg_to_base64(svg_content),
-                    'answers': [data['capital']] + data['wrong_answers'],
-                    'correct': 0,
-                    'difficulty': 'medium',
-                    'explanation': f'Stolica tego kraju to {data["capital"]}.',
-                    'visualType': 'capital_with_dot'
-                }
+            if question:
                 questions.append(question)
                 print(f"✅ Utworzono pytanie o stolicę: {data['country']}")
         
         return questions
     
+    def country_specs(self):
+        """🗺️ Specyfikacje pytań o rozpoznawanie krajów (map_specs/country.json)"""
+        countries_data = load_spec_file('country')
+        
+        for data in countries_data:
+            data['id'] = f'ne_country_{data["country"].lower()}'
+        return countries_data
+    
+    def render_country_map(self, data):
+        """🎨 Mapa do pytania o kraj"""
+        return self.create_map_svg(
+            data['country'], 
+            question_type='country',
+            title="Jak nazywa się ten kraj?",
+            reveal_country=data['name_pl']
+        )
+    
+    def build_country_question(self, data, image):
+        """📝 Pytanie o kraj z gotowym obrazem"""
+        return {
+            'id': data['id'],
+            'question': 'Jak nazywa się ten kraj?',
+            'image': image,
+            'answers': [data['name_pl']] + data['wrong_answers'],
+            'correct': 0,
+            'difficulty': 'hard',
+            'explanation': f'To jest {data["name_pl"]}.',
+            'visualType': 'country_outline',
+            'revealLayer': REVEAL_GROUP,
+            'imageVariants': self.country_variants(data),
+            'mapSpec': self.map_spec(data['country'], 'country', reveal_country=data['name_pl'])
+        }
+    
+    def country_variants(self, data):
+        """🔄 Obrócone/odbite/przybliżone warianty konturu - opisy transformacji, bez nowych renderów"""
+        base = self.get_base_layer(data['country'], 'country')
+        if base is None:
+            return []
+        return variant_specs(base[1], seed=data['id'])
+    
     def generate_country_questions(self):
         """🗺️ Generuje pytania o rozpoznawanie krajów"""
         print("🗺️ Generowanie pytań o kraje...")
         questions = []
         
-        countries_data = [
-            # Charakterystyczne kształty - łatwe
-            {'country': 'Italy', 'name_pl': 'Włochy', 
-             'wrong_answers': ['Hiszpania', 'Grecja', 'Portugalia']},
-            {'country': 'Spain', 'name_pl': 'Hiszpania', 
-             'wrong_answers': ['Francja', 'Portugalia', 'Włochy']},
-            {'country': 'United Kingdom', 'name_pl': 'Wielka Brytania', 
-             'wrong_answers': ['Irlandia', 'Islandia', 'Dania']},
-            {'country': 'Greece', 'name_pl': 'Grecja', 
-             'wrong_answers': ['Turcja', 'Bułgaria', 'Włochy']},
-            {'country': 'Norway', 'name_pl': 'Norwegia', 
-             'wrong_answers': ['Szwecja', 'Finlandia', 'Islandia']},
-            {'country': 'Portugal', 'name_pl': 'Portugalia', 
-             'wrong_answers': ['Hiszpania', 'Francja', 'Włochy']},
-            
-            # Średniej trudności
-            {'country': 'Poland', 'name_pl': 'Polska', 
-             'wrong_answers': ['Niemcy', 'Czechy', 'Słowacja']},
-            {'country': 'France', 'name_pl': 'Francja', 
-             'wrong_answers': ['Hiszpania', 'Niemcy', 'Włochy']},
-            {'country': 'Germany', 'name_pl': 'Niemcy', 
-             'wrong_answers': ['Polska', 'Francja', 'Austria']},
-            {'country': 'Sweden', 'name_pl': 'Szwecja', 
-             'wrong_answers': ['Norwegia', 'Finlandia', 'Dania']},
-            {'country': 'Finland', 'name_pl': 'Finlandia', 
-             'wrong_answers': ['Szwecja', 'Norwegia', 'Estonia']},
-            {'country': 'Turkey', 'name_pl': 'Turcja', 
-             'wrong_answers': ['Grecja', 'Bułgaria', 'Rumunia']},
-            {'country': 'Romania', 'name_pl': 'Rumunia', 
-             'wrong_answers': ['Bułgaria', 'Węgry', 'Serbia']},
-            
-            # Trudniejsze - podobne kształty
-            {'country': 'Czech Republic', 'name_pl': 'Czechy', 
-             'wrong_answers': ['Słowacja', 'Austria', 'Węgry']},
-            {'country': 'Slovakia', 'name_pl': 'Słowacja', 
-             'wrong_answers': ['Czechy', 'Węgry', 'Austria']},
-            {'country': 'Austria', 'name_pl': 'Austria', 
-             'wrong_answers': ['Szwajcaria', 'Słowenia', 'Czechy']},
-            {'country': 'Hungary', 'name_pl': 'Węgry', 
-             'wrong_answers': ['Słowacja', 'Rumunia', 'Serbia']},
-            {'country': 'Croatia', 'name_pl': 'Chorwacja', 
-             'wrong_answers': ['Bośnia', 'Serbia', 'Słowenia']},
-            {'country': 'Serbia', 'name_pl': 'Serbia', 
-             'wrong_answers': ['Bośnia', 'Chorwacja', 'Rumunia']},
-            {'country': 'Bulgaria', 'name_pl': 'Bułgaria', 
-             'wrong_answers': ['Rumunia', 'Serbia', 'Grecja']},
+        for data in self.country_specs():
+            question = self.produce_question(data, self.render_country_map, self.build_country_question)
             
-            # Małe kraje - bardzo trudne
-            {'country': 'Slovenia', 'name_pl': 'Słowenia', 
-             'wrong_answers': ['Chorwacja', 'Austria', 'Słowacja']},
-            {'country': 'Belgium', 'name_pl': 'Belgia', 
-             'wrong_answers': ['Holandia', 'Luksemburg', 'Szwajcaria']},
-            {'country': 'Netherlands', 'name_pl': 'Holandia', 
-             'wrong_answers': ['Belgia', 'Dania', 'Niemcy']},
-            {'country': 'Switzerland', 'name_pl': 'Szwajcaria', 
-             'wrong_answers': ['Austria', 'Luksemburg', 'Słowenia']},
-            {'country': 'Denmark', 'name_pl': 'Dania', 
-             'wrong_answers': ['Holandia', 'Belgia', 'Niemcy']},
-        ]
+            if question:
+                questions.append(question)
+                print(f"✅ Utworzono pytanie o kraj: {data['country']}")
         
-        for data in countries_data:
-            svg_content = self.create_map_svg(
-                data['country'], 
-                question_type='country',
-                title="Jak nazywa się ten kraj?"
-            )
+        return questions
+    
+    def context_specs(self):
+        """🧭 Specyfikacje pytań o kraj na tle sąsiadów (te same kraje co kontury)"""
+        return [dict(data, id=f'ne_context_{data["country"].lower()}') for data in self.country_specs()]
+    
+    def world_country_specs(self):
+        """🌐 Kontury wszystkich krajów z countries_gdf (nazwy z NAME_PL)"""
+        return question_specs.world_country_specs(self.countries_gdf, self.get_country_graph(),
+                                                  shapes=self.get_shape_index())
+    
+    def world_context_specs(self):
+        """🌐 Wszystkie kraje na tle sąsiadów"""
+        return [dict(data, id=data['id'].replace('_country_', '_context_', 1)) for data in self.world_country_specs()]
+    
+    def world_capital_specs(self):
+        """🌐 Stolice wszystkich krajów z warstwy populated places"""
+        if self.places_gdf is None:
+            raise RuntimeError("Tryb świata wymaga warstwy populated places (zbiór 'places')")
+        return question_specs.world_capital_specs(self.countries_gdf, self.places_gdf, self.get_country_graph())
+    
+    def world_combo_specs(self):
+        """🌐 Pary stolica-rzeka odkryte złączeniem przestrzennym stolic z siecią rzek"""
+        if self.places_gdf is None:
+            raise RuntimeError("Tryb świata wymaga warstwy populated places (zbiór 'places')")
+        return question_specs.world_combo_specs(self.countries_gdf, self.places_gdf, self.get_river_index(),
+                                                self.get_country_graph())
+    
+    def render_context_map(self, data):
+        """🎨 Mapa kraju z sąsiadami i jeziorami w tle"""
+        return self.create_map_svg(
+            data['country'], 
+            question_type='context',
+            title="Który kraj jest zaznaczony na mapie?",
+            reveal_country=data['name_pl']
+        )
+    
+    def build_context_question(self, data, image):
+        """📝 Pytanie o kraj zaznaczony wśród sąsiadów"""
+        return {
+            'id': data['id'],
+            'question': 'Który kraj jest zaznaczony na mapie?',
+            'image': image,
+            'answers': [data['name_pl']] + data['wrong_answers'],
+            'correct': 0,
+            'difficulty': 'medium',
+            'explanation': f'Zaznaczony kraj to {data["name_pl"]}.',
+            'visualType': 'country_in_context',
+            'revealLayer': REVEAL_GROUP,
+            'mapSpec': self.map_spec(data['country'], 'context', reveal_country=data['name_pl'])
+        }
+    
+    def generate_context_questions(self):
+        """🧭 Generuje pytania o kraje na tle sąsiadów"""
+        print("🧭 Generowanie pytań o kraje w kontekście...")
+        questions = []
+        
+        for data in self.context_specs():
+            question = self.produce_question(data, self.render_context_map, self.build_context_question)
             
-            if svg_content:
-                question = {
-                    'id': f'ne_country_{data["country"].lower()}',
-                    'question': 'Jak nazywa się ten kraj?',
-                    'image': self.svg_to_base64(svg_content),
-                    'answers': [data['name_pl']] + data['wrong_answers'],
-                    'correct': 0,
-                    'difficulty': 'hard',
-                    'explanation': f'To jest {data["name_pl"]}.',
-                    'visualType': 'country_outline'
-                }
+            if question:
                 questions.append(question)
-                print(f"✅ Utworzono pytanie o kraj: {data['country']}")
+                print(f"✅ Utworzono pytanie o kraj w kontekście: {data['country']}")
         
         return questions
     
+    def river_specs(self):
+        """🌊 Specyfikacje pytań o rzeki (map_specs/river.json)"""
+        rivers_data = load_spec_file('river')
+        
+        for data in rivers_data:
+            data['id'] = f'ne_river_{data["river"].lower()}_{data["country"].lower()}'
+        return rivers_data
+    
+    def render_river_map(self, data):
+        """🎨 Mapa do pytania o rzekę"""
+        return self.create_map_svg(
+            data['country'], 
+            question_type='river',
+            river_name=data['river'],
+            title="Która rzeka jest podświetlona?",
+            reveal_river=data['river_pl']
+        )
+    
+    def build_river_question(self, data, image):
+        """📝 Pytanie o rzekę z gotowym obrazem"""
+        return {
+            'id': data['id'],
+            'question': 'Która rzeka jest podświetlona na mapie?',
+            'image': image,
+            'answers': [data['river_pl']] + data['wrong_answers'],
+            'correct': 0,
+            'difficulty': 'medium',
+            'explanation': f'To jest rzeka {data["river_pl"]}.',
+            'visualType': 'highlighted_river',
+            'revealLayer': REVEAL_GROUP,
+            'mapSpec': self.map_spec(data['country'], 'river', river_name=data['river'],
+                                     reveal_river=data['river_pl'])
+        }
+    
     def generate_river_questions(self):
         """🌊 Generuje pytania o rzeki"""
         print("🌊 Generowanie pytań o rzeki...")
         questions = []
         
-        rivers_data = [
-            # Główne rzeki europejskie - znane
-            {'country': 'Poland', 'river': 'Vistula', 'river_pl': 'Wisła',
-             'wrong_answers': ['Odra', 'Bug', 'San']},
-            {'country': 'Poland', 'river': 'Oder', 'river_pl': 'Odra',
-             'wrong_answers': ['Wisła', 'Warta', 'Noteć']},
-            {'country': 'Germany', 'river': 'Rhine', 'river_pl': 'Ren',
-             'wrong_answers': ['Dunaj', 'Łaba', 'Mozela']},
-            {'country': 'France', 'river': 'Seine', 'river_pl': 'Sekwana',
-             'wrong_answers': ['Loara', 'Rodan', 'Garonna']},
-            {'country': 'Spain', 'river': 'Ebro', 'river_pl': 'Ebro',
-             'wrong_answers': ['Tajo', 'Duero', 'Guadalquivir']},
-            {'country': 'Italy', 'river': 'Po', 'river_pl': 'Pad',
-             'wrong_answers': ['Tyber', 'Arno', 'Adyga']},
-            {'country': 'United Kingdom', 'river': 'Thames', 'river_pl': 'Tamiza',
-             'wrong_answers': ['Severn', 'Trent', 'Mersey']},
-            
-            # Rzeki średnio znane
-            {'country': 'Czech Republic', 'river': 'Elbe', 'river_pl': 'Łaba',
-             'wrong_answers': ['Morava', 'Dyje', 'Berounka']},
-            {'country': 'Austria', 'river': 'Danube', 'river_pl': 'Dunaj',
-             'wrong_answers': ['Inn', 'Salzach', 'Enns']},
-            {'country': 'Hungary', 'river': 'Danube', 'river_pl': 'Dunaj',
-             'wrong_answers': ['Tisza', 'Dráva', 'Rába']},
-            {'country': 'Romania', 'river': 'Danube', 'river_pl': 'Dunaj',
-             'wrong_answers': ['Prut', 'Siret', 'Olt']},
-            {'country': 'Netherlands', 'river': 'Rhine', 'river_pl': 'Ren',
-             'wrong_answers': ['Maas', 'IJssel', 'Waal']},
-            
-            # Rzeki trudniejsze
-            {'country': 'Portugal', 'river': 'Tagus', 'river_pl': 'Tag',
-             'wrong_answers': ['Douro', 'Mondego', 'Guadiana']},
-            {'country': 'Serbia', 'river': 'Danube', 'river_pl': 'Dunaj',
-             'wrong_answers': ['Sawa', 'Morava', 'Timok']},
-            {'country': 'Croatia', 'river': 'Sava', 'river_pl': 'Sawa',
-             'wrong_answers': ['Dunaj', 'Dráva', 'Una']},
-        ]
-        
-        for data in rivers_data:
-            svg_content = self.create_map_svg(
-                data['country'], 
-                question_type='river',
-                river_name=data['river'],
-                title="Która rzeka jest podświetlona?"
-            )
+        for data in self.river_specs():
+            question = self.produce_question(data, self.render_river_map, self.build_river_question)
             
-            if svg_content:
-                question = {
-                    'id': f'ne_river_{data["river"].lower()}_{data["country"].lower()}',
-                    'question': 'Która rzeka jest podświetlona na mapie?',
-                    'image': self.svg_to_base64(svg_content),
-                    'answers': [data['river_pl']] + data['wrong_answers'],
-                    'correct': 0,
-                    'difficulty': 'medium',
-                    'explanation': f'To jest rzeka {data["river_pl"]}.',
-                    'visualType': 'highlighted_river'
-                }
+            if question:
                 questions.append(question)
                 print(f"✅ Utworzono pytanie o rzekę: {data['river']}")
         
         return questions
     
+    def combo_specs(self):
+        """🌍 Specyfikacje pytań kombinowanych (map_specs/combo.json)"""
+        combo_data = load_spec_file('combo')
+        
+        for data in combo_data:
+            data['id'] = f'ne_combo_{data["country"].lower()}_{data["river"].lower()}'
+        return combo_data
+    
+    def render_combo_map(self, data):
+        """🎨 Mapa do pytania kombinowanego"""
+        return self.create_map_svg(
+            data['country'], 
+            question_type='river',
+            show_capital=True,
+            river_name=data['river'],
+            title=data['question'],
+            reveal_capital=data['capital'],
+            reveal_river=data['river_pl']
+        )
+    
+    def build_combo_question(self, data, image):
+        """📝 Pytanie kombinowane z gotowym obrazem"""
+        return {
+            'id': data['id'],
+            'question': data['question'],
+            'image': image,
+            'answers': [data['river_pl']] + data['wrong_answers'],
+            'correct': 0,
+            'difficulty': 'hard',
+            'explanation': f'{data["river_pl"]} przepływa przez {data["capital"]}.',
+            'visualType': 'combination_geography',
+            'revealLayer': REVEAL_GROUP,
+            'mapSpec': self.map_spec(data['country'], 'river', show_capital=True, river_name=data['river'],
+                                     reveal_capital=data['capital'], reveal_river=data['river_pl'])
+        }
+    
     def generate_combo_questions(self):
         """🌍 Generuje pytania kombinowane"""
         print("🌍 Generowanie pytań kombinowanych...")
         questions = []
         
-        combo_data = [
-            # Stolice + główne rzeki
-            {
-                'country': 'Poland', 'capital': 'Warszawa', 
-                'river': 'Vistula', 'river_pl': 'Wisła',
-                'question': 'Która rzeka przepływa przez stolicę tego kraju?',
-                'wrong_answers': ['Odra', 'Bug', 'Warta']
-            },
-            {
-                'country': 'Germany', 'capital': 'Berlin', 
-                'river': 'Spree', 'river_pl': 'Spree',
-                'question': 'Która rzeka przepływa przez stolicę tego kraju?',
-                'wrong_answers': ['Ren', 'Łaba', 'Mozela']
-            },
-            {
-                'country': 'France', 'capital': 'Paryż', 
-                'river': 'Seine', 'river_pl': 'Sekwana',
-                'question': 'Która rzeka przepływa przez stolicę tego kraju?',
-                'wrong_answers': ['Loara', 'Rodan', 'Garonna']
-            },
-            {
-                'country': 'United Kingdom', 'capital': 'Londyn', 
-                'river': 'Thames', 'river_pl': 'Tamiza',
-                'question': 'Która rzeka przepływa przez stolicę tego kraju?',
-                'wrong_answers': ['Severn', 'Trent', 'Mersey']
-            },
-            {
-                'country': 'Czech Republic', 'capital': 'Praga', 
-                'river': 'Vltava', 'river_pl': 'Wełtawa',
-                'question': 'Która rzeka przepływa przez stolicę tego kraju?',
-                'wrong_answers': ['Łaba', 'Morava', 'Dyje']
-            },
-            {
-                'country': 'Austria', 'capital': 'Wiedeń', 
-                'river': 'Danube', 'river_pl': 'Dunaj',
-                'question': 'Która rzeka przepływa przez stolicę tego kraju?',
-                'wrong_answers': ['Inn', 'Salzach', 'Enns']
-            },
-            {
-                'country': 'Hungary', 'capital': 'Budapeszt', 
-                'river': 'Danube', 'river_pl': 'Dunaj',
-                'question': 'Która rzeka przepływa przez stolicę tego kraju?',
-                'wrong_answers': ['Tisza', 'Dráva', 'Rába']
-            },
-            {
-                'country': 'Serbia', 'capital': 'Belgrad', 
-                'river': 'Danube', 'river_pl': 'Dunaj',
-                'question': 'Która rzeka przepływa przez stolicę tego kraju?',
-                'wrong_answers': ['Sawa', 'Morava', 'Timok']
-            }
-        ]
-        
-        for data in combo_data:
-            svg_content = self.create_map_svg(
-                data['country'], 
-                question_type='river',
-                show_capital=True,
-                river_name=data['river'],
-                title=data['question']
-            )
+        for data in self.combo_specs():
+            question = self.produce_question(data, self.render_combo_map, self.build_combo_question)
             
-            if svg_content:
-                question = {
-                    'id': f'ne_combo_{data["country"].lower()}_{data["river"].lower()}',
-                    'question': data['question'],
-                    'image': self.svg_to_base64(svg_content),
-                    'answers': [data['river_pl']] + data['wrong_answers'],
-                    'correct': 0,
-                    'difficulty': 'hard',
-                    'explanation': f'{data["river_pl"]} przepływa przez {data["capital"]}.',
-                    'visualType': 'combination_geography'
-                }
+            if question:
                 questions.append(question)
                 print(f"✅ Utworzono pytanie kombinowane: {data['country']}")
         
         return questions
     
+    def lake_specs(self):
+        """💧 Największe jezioro każdego kraju z map_specs/country.json"""
+        names = [data['country'] for data in load_spec_file('country')]
+        countries = self.countries_gdf[self.countries_gdf['NAME'].isin(names)].drop_duplicates('NAME')
+        return question_specs.lake_specs(self.countries_gdf, countries, self.get_lake_index(),
+                                         self.get_country_graph(), 'ne_lake_{code}_{lake}')
+    
+    def world_lake_specs(self):
+        """🌐 Największe jezioro każdego kraju świata"""
+        return question_specs.lake_specs(self.countries_gdf, question_specs.world_countries(self.countries_gdf),
+                                         self.get_lake_index(), self.get_country_graph(), 'ne_world_lake_{code}')
+    
+    def render_lake_map(self, data):
+        """🎨 Mapa kraju z podświetlonym jeziorem"""
+        return self.create_map_svg(
+            data['country'],
+            question_type='lake',
+            lake_name=data['lake'],
+            title=question_specs.LAKE_QUESTION,
+            reveal_lake=data['lake_pl']
+        )
+    
+    def build_lake_question(self, data, image):
+        """📝 Pytanie o jezioro z gotowym obrazem"""
+        return {
+            'id': data['id'],
+            'question': question_specs.LAKE_QUESTION,
+            'image': image,
+            'answers': [data['lake_pl']] + data['wrong_answers'],
+            'correct': 0,
+            'difficulty': 'medium',
+            'explanation': f'To jest jezioro {data["lake_pl"]} (ok. {data["area_km2"]} km²).',
+            'visualType': 'highlighted_lake',
+            'revealLayer': REVEAL_GROUP,
+            'mapSpec': self.map_spec(data['country'], 'lake', lake_name=data['lake'], reveal_lake=data['lake_pl'])
+        }
+    
+    def generate_lake_questions(self):
+        """💧 Generuje pytania o jeziora"""
+        print("💧 Generowanie pytań o jeziora...")
+        questions = []
+        
+        for data in self.lake_specs():
+            question = self.produce_question(data, self.render_lake_map, self.build_lake_question)
+            
+            if question:
+                questions.append(question)
+                print(f"✅ Utworzono pytanie o jezioro: {data['lake']}")
+        
+        return questions
+    
     def generate_all_questions(self):
         """🎯 Generuje wszystkie typy pytań"""
         print("🎯 Rozpoczynam generowanie pytań...")
@@ -743,12 +965,23 @@ class VisualQuestionGenerator:
         all_questions = []
         all_questions.extend(self.generate_capital_questions())
         all_questions.extend(self.generate_country_questions())
+        all_questions.extend(self.generate_context_questions())
         all_questions.extend(self.generate_river_questions())
         all_questions.extend(self.generate_combo_questions())
+        all_questions.extend(self.generate_lake_questions())
         
         print(f"🎉 Wygenerowano {len(all_questions)} pytań!")
+        self.report_failures()
         return all_questions
     
+    def report_failures(self):
+        """📋 Raport końcowy z listą pytań, których nie udało się wygenerować"""
+        if not self.failures:
+            return
+        print(f"⚠️ Nie udało się wygenerować {len(self.failures)} pytań:")
+        for question_id, reason in self.failures:
+            print(f"   • {question_id}: {reason}")
+    
     def save_questions(self, filename='natural_earth_geography.json'):
         """💾 Zapisuje pytania do pliku JSON"""
         questions = self.generate_all_questions()
@@ -760,7 +993,7 @@ class VisualQuestionGenerator:
         output_file = self.output_dir / filename
         
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(questions, f, ensure_ascii=False, indent=2)
+            dump_json(questions, f, ensure_ascii=False, indent=2)
         
         print(f"💾 Zapisano {len(questions)} pytań do {output_file}")
         